@@ -0,0 +1,118 @@
+"""Conversion cases shared by the benchmarks.
+
+Each case is one of the example rockets, a case made from the smallest example
+by upsampling its simulation data, or a design made by
+`rocketserializer.synthetic.generate_ork`, so that the benchmarks show how each
+stage scales with the number of datapoints and components.
+"""
+
+import json
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pytest
+from lxml import etree
+
+from rocketserializer._helpers import open_ork_file, parse_ork_file
+from rocketserializer.ork_extractor import ork_extractor
+from rocketserializer.synthetic import generate_ork
+
+EXAMPLES = sorted(
+    (Path(__file__).parent.parent / "examples").glob("*/rocket.ork"),
+    key=lambda path: path.parent.name,
+)
+SMALLEST = min(EXAMPLES, key=lambda path: path.stat().st_size)
+
+# how many times the datapoints of the smallest example are multiplied
+UPSAMPLING_FACTORS = [10, 100]
+
+# the arguments of generate_ork for each synthetic design
+SYNTHETIC_DESIGNS = {
+    "synthetic-small": {"datapoints": 1000},
+    "synthetic-large-design": {
+        "stages": 3,
+        "body_tubes": 10,
+        "fin_sets": 4,
+        "parachutes": 10,
+        "rail_buttons": 10,
+        "datapoints": 1000,
+    },
+    "synthetic-large-data": {"datapoints": 1_000_000, "compressed": True},
+}
+
+
+class ConversionCase(NamedTuple):
+    """A .ork file, already parsed and converted once."""
+
+    name: str
+    path: Path
+    bs: object
+    flight_data: object
+    settings: dict
+    parameters_json: Path
+
+
+def upsample_ork(path, factor, destination):
+    """Writes a plain xml copy of the .ork file in which the datapoints of the
+    first databranch are linearly interpolated to `factor` times as many."""
+    with open_ork_file(path) as file:
+        tree = etree.parse(file)
+    branch = tree.find(".//databranch")
+    datapoints = branch.findall("datapoint")
+    data = np.array([point.text.split(",") for point in datapoints], dtype=float)
+
+    rows = np.arange(len(data))
+    new_rows = np.linspace(0, len(data) - 1, len(data) * factor)
+    upsampled = np.column_stack(
+        [np.interp(new_rows, rows, column) for column in data.T]
+    )
+
+    for point in datapoints:
+        branch.remove(point)
+    for row in upsampled:
+        point = etree.SubElement(branch, "datapoint")
+        point.text = ",".join("NaN" if np.isnan(v) else repr(float(v)) for v in row)
+
+    tree.write(str(destination), xml_declaration=True, encoding="utf-8")
+    return destination
+
+
+def _case_paths(tmp_path_factory):
+    paths = {path.parent.name: path for path in EXAMPLES}
+    synthetic = tmp_path_factory.mktemp("synthetic")
+    for factor in UPSAMPLING_FACTORS:
+        name = f"{SMALLEST.parent.name}-x{factor}"
+        paths[name] = upsample_ork(SMALLEST, factor, synthetic / f"{name}.ork")
+    for name, arguments in SYNTHETIC_DESIGNS.items():
+        paths[name] = generate_ork(synthetic / f"{name}.ork", **arguments)
+    return paths
+
+
+CASE_NAMES = (
+    [path.parent.name for path in EXAMPLES]
+    + [f"{SMALLEST.parent.name}-x{factor}" for factor in UPSAMPLING_FACTORS]
+    + list(SYNTHETIC_DESIGNS)
+)
+
+
+@pytest.fixture(scope="session")
+def case_paths(tmp_path_factory):
+    return _case_paths(tmp_path_factory)
+
+
+@pytest.fixture(scope="session", params=CASE_NAMES)
+def case(request, case_paths, tmp_path_factory):
+    """Parses and converts each case once, for the benchmarks of the stages
+    that come after it."""
+    name = request.param
+    path = case_paths[name]
+    bs, databranches = parse_ork_file(path)
+    output = tmp_path_factory.mktemp(name)
+    settings = ork_extractor(
+        bs, str(path), str(output), None, flight_data=databranches[0]
+    )
+    parameters_json = output / "parameters.json"
+    with open(parameters_json, "w", encoding="utf-8") as file:
+        json.dump(settings, file, indent=4)
+    return ConversionCase(name, path, bs, databranches[0], settings, parameters_json)
@@ -0,0 +1,77 @@
+"""Time of each stage of a conversion, for every case of `conftest.py`.
+
+Run with ``make benchmark``. ``make benchmark-baseline`` stores the results as
+the baseline, and ``make benchmark-compare`` fails if any benchmark got slower
+than the baseline by more than the ``BENCHMARK_THRESHOLD`` (10% by default).
+"""
+
+import pytest
+
+from rocketserializer._helpers import parse_ork_file
+from rocketserializer.components.design_index import DesignIndex
+from rocketserializer.components.drag_curve import get_drag_curve, write_drag_curve
+from rocketserializer.components.element_index import ElementIndex
+from rocketserializer.components.fins import (
+    search_elliptical_fins,
+    search_trapezoidal_fins,
+)
+from rocketserializer.components.motor import get_thrust_curve, write_thrust_curve
+from rocketserializer.components.nose_cone import search_nosecone
+from rocketserializer.components.rail_buttons import search_rail_buttons
+from rocketserializer.components.transition import search_transitions
+from rocketserializer.nb_builder import NotebookBuilder
+from rocketserializer.ork_extractor import __get_elements, __init_vectors
+
+
+@pytest.fixture(scope="module")
+def filtered_flight_data(case):
+    return __init_vectors(case.bs, case.flight_data)[1]
+
+
+def test_parse_ork_file(benchmark, case):
+    benchmark.group = "parse_ork_file"
+    benchmark(parse_ork_file, case.path)
+
+
+def test_init_vectors(benchmark, case):
+    benchmark.group = "init_vectors"
+    benchmark(__init_vectors, case.bs, case.flight_data)
+
+
+def test_component_extraction(benchmark, case):
+    benchmark.group = "component_extraction"
+    rocket = case.settings["rocket"]
+
+    def extract():
+        design = DesignIndex(case.bs)
+        elements = ElementIndex(
+            __get_elements(
+                design,
+                None,
+                rocket["center_of_mass_without_propellant"],
+                rocket["mass"],
+            )
+        )
+        search_nosecone(design, elements, rocket["radius"])
+        search_trapezoidal_fins(design, elements)
+        search_elliptical_fins(design, elements)
+        search_transitions(design, elements)
+        search_rail_buttons(design, elements)
+
+    benchmark(extract)
+
+
+def test_curves(benchmark, case, filtered_flight_data, tmp_path):
+    benchmark.group = "curves"
+
+    def curves():
+        write_drag_curve(get_drag_curve(filtered_flight_data), str(tmp_path))
+        write_thrust_curve(get_thrust_curve(filtered_flight_data), str(tmp_path))
+
+    benchmark(curves)
+
+
+def test_build_notebook(benchmark, case, tmp_path):
+    benchmark.group = "build_notebook"
+    builder = NotebookBuilder(str(case.parameters_json))
+    benchmark(builder.build, str(tmp_path))
@@ -0,0 +1,52 @@
+"""Cost of the log payloads of a conversion when the log level is disabled.
+
+Run with ``pytest benchmarks``. The eager case renders the dictionaries even
+though nothing is logged, which is what the search_* functions used to do.
+"""
+
+import json
+import logging
+from pathlib import Path
+
+import pytest
+
+from rocketserializer._helpers import (
+    _dict_to_string,
+    _lazy_dict_to_string,
+    parse_ork_file,
+)
+from rocketserializer.components.component_tree import (
+    process_elements_position_from_xml,
+)
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+# the largest of the example designs
+LARGEST = max(EXAMPLES.glob("*/rocket.ork"), key=lambda path: path.stat().st_size)
+
+
+@pytest.fixture(scope="module")
+def payload():
+    bs, _ = parse_ork_file(LARGEST)
+    with open(LARGEST.parent / "parameters.json", "r", encoding="utf-8") as file:
+        settings = json.load(file)
+    return {"elements": process_elements_position_from_xml(bs), "settings": settings}
+
+
+@pytest.fixture
+def logger():
+    logger = logging.getLogger("rocketserializer.benchmarks")
+    logger.setLevel(logging.WARNING)
+    return logger
+
+
+def test_disabled_eager_logging(benchmark, logger, payload):
+    benchmark(lambda: logger.info("%s", _dict_to_string(payload, indent=23)))
+
+
+def test_disabled_lazy_logging(benchmark, logger, payload):
+    benchmark(lambda: logger.info("%s", _lazy_dict_to_string(payload, indent=23)))
+
+
+def test_disabled_no_payload(benchmark, logger):
+    benchmark(lambda: logger.info("Nothing to render"))
@@ -1,6 +1,8 @@
 import logging
 import os
 
+from rocketserializer.cli import ork2json_batch
+
 # Configure the logging settings
 logging.basicConfig(
     filename="script.log",  # Specify the log file name
@@ -10,29 +12,24 @@ logging.basicConfig(
 )
 
 
-def destroy_the_bank(file):
+def destroy_the_bank(files, output):
     """
-    Run the 'ork2json' command on the given file.
+    Run the 'ork2json-batch' command on the given files, using one process
+    (and one OpenRocket instance) per core. Each file is saved to a folder with
+    the same name, without the '.ork' extension.
 
     Args:
-        file (str): The path to the .ork file.
+        files (list of str): The paths to the .ork files.
+        output (str): The base output folder.
     """
-    cli = "ork2json"
-    output = file[:-4]  # Remove '.ork' extension
-    verbose = True
-
-    command = f"{cli} --filepath {file} --output {output} --verbose {verbose}"
-    logging.info(f"Executing command: {command}")
+    arguments = []
+    for file in files:
+        arguments += ["--filepath", file]
+    arguments += ["--output", output, "--verbose", "True"]
+    arguments += ["--workers", str(os.cpu_count() or 1)]
+    logging.info("Executing command: ork2json-batch %s", " ".join(arguments))
 
-    try:
-        import subprocess
-
-        subprocess.run(command, shell=True, check=True)
-        logging.info(f"Execution successful for file: {file}")
-    except subprocess.CalledProcessError as e:
-        logging.error(f"Error in file: {file}")
-        logging.error(str(e))
-        raise
+    ork2json_batch(arguments, standalone_mode=False)
 
 
 if __name__ == "__main__":
@@ -44,9 +41,8 @@ if __name__ == "__main__":
         if name.startswith("Team")
     ]
 
-    for file in ork_files:
-        try:
-            destroy_the_bank(file)
-        except Exception as e:
-            # Log any unexpected exceptions
-            logging.exception(f"An unexpected error occurred in file: {file}")
+    try:
+        destroy_the_bank(ork_files, folder)
+    except Exception as e:
+        # Log any unexpected exceptions, e.g. the files that failed to convert
+        logging.exception("An unexpected error occurred: %s", e)
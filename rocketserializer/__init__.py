@@ -1 +1,2 @@
+from .converter import ConversionResult, convert
 from .ork_extractor import ork_extractor
@@ -1,14 +1,74 @@
+import io
 import logging
-import os
-import shutil
+from contextlib import contextmanager
 from pathlib import Path
 from zipfile import BadZipFile, ZipFile
 
+import numpy as np
 from bs4 import BeautifulSoup
+from lxml import etree
+
+from .flight_data import FlightDataTable
 
 logger = logging.getLogger(__name__)
 
 
+ZIP_MAGIC_BYTES = b"PK\x03\x04"
+
+
+def is_zip_file(path: Path) -> bool:
+    """Checks whether the file is a zip archive by sniffing its first bytes.
+
+    Parameters
+    ----------
+    path : Path
+        The path to the file.
+
+    Returns
+    -------
+    bool
+        True if the file starts with the zip magic bytes, False otherwise.
+    """
+    with open(path, "rb") as file:
+        return file.read(len(ZIP_MAGIC_BYTES)) == ZIP_MAGIC_BYTES
+
+
+@contextmanager
+def open_ork_file(ork_path: Path):
+    """Opens the .ork file for reading in binary mode. If the .ork file is a
+    compressed archive, the rocket.ork member is streamed straight from the
+    archive, without writing anything to disk.
+
+    Parameters
+    ----------
+    ork_path : Path or bytes
+        The path to the .ork file, either plain xml or a zip archive, or the
+        content of the file itself.
+
+    Yields
+    ------
+    file-like
+        A binary file object with the xml content of the .ork file.
+    """
+    if isinstance(ork_path, (bytes, bytearray)):
+        data = io.BytesIO(ork_path)
+        if ork_path.startswith(ZIP_MAGIC_BYTES):
+            with ZipFile(data) as zf, zf.open("rocket.ork") as file:
+                yield file
+        else:
+            yield data
+    elif is_zip_file(ork_path):
+        with ZipFile(ork_path) as zf, zf.open("rocket.ork") as file:
+            logger.info(
+                'Reading rocket.ork directly from the archive "%s"',
+                ork_path.as_posix(),
+            )
+            yield file
+    else:
+        with open(ork_path, "rb") as file:
+            yield file
+
+
 def extract_ork_from_zip(zip_path: Path, extract_dir: Path) -> Path:
     """Extracts .ork file from a zip archive and returns its path.
     This is important because sometimes the .xml file is stuck inside the .ork
@@ -21,6 +81,10 @@ def extract_ork_from_zip(zip_path: Path, extract_dir: Path) -> Path:
     you see a bunch of weird characters, it is probably a "zip" file. You can
     try to rename the file to .zip and open it with a zip extractor.
 
+    The conversion itself does not need the extracted file, since
+    `parse_ork_file` reads compressed archives in memory. This function is
+    only needed when the xml file itself is wanted.
+
     Parameters
     ----------
     zip_path : Path
@@ -33,10 +97,14 @@ def extract_ork_from_zip(zip_path: Path, extract_dir: Path) -> Path:
     Path
         The path to the extracted .ork file.
     """
+    if not is_zip_file(zip_path):
+        logger.warning(
+            'The file "%s" seems to be a rocket.ork file and not a compressed archive.',
+            zip_path.as_posix(),
+        )
+        return zip_path
     try:
-        temp_zip_path = zip_path.with_suffix(".zip")
-        shutil.copy(zip_path, temp_zip_path)
-        with ZipFile(temp_zip_path) as zf:
+        with ZipFile(zip_path) as zf:
             zf.extract("rocket.ork", path=extract_dir)
         logger.info(
             'Successfully extracted rocket.ork from "%s" to "%s"',
@@ -44,57 +112,111 @@ def extract_ork_from_zip(zip_path: Path, extract_dir: Path) -> Path:
             extract_dir.as_posix(),
         )
         return extract_dir / "rocket.ork"
-    except BadZipFile:
-        logger.warning(
-            'The file "%s" seems to be a rocket.ork file and not a compressed archive.',
-            zip_path.as_posix(),
-        )
-        return zip_path
-    except Exception as e:
+    except (BadZipFile, KeyError) as e:
         logger.error(
             'Error while extracting data from "%s": %s', zip_path.as_posix(), e
         )
         raise
-    finally:
-        if temp_zip_path.exists():
-            os.remove(temp_zip_path)
 
 
 def parse_ork_file(ork_path: Path):
-    """Parses the .ork file and returns BeautifulSoup and a list of datapoints.
+    """Parses the .ork file and returns BeautifulSoup and the simulation data.
+    The file is read incrementally: the values of the ``<datapoint>`` tags are
+    streamed into numeric buffers and dropped from the XML tree right away, so
+    the BeautifulSoup object only holds the design section of the file.
+
+    Compressed .ork files are read directly from the archive, see
+    `open_ork_file`.
 
     Parameters
     ----------
-    ork_path : Path
-        The path to the .ork file.
+    ork_path : Path or bytes
+        The path to the .ork file, or the content of the file itself.
 
     Returns
     -------
     BeautifulSoup
-        The BeautifulSoup object.
+        The BeautifulSoup object, without the ``<datapoint>`` tags.
+    list of FlightDataTable
+        The data of each ``<databranch>`` tag, in the order of the document.
     """
+    name = _source_name(ork_path)
     try:
-        with open(ork_path, encoding="utf-8") as file:
-            bs = BeautifulSoup(file, features="xml")
-            datapoints = bs.findAll("datapoint")
-            logger.info(
-                "Successfully parsed .ork file at '%s' with %d datapoints",
-                ork_path.as_posix(),
-                len(datapoints),
-            )
-            return bs, datapoints
-    except UnicodeDecodeError as exc:
+        with open_ork_file(ork_path) as file:
+            root, databranches = _stream_ork_file(file)
+        bs = BeautifulSoup(etree.tostring(root), features="xml")
+        logger.info(
+            "Successfully parsed .ork file at '%s' with %d datapoints",
+            name,
+            sum(len(databranch) for databranch in databranches),
+        )
+        return bs, databranches
+    except etree.XMLSyntaxError as exc:
         error_msg = (
-            "The .ork file is not in UTF-8."
+            f"The .ork file '{name}' is not a valid XML file: {exc}. "
             + "Please open the .ork file in a text editor and save it as UTF-8."
         )
         logger.error(error_msg)
-        raise UnicodeDecodeError(error_msg) from exc
+        raise ValueError(error_msg) from exc
     except Exception as e:
-        logger.error("Error while parsing the file '%s': %s", ork_path.as_posix(), e)
+        logger.error("Error while parsing the file '%s': %s", name, e)
         raise e
 
 
+def _source_name(ork_path):
+    """Returns the name of a .ork file for the log messages."""
+    if isinstance(ork_path, (bytes, bytearray)):
+        return "<in-memory .ork file>"
+    return Path(ork_path).as_posix()
+
+
+def _stream_ork_file(file, initial_rows=1024):
+    """Incrementally parses an open .ork (xml) file. Each ``<datapoint>`` is
+    written into a preallocated buffer of its ``<databranch>`` as soon as it is
+    read, and then removed from the tree.
+
+    Parameters
+    ----------
+    file : file-like
+        The .ork file, opened in binary mode.
+    initial_rows : int, optional
+        Number of rows preallocated for each databranch. The buffer doubles
+        its size whenever it gets full. Default is 1024.
+
+    Returns
+    -------
+    lxml.etree._Element
+        The root of the document, without the ``<datapoint>`` tags.
+    list of FlightDataTable
+        The data of each ``<databranch>`` tag, in the order of the document.
+    """
+    databranches = []
+    labels, buffer, rows = [], np.empty((0, 0)), 0
+    in_branch = False
+    context = etree.iterparse(
+        file, events=("start", "end"), tag=("databranch", "datapoint"), huge_tree=True
+    )
+    for event, element in context:
+        if element.tag == "datapoint":
+            if event == "end":
+                # datapoints outside of a databranch or without values are
+                # not part of any table
+                if in_branch and element.text:
+                    if rows == len(buffer):
+                        buffer = np.concatenate([buffer, np.empty_like(buffer)])
+                    buffer[rows] = element.text.split(",")
+                    rows += 1
+                element.getparent().remove(element)
+        elif event == "start":
+            labels = element.get("types", "").split(",")
+            buffer, rows = np.empty((initial_rows, len(labels))), 0
+            in_branch = True
+        else:
+            databranches.append(FlightDataTable(buffer[:rows].copy(), labels))
+            in_branch = False
+    return context.root, databranches
+
+
 def _dict_to_string(dictionary, indent=0):
     """Converts a dictionary to a string.
 
@@ -116,14 +238,45 @@ def _dict_to_string(dictionary, indent=0):
     >>> _dict_to_string({"a": 1, "b": {"c": 2}})
     " a: 1\n b: \n     c: 2\n"
     """
-    string = ""
+    lines = []
+    _dict_to_lines(dictionary, indent, lines)
+    return "".join(lines)
+
+
+def _dict_to_lines(dictionary, indent, lines):
     for key, value in dictionary.items():
-        string += " " * indent + str(key) + ": "
         if isinstance(value, dict):
-            string += "\n" + _dict_to_string(value, indent + 4)
+            lines.append(" " * indent + str(key) + ": \n")
+            _dict_to_lines(value, indent + 4, lines)
         else:
-            string += str(value) + "\n"
-    return string
+            lines.append(" " * indent + str(key) + ": " + str(value) + "\n")
+
+
+class _LazyDictString:
+    """Log argument that renders a dictionary with `_dict_to_string` only when
+    the log record is actually emitted, so a disabled log level costs nothing
+    but the creation of this object."""
+
+    __slots__ = ("dictionary", "indent")
+
+    def __init__(self, dictionary, indent=0):
+        self.dictionary = dictionary
+        self.indent = indent
+
+    def __str__(self):
+        return _dict_to_string(self.dictionary, self.indent)
+
+
+def _lazy_dict_to_string(dictionary, indent=0):
+    """Lazy version of `_dict_to_string`, to be used as a logging argument.
+
+    Examples
+    --------
+    >>> import logging
+    >>> from rocketserializer._helpers import _lazy_dict_to_string
+    >>> logging.getLogger().debug("%s", _lazy_dict_to_string({"a": 1}))
+    """
+    return _LazyDictString(dictionary, indent)
 
 
 # if __name__ == "__main__":
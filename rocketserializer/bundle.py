@@ -0,0 +1,167 @@
+import json
+import logging
+import os
+import struct
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+from .flight_data import FlightDataTable
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_NAME = "parameters.npz"
+
+# size and layout of the local file header of a zip member
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+
+
+def save_bundle(settings, curves, output_folder):
+    """Saves the settings and the curves of a conversion to a single, binary
+    "parameters.npz" file.
+
+    The bundle is an uncompressed NumPy archive with the arrays:
+
+    - ``settings``: the settings dictionary, as a json string.
+    - ``drag_curve``: the (mach, cd) drag curve, in full precision.
+    - ``thrust_source``: the (time, thrust) curve, in full precision.
+    - ``flight_data``: the complete simulation data of the .ork file, with one
+      column per label.
+    - ``flight_data_labels``: the labels of the columns of ``flight_data``.
+    - ``drag_curve_<index>`` and ``thrust_source_<index>``: the curves of each
+      extracted simulation, if any.
+    - ``power_on_drag`` and ``power_off_drag``: the drag tables, if they were
+      built, also with the ``_<index>`` suffix for each simulation.
+
+    In the settings, the "drag_curve", "thrust_source", "power_on_drag" and
+    "power_off_drag" values are the names of the arrays in the bundle.
+
+    Parameters
+    ----------
+    settings : dict
+        The settings generated by `ork_extractor`.
+    curves : dict
+        The curves collected by `ork_extractor`, with the "drag_curve",
+        "thrust_source" and "flight_data" keys, and optionally "simulations"
+        and "drag_tables".
+    output_folder : str
+        Folder where the bundle is saved.
+
+    Returns
+    -------
+    path : str
+        The path to the bundle.
+    """
+    settings["rocket"]["drag_curve"] = "drag_curve"
+    settings["motors"]["thrust_source"] = "thrust_source"
+    flight_data = curves["flight_data"]
+
+    simulation_curves = _drag_table_arrays(settings, curves.get("drag_tables"))
+    for idx, simulation in (curves.get("simulations") or {}).items():
+        for name in ("drag_curve", "thrust_source"):
+            simulation_curves[f"{name}_{idx}"] = simulation[name]
+        settings["simulations"][idx]["rocket"]["drag_curve"] = f"drag_curve_{idx}"
+        settings["simulations"][idx]["motors"]["thrust_source"] = f"thrust_source_{idx}"
+        simulation_curves.update(
+            _drag_table_arrays(
+                settings["simulations"][idx], simulation.get("drag_tables"), f"_{idx}"
+            )
+        )
+
+    path = os.path.join(output_folder, BUNDLE_NAME)
+    np.savez(
+        path,
+        settings=np.array(json.dumps(settings, ensure_ascii=False)),
+        drag_curve=curves["drag_curve"],
+        thrust_source=curves["thrust_source"],
+        flight_data=flight_data.data,
+        flight_data_labels=np.array(flight_data.labels),
+        **simulation_curves,
+    )
+    logger.info("The bundle was saved to: '%s'", Path(path).as_posix())
+    return path
+
+
+def _drag_table_arrays(settings, tables, suffix=""):
+    """Returns the arrays of the drag tables, if any, pointing the rocket
+    settings to them."""
+    if tables is None:
+        return {}
+    arrays = {f"{name}{suffix}": table for name, table in tables.items()}
+    settings["rocket"].update({name: f"{name}{suffix}" for name in tables})
+    return arrays
+
+
+def load_bundle(path, mmap=True):
+    """Loads a bundle saved by `save_bundle`.
+
+    Parameters
+    ----------
+    path : str
+        Path to the "parameters.npz" file.
+    mmap : bool, optional
+        If True, the arrays are memory-mapped from the file instead of read,
+        so no data is copied until it is used. Default is True.
+
+    Returns
+    -------
+    dict
+        Dictionary with the "settings" dictionary, the "drag_curve" and
+        "thrust_source" arrays and the "flight_data" FlightDataTable. The
+        drag tables and the curves of the extracted simulations, if any, are
+        also included by the names of their arrays, e.g. "drag_curve_1".
+    """
+    if mmap:
+        arrays = _memmap_npz(path)
+    else:
+        with np.load(path) as npz:
+            arrays = {name: npz[name] for name in npz.files}
+
+    bundle = {
+        name: array
+        for name, array in arrays.items()
+        if name.startswith(
+            ("drag_curve_", "thrust_source_", "power_on_drag", "power_off_drag")
+        )
+    }
+    bundle.update(
+        {
+            "settings": json.loads(str(arrays["settings"][()])),
+            "drag_curve": arrays["drag_curve"],
+            "thrust_source": arrays["thrust_source"],
+            "flight_data": FlightDataTable(
+                arrays["flight_data"],
+                [str(label) for label in arrays["flight_data_labels"]],
+            ),
+        }
+    )
+    return bundle
+
+
+def _memmap_npz(path):
+    """Memory-maps each array of an uncompressed .npz file."""
+    arrays = {}
+    with open(path, "rb") as file, zipfile.ZipFile(file) as archive:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"Can not memory-map the compressed '{path}' file.")
+            # the data of a member starts after its local header, name and extra
+            file.seek(info.header_offset)
+            header = _LOCAL_HEADER.unpack(file.read(_LOCAL_HEADER.size))
+            file.seek(header[-2] + header[-1], os.SEEK_CUR)
+
+            version = np.lib.format.read_magic(file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+            arrays[info.filename[: -len(".npy")]] = np.memmap(
+                file.name,
+                dtype=dtype,
+                mode="r",
+                offset=file.tell(),
+                shape=shape,
+                order="F" if fortran_order else "C",
+            )
+    return arrays
@@ -0,0 +1,246 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from importlib import metadata
+from pathlib import Path
+
+from .components.id import format_filepath
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "rocketserializer"
+DEFAULT_MAX_SIZE = 256 * 1024**2  # bytes
+
+
+def serializer_version():
+    """Returns the installed version of rocketserializer, or "unknown"."""
+    try:
+        return metadata.version("rocketserializer")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+class ConversionCache:
+    """Content-addressed, on-disk cache of .ork conversions.
+
+    Each entry is keyed by the hash of the bytes of the .ork file, the
+    rocketserializer version and the options that change the outputs of the
+    conversion. An entry stores the settings dictionary together with the
+    files generated next to it (e.g. drag_curve.csv and thrust_source.csv), so
+    a repeated conversion of an unchanged design only has to copy them to the
+    output folder. The least recently used entries are evicted whenever the
+    cache grows larger than `max_size`.
+
+    Examples
+    --------
+    >>> from rocketserializer.cache import ConversionCache
+    >>> cache = ConversionCache("my_cache_folder")
+    >>> key = cache.key("rocket.ork")  # doctest: +SKIP
+    >>> settings = cache.get(key, "rocket.ork", "output")  # doctest: +SKIP
+    """
+
+    def __init__(self, directory=None, max_size=None):
+        """Creates the cache.
+
+        Parameters
+        ----------
+        directory : str, optional
+            Folder where the entries are saved. If None, the value of the
+            ROCKETSERIALIZER_CACHE_DIR environment variable is used, falling
+            back to "~/.cache/rocketserializer".
+        max_size : int, optional
+            Maximum size of the cache, in bytes. If None, the value of the
+            ROCKETSERIALIZER_CACHE_SIZE environment variable is used, falling
+            back to 256 MB.
+        """
+        directory = directory or os.environ.get("ROCKETSERIALIZER_CACHE_DIR")
+        max_size = max_size or os.environ.get("ROCKETSERIALIZER_CACHE_SIZE")
+        self.directory = Path(directory) if directory else DEFAULT_CACHE_DIR
+        self.max_size = int(max_size) if max_size else DEFAULT_MAX_SIZE
+
+    def key(self, filepath, options=None):
+        """Computes the key of a conversion.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the .ork file.
+        options : dict, optional
+            The conversion options that change its outputs.
+
+        Returns
+        -------
+        str
+            The hexadecimal sha256 digest identifying the conversion.
+        """
+        digest = hashlib.sha256()
+        with open(filepath, "rb") as file:
+            for chunk in iter(lambda: file.read(1024**2), b""):
+                digest.update(chunk)
+        digest.update(serializer_version().encode())
+        digest.update(json.dumps(options or {}, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def get(self, key, filepath, output_folder):
+        """Restores a cached conversion to the output folder.
+
+        Parameters
+        ----------
+        key : str
+            The key of the conversion, see `key`.
+        filepath : str
+            Path to the .ork file being converted.
+        output_folder : str
+            Folder where the cached files are copied to.
+
+        Returns
+        -------
+        dict or None
+            The settings of the conversion, with the paths pointing to the
+            output folder, or None if the conversion is not cached.
+        """
+        entry = self.directory / key
+        try:
+            with open(entry / "entry.json", "r", encoding="utf-8") as file:
+                cached = json.load(file)
+            os.makedirs(output_folder, exist_ok=True)
+            for name in cached["artifacts"]:
+                shutil.copyfile(entry / name, os.path.join(output_folder, name))
+            os.utime(entry)  # mark as recently used
+        except (OSError, ValueError, KeyError):
+            logger.info("Cache miss for '%s'", Path(filepath).as_posix())
+            return None
+
+        settings = relocate(
+            cached["settings"],
+            cached["output_folder"],
+            output_folder,
+            cached["artifacts"],
+        )
+        settings["id"]["filepath"] = format_filepath(filepath)
+        logger.info("Cache hit for '%s'", Path(filepath).as_posix())
+        return settings
+
+    def put(self, key, settings, output_folder, artifacts=None):
+        """Saves a conversion to the cache. The files of the output folder that
+        are referenced by the settings are stored along with them.
+
+        Parameters
+        ----------
+        key : str
+            The key of the conversion, see `key`.
+        settings : dict
+            The settings generated by the conversion.
+        output_folder : str
+            Folder where the conversion saved its files.
+        artifacts : list of str, optional
+            Names of other files of the output folder to be stored as well.
+        """
+        artifacts = sorted(
+            {
+                Path(value).name
+                for value in iter_strings(settings)
+                if is_in_folder(value, output_folder) and os.path.isfile(value)
+            }.union(artifacts or [])
+        )
+        entry = self.directory / key
+        temporary = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # unique to each call, so concurrent threads never share it
+            temporary = Path(
+                tempfile.mkdtemp(prefix=f"{key}.", suffix=".tmp", dir=self.directory)
+            )
+            for name in artifacts:
+                shutil.copyfile(os.path.join(output_folder, name), temporary / name)
+            with open(temporary / "entry.json", "w", encoding="utf-8") as file:
+                json.dump(
+                    {
+                        "settings": settings,
+                        "output_folder": str(output_folder),
+                        "artifacts": artifacts,
+                    },
+                    file,
+                )
+            shutil.rmtree(entry, ignore_errors=True)
+            os.replace(temporary, entry)
+        except OSError as e:
+            # a failure to cache must never break the conversion itself
+            logger.warning("Could not save the conversion to the cache: %s", e)
+            if temporary is not None:
+                shutil.rmtree(temporary, ignore_errors=True)
+            return
+        logger.info("Conversion saved to the cache entry '%s'", entry.as_posix())
+        self.evict()
+
+    def evict(self):
+        """Removes the least recently used entries until the cache is not
+        larger than `max_size`.
+
+        Returns
+        -------
+        int
+            The number of removed entries.
+        """
+        if not self.directory.is_dir():
+            return 0
+        entries = []
+        for entry in self.directory.iterdir():
+            if entry.is_dir() and entry.suffix != ".tmp":
+                size = sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+                entries.append((entry.stat().st_mtime, size, entry))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry in entries:
+            if total <= self.max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            removed += 1
+        if removed:
+            logger.info("Evicted %d entries from the cache", removed)
+        return removed
+
+    def clear(self):
+        """Removes all the entries of the cache."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def iter_strings(value):
+    """Yields every string of the nested dicts, lists and tuples of value."""
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from iter_strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from iter_strings(item)
+    elif isinstance(value, str):
+        yield value
+
+
+def is_in_folder(path, folder):
+    """Returns True if the file of path is directly inside folder."""
+    return os.path.abspath(os.path.dirname(path)) == os.path.abspath(folder)
+
+
+def relocate(value, old_folder, new_folder, artifacts):
+    """Points the paths to cached artifacts in the settings to the new folder."""
+    if isinstance(value, dict):
+        return {
+            key: relocate(item, old_folder, new_folder, artifacts)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [relocate(item, old_folder, new_folder, artifacts) for item in value]
+    if (
+        isinstance(value, str)
+        and is_in_folder(value, old_folder)
+        and Path(value).name in artifacts
+    ):
+        return os.path.join(new_folder, Path(value).name)
+    return value
@@ -1,22 +1,25 @@
-import json
+import glob
 import logging
+import logging.handlers
+import multiprocessing
+import multiprocessing.util
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import click
-import orhelper
 
-from ._helpers import extract_ork_from_zip, parse_ork_file
+from ._helpers import extract_ork_from_zip, is_zip_file
+from .cache import ConversionCache
+from .converter import convert, convert_cached, convert_to_folder, restore_from_cache
 from .nb_builder import NotebookBuilder
-from .ork_extractor import ork_extractor
+from .openrocket import OpenRocketSession
+from .profiler import ConversionProfiler
+from .server import ConversionServer
+
+LOG_FILE = "serializer.log"
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    datefmt="%Y.%b.%d %H:%M:%S",
-    filename="serializer.log",
-    filemode="w",
-)
 logger = logging.getLogger(__name__)
 
 console = logging.StreamHandler()
@@ -56,6 +59,21 @@ def cli():
     """
 
 
+def _setup_logging():
+    """Saves the logs of the process to the "serializer.log" file of the
+    current directory, which is truncated by the first command of the process.
+    It is done when a command runs, not when the module is imported, so that
+    importing it (e.g. in the batch worker processes) does not touch the file.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        datefmt="%Y.%b.%d %H:%M:%S",
+        filename=LOG_FILE,
+        filemode="w",
+    )
+
+
 @cli.command("ork2json")
 @click.option(
     "--filepath", type=click.Path(), required=True, help="The path to the .ork file."
@@ -68,11 +86,103 @@ def cli():
     type=click.Path(),
     default=None,
     required=False,
-    help="The path to the OpenRocket .jar file.",
+    help="The path to the OpenRocket .jar file. Only needed for the files that "
+    "can not be resolved from their xml.",
 )
 @click.option("--encoding", type=str, default="utf-8", required=False)
 @click.option("--verbose", type=bool, default=False, required=False)
-def ork2json(filepath, output=None, ork_jar=None, encoding="utf-8", verbose=False):
+@click.option(
+    "--extract",
+    type=bool,
+    default=False,
+    required=False,
+    help="Also write the xml of a compressed .ork file next to it.",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["json", "npz"]),
+    default="json",
+    required=False,
+    help="Save a parameters.json file with .csv curves (json), or a single "
+    "binary parameters.npz bundle with full precision curves and flight data (npz).",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=True,
+    help="Reuse previous conversions of unchanged .ork files. Enabled by default.",
+)
+@click.option(
+    "--cache_dir",
+    type=click.Path(),
+    default=None,
+    required=False,
+    help="The folder of the conversion cache.",
+)
+@click.option(
+    "--profile",
+    type=click.Path(),
+    default=None,
+    required=False,
+    help="Save a json report with the time, memory and OpenRocket calls of "
+    "each stage of the conversion to this path.",
+)
+@click.option(
+    "--simulations",
+    type=str,
+    default=None,
+    required=False,
+    help="Also extract these simulations of the .ork file, by name or index, "
+    "separated by commas, or 'all' for every simulation with data.",
+)
+@click.option(
+    "--drag_table_step",
+    type=float,
+    default=None,
+    required=False,
+    help="Also save the power-on and power-off drag tables, averaged in Mach "
+    "bins of this width, e.g. 0.01.",
+)
+@click.option(
+    "--curve_precision",
+    type=str,
+    default=None,
+    required=False,
+    help="Number of decimal places of the .csv curves, or 'repr' for the "
+    "shortest text that reads back to the exact values.",
+)
+@click.option(
+    "--compress_curves",
+    type=bool,
+    default=False,
+    required=False,
+    help="Save the .csv curves compressed with gzip, as .csv.gz files.",
+)
+@click.option(
+    "--curve_tolerance",
+    type=float,
+    default=None,
+    required=False,
+    help="Decimate the curves, keeping their interpolation error below this "
+    "fraction of the largest value of each curve, e.g. 0.001.",
+)
+def ork2json(
+    filepath,
+    output=None,
+    ork_jar=None,
+    encoding="utf-8",
+    verbose=False,
+    extract=False,
+    output_format="json",
+    cache=True,
+    cache_dir=None,
+    profile=None,
+    simulations=None,
+    drag_table_step=None,
+    curve_precision=None,
+    compress_curves=False,
+    curve_tolerance=None,
+):
     """Generates a .json file from the .ork file.
     The .json file will be generated in the output folder using the information
     of the .ork file. It is possible to specify the .eng file to extract the
@@ -87,11 +197,60 @@ def ork2json(filepath, output=None, ork_jar=None, encoding="utf-8", verbose=Fals
         The path to the output folder.
     ork_jar : str, optional
         The path to the OpenRocket .jar file. If unspecified, the .jar file
-        will be searched in the current directory.
+        will be searched in the current directory. OpenRocket is only started
+        when the components can not be resolved from the xml of the file.
     encoding : str, optional
         The encoding of the .json file. Default is 'utf-8'.
     verbose : bool, optional
         If True, the log level will be set to DEBUG. Default is False.
+    extract : bool, optional
+        If True and the .ork file is a compressed archive, the rocket.ork (xml)
+        file inside it is also extracted to the folder of the .ork file. The
+        conversion itself never needs it. Default is False.
+    output_format : str, optional
+        Either "json", to save a parameters.json file together with the
+        drag_curve.csv and thrust_source.csv files, or "npz", to save all the
+        settings, the full precision curves and the complete flight data to a
+        single binary parameters.npz file instead. See `save_bundle`. Default
+        is "json".
+    cache : bool, optional
+        If True, the conversion cache is consulted before starting OpenRocket,
+        and a new conversion is saved to it. Default is True.
+    cache_dir : str, optional
+        The folder of the conversion cache. If unspecified, the value of the
+        ROCKETSERIALIZER_CACHE_DIR environment variable is used, falling back
+        to "~/.cache/rocketserializer".
+    profile : str, optional
+        If given, the conversion is profiled and the report, with the wall
+        time, CPU time, peak memory and OpenRocket calls of each stage, is
+        saved to this json file. See `ConversionProfiler`.
+    simulations : str, optional
+        The simulations of the .ork file to extract besides the first one,
+        under the "simulations" key of the parameters.json file. Either "all"
+        or their names or indexes separated by commas, e.g. "0,Simulation 3".
+        Each one gets its own drag_curve_<index>.csv and
+        thrust_source_<index>.csv files. Default is None.
+    drag_table_step : float, optional
+        If given, the drag data up to the apogee is split at the burnout and
+        each phase is averaged in Mach bins of this width, e.g. 0.01. The
+        resulting tables, with strictly increasing Mach numbers, are saved to
+        the drag_curve_power_on.csv and drag_curve_power_off.csv files, under
+        the "power_on_drag" and "power_off_drag" keys of the rocket. The
+        drag_curve.csv file is still saved. Default is None.
+    curve_precision : str, optional
+        The number of decimal places of the values of the .csv curves, or
+        "repr" to write the shortest text that is read back to exactly the same
+        values. By default, the drag curve has 6 decimal places and the thrust
+        curve has 5.
+    compress_curves : bool, optional
+        If True, the .csv curves are compressed with gzip and saved to .csv.gz
+        files instead. Default is False.
+    curve_tolerance : float, optional
+        If given, the drag and thrust curves are decimated, removing the points
+        that a linear interpolation reproduces within this fraction of the
+        largest value of each curve. The point reduction and the maximum
+        interpolation error of each curve are saved under the "decimation" key
+        of the parameters.json file. Default is None.
 
     Raises
     ------
@@ -100,138 +259,559 @@ def ork2json(filepath, output=None, ork_jar=None, encoding="utf-8", verbose=Fals
     ValueError
         In case the .ork file is not in English.
     """
+    _setup_logging()
     log_level = logging.DEBUG if verbose else logging.WARNING
     logger.setLevel(log_level)
 
     filepath = Path(filepath)
+    if extract and filepath.exists() and is_zip_file(filepath):
+        extracted = extract_ork_from_zip(filepath, filepath.parent)
+        logger.info("[ork2json] Extracted .ork file to: %s", extracted.as_posix())
+
+    cache = ConversionCache(cache_dir) if cache else None
+    simulations = _parse_simulations(simulations)
+    curve_options = _curve_options(curve_precision, compress_curves, curve_tolerance)
+    arguments = (
+        filepath,
+        output,
+        ork_jar,
+        encoding,
+        cache,
+        output_format,
+        simulations,
+        curve_options,
+        drag_table_step,
+    )
+    if profile is None:
+        convert_cached(*arguments)
+        return
+
+    with ConversionProfiler() as profiler:
+        convert_cached(*arguments)
+    profiler.save(profile)
+    logger.info("[ork2json] Profile report saved to: %s", Path(profile).as_posix())
+
+
+def _parse_simulations(value):
+    """Parses the --simulations option: None, "all" or a list of names and
+    indexes (the items made of digits only)."""
+    if value is None or value == "all":
+        return value
+    return [
+        int(item) if item.strip().isdigit() else item.strip()
+        for item in value.split(",")
+    ]
+
+
+def _curve_options(precision=None, compress=False, tolerance=None):
+    """Returns the options of `ConversionResult.save` for the .csv curves,
+    leaving the defaults out."""
+    options = {}
+    if precision is not None:
+        options["precision"] = precision if precision == "repr" else int(precision)
+    if compress:
+        options["compress"] = True
+    if tolerance is not None:
+        options["tolerance"] = tolerance
+    return options or None
+
+
+@cli.command("ork2json-batch")
+@click.option(
+    "--filepath",
+    type=str,
+    required=True,
+    multiple=True,
+    help="A .ork file, a folder with .ork files or a glob pattern. Can be repeated.",
+)
+@click.option(
+    "--output",
+    type=click.Path(),
+    required=False,
+    help="The path to the base output folder.",
+)
+@click.option(
+    "--ork_jar",
+    type=click.Path(),
+    default=None,
+    required=False,
+    help="The path to the OpenRocket .jar file. Only needed for the files that "
+    "can not be resolved from their xml.",
+)
+@click.option("--encoding", type=str, default="utf-8", required=False)
+@click.option("--verbose", type=bool, default=False, required=False)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    required=False,
+    help="Number of parallel processes, each one with its own OpenRocket instance.",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["json", "npz"]),
+    default="json",
+    required=False,
+    help="Save a parameters.json file with .csv curves (json), or a single "
+    "binary parameters.npz bundle with full precision curves and flight data (npz).",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=True,
+    help="Reuse previous conversions of unchanged .ork files. Enabled by default.",
+)
+@click.option(
+    "--cache_dir",
+    type=click.Path(),
+    default=None,
+    required=False,
+    help="The folder of the conversion cache.",
+)
+def ork2json_batch(
+    filepath,
+    output=None,
+    ork_jar=None,
+    encoding="utf-8",
+    verbose=False,
+    workers=1,
+    output_format="json",
+    cache=True,
+    cache_dir=None,
+):
+    """Generates a .json file for each one of many .ork files.
+    OpenRocket is only started for the files that can not be resolved from
+    their xml, and a single instance is reused for all of them, so the JVM
+    start up is paid at most once. With more than one worker, the files
+    are shared across a pool of processes, each one holding its own long-lived
+    OpenRocket instance. A failing file does not stop the batch, and a summary
+    with the status of each file is printed at the end.
 
-    if not filepath.exists():
-        error = (
-            "[ork2json] The .ork file or zip archive does not exist. "
-            "Please specify a valid path."
+    Parameters
+    ----------
+    filepath : tuple of str
+        The .ork files to be converted. Each item can be the path to a .ork
+        file, a folder (searched recursively for .ork files) or a glob pattern.
+    output : str, optional
+        The path to the base output folder. Each file is saved to a sub folder
+        that mirrors its location relative to the common folder of all the
+        input files, e.g. "databank/TeamA/rocket.ork" is saved to
+        "<output>/TeamA/rocket/". If unspecified, each file is saved to the
+        folder of its .ork file.
+    ork_jar : str, optional
+        The path to the OpenRocket .jar file. If unspecified, the .jar file
+        will be searched in the current directory.
+    encoding : str, optional
+        The encoding of the .json files. Default is 'utf-8'.
+    verbose : bool, optional
+        If True, the log level will be set to DEBUG. Default is False.
+    workers : int, optional
+        The number of processes used to convert the files. Default is 1, which
+        converts all the files in the current process.
+    output_format : str, optional
+        The format of the outputs, "json" or "npz". See `ork2json`.
+    cache : bool, optional
+        If True, the files with a cached conversion are restored from the
+        cache, and OpenRocket is only started for the remaining ones. Default
+        is True.
+    cache_dir : str, optional
+        The folder of the conversion cache. See `ork2json`.
+
+    Raises
+    ------
+    click.ClickException
+        In case any of the files could not be converted.
+    """
+    _setup_logging()
+    log_level = logging.DEBUG if verbose else logging.WARNING
+    logger.setLevel(log_level)
+
+    filepaths = _expand_ork_paths(filepath)
+    if len(filepaths) == 0:
+        raise click.ClickException(
+            "[ork2json-batch] No .ork files were found for the given paths."
+        )
+    outputs = _batch_output_folders(filepaths, output)
+    cache = ConversionCache(cache_dir) if cache else None
+
+    results = {}
+    for ork_path, ork_output in zip(filepaths, outputs):
+        start = time.perf_counter()
+        if (
+            restore_from_cache(ork_path, ork_output, cache, encoding, output_format)
+            is not None
+        ):
+            results[ork_path] = (ork_path, "CACHED", time.perf_counter() - start, "")
+    pending = [
+        (ork_path, ork_output)
+        for ork_path, ork_output in zip(filepaths, outputs)
+        if ork_path not in results
+    ]
+
+    if pending:
+        workers = min(workers, len(pending))
+        if workers > 1:
+            converted = _run_batch_in_pool(
+                pending, ork_jar, encoding, cache, workers, output_format
+            )
+        else:
+            with OpenRocketSession(ork_jar, log_level="OFF") as session:
+                converted = [
+                    _convert_batch_item(
+                        ork_path, ork_output, session, encoding, cache, output_format
+                    )
+                    for ork_path, ork_output in pending
+                ]
+        results.update((result[0], result) for result in converted)
+
+    results = [results[ork_path] for ork_path in filepaths]
+    _echo_batch_summary(results)
+    failed = sum(1 for _, status, _, _ in results if status == "FAILED")
+    if failed:
+        raise click.ClickException(
+            f"[ork2json-batch] {failed} of {len(results)} files could not be "
+            f"converted. Check the '{LOG_FILE}' file for the details."
         )
-        logger.error(error)
-        raise FileNotFoundError(error)
 
-    if filepath.suffix.lower() == ".ork":
-        extract_dir = filepath.parent
-        filepath = extract_ork_from_zip(filepath, extract_dir)
-        logger.info("[ork2json] Extracted .ork file to: %s", filepath.as_posix())
 
-    bs, datapoints = parse_ork_file(filepath)
+def _convert_batch_item(
+    ork_path, ork_output, session, encoding="utf-8", cache=None, output_format="json"
+):
+    """Converts one file of a batch, returning its status instead of raising.
 
-    if len(datapoints) == 0:
-        error_msg = (
-            "[ork2json] The file must contain the simulation data.\n"
-            + "Open the .ork file and run the simulation first."
+    Returns
+    -------
+    tuple
+        The path to the .ork file, the status ("OK" or "FAILED"), the elapsed
+        time in seconds and the error message, if any.
+    """
+    start = time.perf_counter()
+    try:
+        convert_to_folder(
+            ork_path,
+            ork_output,
+            session,
+            encoding=encoding,
+            cache=cache,
+            output_format=output_format,
         )
-        logger.error(error_msg)
-        raise ValueError(error_msg)
-
-    data_labels = bs.find("databranch").attrs["types"].split(",")
-    if "CG location" not in data_labels:
-        message = (
-            "[ork2json] The file must contain the simulation data.\n"
-            + "Open the .ork file and run the simulation first."
-        )
-        logger.error(message)
-        raise ValueError(message)
-
-    if not ork_jar:
-        # get any .jar file in the current directory that starts with "OpenRocket"
-        ork_jar = [
-            f for f in os.listdir() if f.startswith("OpenRocket") and f.endswith(".jar")
-        ]
-        if len(ork_jar) == 0:
-            raise ValueError(
-                "[ork2json] It was not possible to find the OpenRocket .jar file in "
-                "the current directory. Please specify the path to the .jar file."
-            )
-        ork_jar = ork_jar[0]
-        logger.info(
-            "[ork2json] Found OpenRocket .jar file: '%s'", Path(ork_jar).as_posix()
+        status, message = "OK", ""
+    except Exception as e:  # pylint: disable=broad-except
+        logger.error(
+            "[ork2json-batch] Failed to convert '%s': %s", ork_path.as_posix(), e
         )
+        logger.debug("[ork2json-batch] Traceback:", exc_info=True)
+        status, message = "FAILED", f"{type(e).__name__}: {e}"
+    return ork_path, status, time.perf_counter() - start, message
+
+
+def _run_batch_in_pool(pending, ork_jar, encoding, cache, workers, output_format):
+    """Converts the files of a batch in a pool of processes. Each process has
+    its own OpenRocket session, started at most once and kept for all the files
+    it gets.
+    The results are returned in the same order as the files. The log records
+    of the workers are sent back to this process, which writes them to its
+    own log handlers."""
+    # "spawn" gives every worker a clean interpreter to start its own JVM in
+    context = multiprocessing.get_context("spawn")
+    log_queue = context.Queue()
+    listener = logging.handlers.QueueListener(
+        log_queue, *logging.getLogger().handlers, respect_handler_level=True
+    )
+    listener.start()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_batch_worker,
+            initargs=(ork_jar, logger.level, log_queue),
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _convert_in_batch_worker,
+                    ork_path,
+                    ork_output,
+                    encoding,
+                    cache,
+                    output_format,
+                )
+                for ork_path, ork_output in pending
+            ]
+            results = []
+            for (ork_path, _), future in zip(pending, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:  # pylint: disable=broad-except
+                    # e.g. the worker could not start OpenRocket or died
+                    logger.error(
+                        "[ork2json-batch] Worker failed on '%s': %s",
+                        ork_path.as_posix(),
+                        e,
+                    )
+                    results.append(
+                        (ork_path, "FAILED", 0.0, f"{type(e).__name__}: {e}")
+                    )
+    finally:
+        listener.stop()
+    return results
+
+
+class _BatchWorker:  # pylint: disable=too-few-public-methods
+    """The state of a batch worker process, shared by all its conversions."""
+
+    session = None
+
+
+def _init_batch_worker(ork_jar, log_level, log_queue):
+    """Creates the OpenRocket session of a batch worker process. The instance,
+    if it was ever started, is closed when the worker process exits. The log
+    records are put in the queue, to be written by the parent process."""
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(logging.INFO)
+    logger.setLevel(log_level)
+    _BatchWorker.session = OpenRocketSession(ork_jar, log_level="OFF")
+    multiprocessing.util.Finalize(None, _BatchWorker.session.close, exitpriority=10)
 
+
+def _convert_in_batch_worker(ork_path, ork_output, encoding, cache, output_format):
+    return _convert_batch_item(
+        ork_path, ork_output, _BatchWorker.session, encoding, cache, output_format
+    )
+
+
+def _expand_ork_paths(patterns):
+    """Expands files, folders and glob patterns into a sorted list of unique
+    .ork files. Folders are searched recursively."""
+    filepaths = []
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            matches = sorted(path.rglob("*.ork"))
+        elif glob.has_magic(pattern):
+            matches = sorted(Path(p) for p in glob.glob(pattern, recursive=True))
+        else:
+            matches = [path]
+        filepaths.extend(matches)
+    return list(dict.fromkeys(filepaths))
+
+
+def _batch_output_folders(filepaths, output=None):
+    """Returns the output folder of each .ork file of a batch conversion."""
     if not output:
-        # get the same folder as the .ork file
-        output = os.path.dirname(filepath)
-        logger.warning(
-            "[ork2json] Output folder not specified. Using '%s' instead.",
-            Path(output).as_posix(),
-        )
+        return [filepath.parent for filepath in filepaths]
 
-    # orhelper options are: OFF, ERROR, WARN, INFO, DEBUG, TRACE and ALL
-    # log_level = "OFF" if verbose else "OFF"
-    # TODO: even if the log level is set to OFF, the orhelper still prints msgs
+    filepaths = [filepath.resolve() for filepath in filepaths]
+    root = Path(os.path.commonpath([filepath.parent for filepath in filepaths]))
+    return [
+        Path(output) / filepath.with_suffix("").relative_to(root)
+        for filepath in filepaths
+    ]
 
-    with orhelper.OpenRocketInstance(ork_jar, log_level="OFF") as instance:
-        # create the output folder if it does not exist
-        if os.path.exists(output) is False:
-            os.mkdir(output)
 
-        orh = orhelper.Helper(instance)
-        ork = orh.load_doc(str(filepath))
+def _echo_batch_summary(results):
+    """Prints the status of each file of a batch conversion."""
+    converted = sum(1 for _, status, _, _ in results if status != "FAILED")
+    click.echo(
+        f"[ork2json-batch] {converted} of {len(results)} files converted successfully."
+    )
+    for filepath, status, elapsed, message in results:
+        line = f"  {status:<6} {filepath.as_posix()} ({elapsed:.2f} s)"
+        click.echo(line + (f" {message}" if message else ""))
 
-        settings = ork_extractor(
-            bs=bs,
-            filepath=str(filepath),
-            output_folder=output,
-            ork=ork,
-        )
 
-        with open(
-            os.path.join(output, "parameters.json"), "w", encoding=encoding
-        ) as convert_file:
-            convert_file.write(
-                json.dumps(settings, indent=4, sort_keys=True, ensure_ascii=False)
-            )
-            logger.info(
-                "[ork2json] The file 'parameters.json' was saved to: '%s'",
-                Path(output).as_posix(),
-            )
-            logger.info(
-                "[ork2json] Operation completed successfully. You can now use "
-                "the 'parameters.json' file to run a simulation."
-            )
+@cli.command("serve")
+@click.option("--host", type=str, default="127.0.0.1", required=False)
+@click.option("--port", type=int, default=8765, required=False)
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(),
+    default=None,
+    required=False,
+    help="Listen on this Unix socket instead of a TCP port.",
+)
+@click.option(
+    "--ork_jar",
+    type=click.Path(),
+    default=None,
+    required=False,
+    help="The path to the OpenRocket .jar file. Only needed for the files that "
+    "can not be resolved from their xml.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=2,
+    required=False,
+    help="Number of conversions running at the same time.",
+)
+@click.option(
+    "--queue_size",
+    type=click.IntRange(min=1),
+    default=16,
+    required=False,
+    help="Maximum number of conversions waiting for a worker.",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=True,
+    help="Reuse previous conversions of unchanged .ork files. Enabled by default.",
+)
+@click.option(
+    "--cache_dir",
+    type=click.Path(),
+    default=None,
+    required=False,
+    help="The folder of the conversion cache.",
+)
+@click.option("--verbose", type=bool, default=False, required=False)
+def serve(
+    host="127.0.0.1",
+    port=8765,
+    socket_path=None,
+    ork_jar=None,
+    workers=2,
+    queue_size=16,
+    cache=True,
+    cache_dir=None,
+    verbose=False,
+):
+    """Starts a conversion server, which keeps the imports and the OpenRocket
+    instance in memory between requests. Send the content of a .ork file with
+    a POST request to "/convert" and get the settings and the content of the
+    generated .csv files back as json. See `ConversionServer` for the details.
+
+    Examples
+    --------
+    >>> rocketserializer serve --port 8765  # doctest: +SKIP
+    >>> curl --data-binary @rocket.ork localhost:8765/convert  # doctest: +SKIP
+    """
+    _setup_logging()
+    log_level = logging.DEBUG if verbose else logging.INFO
+    logger.setLevel(log_level)
+
+    server = ConversionServer(
+        host=host,
+        port=port,
+        socket_path=socket_path,
+        ork_jar=ork_jar,
+        workers=workers,
+        queue_size=queue_size,
+        cache=ConversionCache(cache_dir) if cache else None,
+    )
+    click.echo(f"[serve] Listening on {server.address}. Press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        click.echo("[serve] Stopped.")
 
 
 @cli.command("ork2notebook")
 @click.option("--filepath", type=str, required=True)
 @click.option("--output", type=str, required=False)
 @click.option("--ork_jar", type=str, default=None, required=False)
-@click.option("--encoding", type=str, default="utf-8", required=False)
+@click.option(
+    "--encoding",
+    type=str,
+    default=None,
+    required=False,
+    help="The encoding of the parameters.json file. Default is utf-8.",
+)
 @click.option("--verbose", type=bool, default=False, required=False)
-def ork2notebook(filepath, output, ork_jar=None, encoding="utf-8", verbose=False):
+@click.option(
+    "--formatting",
+    type=bool,
+    default=True,
+    required=False,
+    help="Format the code cells with black, if black[jupyter] is installed.",
+)
+@click.option(
+    "--save_parameters",
+    type=bool,
+    default=True,
+    required=False,
+    help="Also save the parameters.json file, and use the conversion cache.",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=True,
+    help="Reuse previous conversions of unchanged .ork files. Enabled by default.",
+)
+@click.option(
+    "--cache_dir",
+    type=click.Path(),
+    default=None,
+    required=False,
+    help="The folder of the conversion cache.",
+)
+def ork2notebook(
+    filepath,
+    output,
+    ork_jar=None,
+    encoding=None,
+    verbose=False,
+    formatting=True,
+    save_parameters=True,
+    cache=True,
+    cache_dir=None,
+):
     """Generates a .ipynb file from the .ork file.
 
+    Parameters
+    ----------
+    formatting : bool, optional
+        If True, the code cells of the notebook are formatted with black
+        before it is saved. Default is True.
+    save_parameters : bool, optional
+        If True, the parameters.json file is saved as `ork2json` does, using
+        the conversion cache. Otherwise, the file is converted in memory and
+        only the notebook and its .csv curves are saved, so `encoding` can not
+        be used. Default is True.
+    cache : bool, optional
+        If True, the conversion cache is used when the parameters.json file is
+        saved. Default is True.
+    cache_dir : str, optional
+        The folder of the conversion cache. See `ork2json`.
+
     Notes
     -----
-    Under the hood, this function uses the `ork2json` function to generate the
-    parameters.json file and then uses the `NotebookBuilder` class to generate
-    the .ipynb file.
+    Under the hood, this function converts the .ork file with `convert` and
+    passes the settings and the curves straight to the `NotebookBuilder`
+    class, which generates the .ipynb file.
     """
+    if encoding and not save_parameters:
+        raise click.UsageError(
+            "--encoding only applies to the parameters.json file, which is not "
+            "saved with --save_parameters False."
+        )
+    _setup_logging()
+    log_level = logging.DEBUG if verbose else logging.WARNING
+    logger.setLevel(log_level)
+
+    filepath = Path(filepath)
     if not output:
-        filepath = Path(filepath)
         output = filepath.parent
         logger.warning(
             "[ork2notebook] Output folder not specified. Using '%s' instead.",
             Path(output).as_posix(),
         )
-    ork2json(
-        [
-            "--filepath",
+
+    if save_parameters:
+        settings = convert_cached(
             filepath,
-            "--output",
             output,
-            "--ork_jar",
             ork_jar,
-            "--encoding",
-            encoding,
-            "--verbose",
-            verbose,
-        ],
-        standalone_mode=False,
-    )
-
-    instance = NotebookBuilder(parameters_json=os.path.join(output, "parameters.json"))
-    instance.build(destination=output)
+            encoding or "utf-8",
+            ConversionCache(cache_dir) if cache else None,
+            "json",
+        )
+        instance = NotebookBuilder(
+            parameters_json=os.path.join(output, "parameters.json"),
+            parameters=settings,
+        )
+    else:
+        result = convert(filepath, ork_jar=ork_jar)
+        os.makedirs(output, exist_ok=True)
+        instance = NotebookBuilder(parameters=result.settings, curves=result.curves())
+    instance.build(destination=str(output), formatting=formatting)
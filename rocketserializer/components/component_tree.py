@@ -0,0 +1,367 @@
+import logging
+from typing import NamedTuple, Optional
+
+from .._helpers import _lazy_dict_to_string
+from .design_index import DesignIndex
+
+logger = logging.getLogger(__name__)
+
+# OpenRocket class name of each component tag of the .ork file
+COMPONENT_TYPES = {
+    "stage": "AxialStage",
+    "nosecone": "NoseCone",
+    "bodytube": "BodyTube",
+    "transition": "Transition",
+    "trapezoidfinset": "TrapezoidFinSet",
+    "ellipticalfinset": "EllipticalFinSet",
+    "freeformfinset": "FreeformFinSet",
+    "tubefinset": "TubeFinSet",
+    "launchlug": "LaunchLug",
+    "railbutton": "RailButton",
+    "innertube": "InnerTube",
+    "tubecoupler": "TubeCoupler",
+    "centeringring": "CenteringRing",
+    "bulkhead": "Bulkhead",
+    "engineblock": "EngineBlock",
+    "masscomponent": "MassComponent",
+    "parachute": "Parachute",
+    "streamer": "Streamer",
+    "shockcord": "ShockCord",
+}
+
+# These classes are irrelevant for our work
+IGNORED_TYPES = ["Parachute", "MassComponent"]
+
+# Components placed one after the other along the stage, which define the
+# outer shape of the rocket
+AXIAL_TAGS = ["nosecone", "bodytube", "transition"]
+
+
+class ComponentRecord(NamedTuple):
+    """Immutable snapshot of a rocket component.
+
+    The position is the distance from the nose tip to the top of the component,
+    in meters. The radii are only defined for nose cones, body tubes and
+    transitions. `parent` is the index of the parent record in the tree (None
+    for the rocket), and `stage` the index of the stage the component is in.
+    """
+
+    type: str
+    name: str
+    length: float
+    position: float
+    fore_radius: Optional[float] = None
+    aft_radius: Optional[float] = None
+    parent: Optional[int] = None
+    depth: int = 0
+    stage: Optional[int] = None
+
+
+def elements_from_records(records):
+    """Converts a component tree to the elements dictionary used by the
+    search_* functions.
+
+    Parameters
+    ----------
+    records : tuple of ComponentRecord
+        The component tree, e.g. returned by `build_component_tree`.
+
+    Returns
+    -------
+    elements : dict
+        Each value is a dict with the keys "type", "name", "length",
+        "position", "fore_radius" and "aft_radius" of a component.
+    """
+    elements = {}
+    for record in records:
+        element = {
+            "type": record.type,
+            "name": record.name,
+            "length": record.length,
+            "position": record.position,
+            "fore_radius": record.fore_radius,
+            "aft_radius": record.aft_radius,
+        }
+        elements[hash(frozenset(element.items()))] = element
+    return elements
+
+
+def axial_position(method, offset, parent_position, parent_length, length):
+    """Computes the distance from the nose tip to the top of a component that
+    is positioned relative to its parent, as OpenRocket does.
+
+    Parameters
+    ----------
+    method : str
+        The position method: "top", "middle", "bottom" or "absolute".
+    offset : float
+        The axial offset of the component, in meters.
+    parent_position : float
+        The position of the top of the parent component.
+    parent_length : float
+        The length of the parent component.
+    length : float
+        The length of the component.
+
+    Returns
+    -------
+    float
+        The position of the top of the component.
+
+    Raises
+    ------
+    ValueError
+        In case the method is not supported.
+    """
+    if method == "top":
+        return parent_position + offset
+    if method == "middle":
+        return parent_position + (parent_length - length) / 2 + offset
+    if method == "bottom":
+        return parent_position + parent_length - length + offset
+    if method == "absolute":
+        return offset
+    raise ValueError(f"Unsupported position method '{method}'.")
+
+
+def process_elements_position_from_xml(bs):
+    """Computes the absolute position of each component of the rocket using
+    only the ``<subcomponents>`` hierarchy of the .ork file, so OpenRocket is
+    not needed. The positions are measured from the nose tip.
+
+    Parameters
+    ----------
+    bs : BeautifulSoup
+        BeautifulSoup object of the .ork file.
+
+    Returns
+    -------
+    elements : dict
+        Dictionary with the same format as the one returned by
+        `process_elements_position`, see `elements_from_records`.
+
+    Raises
+    ------
+    ValueError
+        If the design has a component that can not be resolved from the xml,
+        e.g. pods and boosters. In that case OpenRocket should be used instead.
+    """
+    elements = elements_from_records(build_component_tree(bs))
+    logger.info(
+        "The elements were positioned from the xml:\n%s",
+        _lazy_dict_to_string(elements, indent=23),
+    )
+    return elements
+
+
+def build_component_tree(bs):
+    """Builds the component tree of the rocket from the xml of the .ork file.
+
+    Parameters
+    ----------
+    bs : BeautifulSoup
+        BeautifulSoup object of the .ork file.
+
+    Returns
+    -------
+    tuple of ComponentRecord
+        The components, in depth-first order, starting with the rocket.
+
+    Raises
+    ------
+    ValueError
+        If the design has a component that can not be resolved from the xml.
+    """
+    rocket = DesignIndex.of(bs).rocket
+    if rocket is None:
+        raise ValueError("The .ork file has no 'rocket' tag.")
+
+    stages = _children(rocket)
+    for stage in stages:
+        if stage.name != "stage":
+            raise ValueError(f"Unsupported rocket component: '{stage.name}'.")
+    radii = _resolve_axial_radii(
+        [child for stage in stages for child in _children(stage)]
+    )
+
+    records = [ComponentRecord("Rocket", _text(rocket, "name"), 0.0, 0.0)]
+    top_position = 0.0
+    for index, stage in enumerate(stages):
+        top_position = _process_stage(stage, index, top_position, radii, records)
+    records[0] = records[0]._replace(length=top_position)
+    return tuple(records)
+
+
+def _process_stage(stage, index, top_position, radii, records):
+    """Positions the components of a stage, which are placed one after the
+    other starting at the top of the stage. Returns the bottom of the stage."""
+    stage_index = len(records)
+    records.append(
+        ComponentRecord(
+            _type(stage), _text(stage, "name"), 0.0, top_position, None, None, 0, 1
+        )
+    )
+    cursor = top_position
+    for component in _children(stage):
+        method, offset = _axial_offset(component)
+        if method not in ["after", None]:
+            raise ValueError(
+                f"Unsupported position method '{method}' for a stage component."
+            )
+        position = cursor + offset
+        length = _length(component)
+        fore_radius, aft_radius = radii.get(id(component), (None, None))
+        records.append(
+            ComponentRecord(
+                _type(component),
+                _text(component, "name"),
+                length,
+                position,
+                fore_radius,
+                aft_radius,
+                stage_index,
+                2,
+                index,
+            )
+        )
+        _process_children(component, len(records) - 1, records)
+        cursor = position + length
+
+    records[stage_index] = records[stage_index]._replace(
+        length=cursor - top_position, stage=index
+    )
+    return cursor
+
+
+def _process_children(parent, parent_index, records):
+    """Positions the internal and external components attached to a parent
+    component, relative to the top of the parent."""
+    parent_record = records[parent_index]
+    for component in _children(parent):
+        component_type = _type(component)
+        if component_type in IGNORED_TYPES:
+            continue
+        length = _length(component)
+        method, offset = _axial_offset(component)
+        try:
+            position = axial_position(
+                method, offset, parent_record.position, parent_record.length, length
+            )
+        except ValueError as e:
+            raise ValueError(f"{e} ('{component.name}')") from e
+        records.append(
+            ComponentRecord(
+                component_type,
+                _text(component, "name"),
+                length,
+                position,
+                parent=parent_index,
+                depth=parent_record.depth + 1,
+                stage=parent_record.stage,
+            )
+        )
+        _process_children(component, len(records) - 1, records)
+
+
+def _resolve_axial_radii(components):
+    """Resolves the fore and aft radii of the nose cones, body tubes and
+    transitions, replacing the "auto" values by the radius of the adjacent
+    component, as OpenRocket does.
+
+    Returns
+    -------
+    dict
+        Maps the id of each tag to a (fore_radius, aft_radius) tuple.
+    """
+    components = [c for c in components if c.name in AXIAL_TAGS]
+    radii = []
+    for component in components:
+        if component.name == "nosecone":
+            fore, aft = 0.0, _radius(component, "aftradius")
+        elif component.name == "bodytube":
+            fore = aft = _radius(component, "radius")
+        else:
+            fore = _radius(component, "foreradius")
+            aft = _radius(component, "aftradius")
+        radii.append([fore, aft])
+
+    # each pass resolves at least one radius, or nothing else can be resolved
+    for _ in range(2 * len(radii)):
+        changed = False
+        for idx, (component, radius) in enumerate(zip(components, radii)):
+            previous_aft = radii[idx - 1][1] if idx > 0 else None
+            next_fore = radii[idx + 1][0] if idx + 1 < len(radii) else None
+            if radius[0] is None:
+                radius[0] = previous_aft if previous_aft is not None else next_fore
+                changed = changed or radius[0] is not None
+            if radius[1] is None:
+                radius[1] = next_fore if next_fore is not None else previous_aft
+                changed = changed or radius[1] is not None
+            if component.name == "bodytube" and None in radius:
+                radius[0] = radius[1] = (
+                    radius[0] if radius[0] is not None else radius[1]
+                )
+        if not changed:
+            break
+
+    for component, radius in zip(components, radii):
+        if None in radius:
+            raise ValueError(
+                "Could not resolve the automatic radius of "
+                f"'{_text(component, 'name')}'."
+            )
+    return {id(c): tuple(radius) for c, radius in zip(components, radii)}
+
+
+def _children(tag):
+    subcomponents = tag.find("subcomponents", recursive=False)
+    if subcomponents is None:
+        return []
+    return subcomponents.find_all(recursive=False)
+
+
+def _text(tag, name):
+    child = tag.find(name, recursive=False)
+    return child.text if child is not None else None
+
+
+def _type(component):
+    try:
+        return COMPONENT_TYPES[component.name]
+    except KeyError:
+        raise ValueError(f"Unsupported rocket component: '{component.name}'.")
+
+
+def _axial_offset(component):
+    """Returns the axial position method and offset of a component. OpenRocket
+    23.09 writes the "axialoffset" tag, while older versions use "position"."""
+    tag = component.find("axialoffset", recursive=False)
+    if tag is not None:
+        return tag.get("method"), float(tag.text)
+    tag = component.find("position", recursive=False)
+    if tag is not None:
+        return tag.get("type"), float(tag.text)
+    return None, 0.0
+
+
+def _length(component):
+    """Returns the axial length of a component, as OpenRocket's getLength."""
+    if component.name in ["trapezoidfinset", "ellipticalfinset"]:
+        return float(_text(component, "rootchord"))
+    if component.name == "freeformfinset":
+        points = [float(point["x"]) for point in component.find_all("point")]
+        return max(points) - min(points) if points else 0.0
+    if component.name == "railbutton":
+        return float(_text(component, "outerdiameter") or 0.0)
+    for name in ["length", "packedlength"]:
+        value = _text(component, name)
+        if value is not None:
+            return float(value)
+    return 0.0
+
+
+def _radius(component, name):
+    """Returns the radius value of the tag, or None if it is automatic and the
+    file does not store the value computed by OpenRocket ("auto 0.0635")."""
+    value = (_text(component, name) or "auto").replace("auto", "").strip()
+    return float(value) if value else None
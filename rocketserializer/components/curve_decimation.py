@@ -0,0 +1,83 @@
+import logging
+
+import numpy as np
+
+from .._helpers import _lazy_dict_to_string
+
+logger = logging.getLogger(__name__)
+
+
+def decimate_curve(curve, tolerance):
+    """Removes the points of a curve that a linear interpolation between the
+    remaining ones reproduces within the tolerance.
+
+    The points are selected with the Ramer-Douglas-Peucker algorithm, using
+    the vertical distance to the segments, which is the error of a linear
+    interpolation of the second column over the first one. The first and last
+    points are always kept.
+
+    Parameters
+    ----------
+    curve : numpy.ndarray
+        Array with the x values in the first column, sorted, and the y values
+        in the second one, e.g. the (time, thrust) curve.
+    tolerance : float
+        The maximum interpolation error, as a fraction of the largest absolute
+        y value of the curve, e.g. 0.001 for 0.1%.
+
+    Returns
+    -------
+    decimated : numpy.ndarray
+        The points of the curve that were kept.
+    report : dict
+        The "points" and "decimated_points" counts, the "reduction" of the
+        number of points (a fraction) and the "max_error", the largest
+        interpolation error introduced, i.e. the largest vertical distance of
+        a removed point to the decimated curve, in the units of the y values.
+    """
+    if len(curve) < 3:
+        decimated, max_error = curve.copy(), 0.0
+    else:
+        x, y = curve[:, 0], curve[:, 1]
+        scale = float(np.max(np.abs(y)))
+        keep, max_error = _select_points(x, y, tolerance * scale)
+        decimated = curve[keep]
+
+    report = {
+        "points": len(curve),
+        "decimated_points": len(decimated),
+        "reduction": 1 - len(decimated) / len(curve) if len(curve) else 0.0,
+        "max_error": max_error,
+    }
+    logger.info("The curve was decimated:\n%s", _lazy_dict_to_string(report, indent=23))
+    return decimated, report
+
+
+def _select_points(x, y, tolerance):
+    """Returns the indexes of the points kept by the Ramer-Douglas-Peucker
+    algorithm and the largest vertical error of the removed points."""
+    keep = np.zeros(len(x), dtype=bool)
+    keep[[0, -1]] = True
+    max_error = 0.0
+
+    segments = [(0, len(x) - 1)]
+    while segments:
+        start, stop = segments.pop()
+        if stop - start < 2:
+            continue
+        dx = x[stop] - x[start]
+        inner = slice(start + 1, stop)
+        if dx == 0:
+            line = np.full(stop - start - 1, y[start])
+        else:
+            line = y[start] + (y[stop] - y[start]) * (x[inner] - x[start]) / dx
+        errors = np.abs(y[inner] - line)
+        worst = int(np.argmax(errors))
+        if errors[worst] > tolerance:
+            split = start + 1 + worst
+            keep[split] = True
+            segments.append((start, split))
+            segments.append((split, stop))
+        else:
+            max_error = max(max_error, float(errors[worst]))
+    return np.flatnonzero(keep), max_error
@@ -0,0 +1,79 @@
+import gzip
+import logging
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# the precision that writes the shortest text that reads back to the same float
+REPR_PRECISION = "repr"
+
+
+def format_curve(curve, precision=6):
+    """Formats a curve as the text of a .csv file, with one row per line.
+
+    The values are formatted a whole column at a time, through `str.format`
+    (or `repr`) mapped over the column, which is more than twice as fast as
+    `numpy.savetxt` formatting each row on its own. The output is the same as
+    the one of `numpy.savetxt` with the "%.<precision>f" format.
+
+    Parameters
+    ----------
+    curve : numpy.ndarray
+        Two dimensional array, e.g. the (mach, cd) drag curve.
+    precision : int or str, optional
+        The number of decimal places of the values, or "repr" to write the
+        shortest text that is read back to exactly the same value. Default
+        is 6.
+
+    Returns
+    -------
+    str
+        The content of the .csv file.
+    """
+    curve = np.asarray(curve, dtype=float)
+    if curve.ndim == 1:
+        curve = curve.reshape(-1, 1)
+    if len(curve) == 0:
+        return ""
+
+    formatter = repr if precision == REPR_PRECISION else f"{{:.{precision}f}}".format
+    columns = [map(formatter, column.tolist()) for column in curve.T]
+    return "\n".join(map(",".join, zip(*columns))) + "\n"
+
+
+def write_curve(curve, path, precision=6, compress=False):
+    """Saves a curve to a .csv file, in a single buffered write.
+
+    Parameters
+    ----------
+    curve : numpy.ndarray
+        Two dimensional array, e.g. the (mach, cd) drag curve.
+    path : str
+        The path to the .csv file.
+    precision : int or str, optional
+        The number of decimal places of the values, or "repr" for the shortest
+        round-trip representation, see `format_curve`. Default is 6.
+    compress : bool, optional
+        If True, the file is compressed with gzip and ".gz" is appended to its
+        path. Default is False.
+
+    Returns
+    -------
+    path : str
+        The path to the saved file.
+    """
+    content = format_curve(curve, precision).encode("ascii")
+    if compress:
+        path = f"{path}.gz"
+        # without the modification time, the same curve gives the same file
+        with gzip.GzipFile(path, "wb", compresslevel=6, mtime=0) as file:
+            file.write(content)
+    else:
+        with open(path, "wb") as file:
+            file.write(content)
+    logger.debug(
+        "Saved a curve with %d points to: '%s'", len(curve), Path(path).as_posix()
+    )
+    return path
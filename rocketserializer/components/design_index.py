@@ -0,0 +1,86 @@
+import logging
+from functools import cached_property
+
+from bs4.element import Tag
+
+logger = logging.getLogger(__name__)
+
+# tags of the simulation data, which are never indexed
+_DATA_TAGS = frozenset({"datapoint", "event"})
+
+
+class DesignIndex:
+    """Tag lookups over the design section of a .ork file.
+
+    The index is built in a single traversal of the document, which skips the
+    content of the ``<databranch>`` tags, so that each search_* function finds
+    its tags in constant time instead of walking the whole document again.
+    It has the same `find` and `findAll` methods as the BeautifulSoup object,
+    searching from the root of the document.
+
+    Examples
+    --------
+    >>> from bs4 import BeautifulSoup
+    >>> from rocketserializer.components.design_index import DesignIndex
+    >>> bs = BeautifulSoup(
+    ...     "<rocket><name>Rocket</name><stage><name>Stage</name></stage></rocket>",
+    ...     features="xml",
+    ... )
+    >>> index = DesignIndex(bs)
+    >>> [tag.text for tag in index.findAll("name")]
+    ['Rocket', 'Stage']
+    >>> index.rocket.find("name").text
+    'Rocket'
+    """
+
+    def __init__(self, root):
+        """Builds the index.
+
+        Parameters
+        ----------
+        root : bs4.BeautifulSoup or bs4.element.Tag
+            The document, or the tag whose descendants are indexed.
+        """
+        self.root = root
+        self._by_name = {}
+        # depth-first and in pre-order, so the tags of each name are kept in
+        # document order
+        stack = [child for child in reversed(root.contents) if isinstance(child, Tag)]
+        while stack:
+            tag = stack.pop()
+            self._by_name.setdefault(tag.name, []).append(tag)
+            if tag.name != "databranch":
+                stack.extend(
+                    child for child in reversed(tag.contents) if isinstance(child, Tag)
+                )
+        logger.info("Indexed %d tag names of the design", len(self._by_name))
+
+    @classmethod
+    def of(cls, bs):
+        """Returns the index of the document, which can already be an index."""
+        return bs if isinstance(bs, cls) else cls(bs)
+
+    def find(self, name):
+        """Returns the first tag with the given name, or None."""
+        if name in _DATA_TAGS:
+            return self.root.find(name)
+        found = self._by_name.get(name)
+        return found[0] if found else None
+
+    def findAll(self, name):  # pylint: disable=invalid-name
+        """Returns all the tags with the given name, in document order."""
+        if name in _DATA_TAGS:
+            return self.root.find_all(name)
+        return list(self._by_name.get(name, []))
+
+    find_all = findAll
+
+    @cached_property
+    def rocket(self):
+        """The ``<rocket>`` tag, with the whole design, or None."""
+        return self.find("rocket")
+
+    @cached_property
+    def simulations(self):
+        """The ``<simulation>`` tags, in document order."""
+        return self.findAll("simulation")
@@ -4,19 +4,27 @@ from pathlib import Path
 
 import numpy as np
 
+from .curve_writer import format_curve, write_curve
+
 logger = logging.getLogger(__name__)
 
+DRAG_CURVE_FILE = "drag_curve.csv"
+DRAG_CURVE_PRECISION = 6
+# files of the power-on (motor burning) and power-off (coasting) drag tables
+DRAG_TABLE_FILES = {
+    "power_on_drag": "drag_curve_power_on.csv",
+    "power_off_drag": "drag_curve_power_off.csv",
+}
+
 
-def save_drag_curve(datapoints, data_labels, output_folder):
+def save_drag_curve(flight_data, output_folder):
     """Extracts the drag curve from the data and saves it to a csv file.
 
     Parameters
     ----------
-    datapoints : list
-        The datapoints.
-    data_labels : list of str
-        The labels of the data.
-    path : str
+    flight_data : FlightDataTable
+        The simulation data from the .ork file.
+    output_folder : str
         Path to the folder where the drag curve should be saved. This needs to
         be a folder that already exists.
 
@@ -25,30 +33,38 @@ def save_drag_curve(datapoints, data_labels, output_folder):
     path : str
         The path to the drag curve.
     """
+    return write_drag_curve(get_drag_curve(flight_data), output_folder)
+
+
+def get_drag_curve(flight_data, apogee_position=None):
+    """Extracts the drag curve from the data.
+
+    Parameters
+    ----------
+    flight_data : FlightDataTable
+        The simulation data from the .ork file.
+    apogee_position : int, optional
+        The row of the apogee in the flight data, e.g. from the apogee event of
+        the .ork file. If None, it is the row of the maximum altitude.
+
+    Returns
+    -------
+    cd : numpy.ndarray
+        Array with the Mach number in the first column and the drag coefficient
+        in the second one, sorted by Mach number.
+    """
     # Remove the data after apogee
-    altitude_vector = [
-        float(datapoint.text.split(",")[data_labels.index("Altitude")])
-        for datapoint in datapoints
-    ]
-    logger.info("Collected altitude vector")
-
-    apogee_index = np.argmax(altitude_vector)
-    datapoints = datapoints[:apogee_index]
+    if apogee_position is None:
+        apogee_position = np.argmax(flight_data["Altitude"])
+    flight_data = flight_data.slice(stop=apogee_position)
     logger.info("Removed data after apogee")
 
     # Extract the drag coefficient and Mach number
-    cd = [
-        float(datapoint.text.split(",")[data_labels.index("Axial drag coefficient")])
-        for datapoint in datapoints
-    ]
-    mach = [
-        float(datapoint.text.split(",")[data_labels.index("Mach number")])
-        for datapoint in datapoints
-    ]
+    cd = np.column_stack(
+        [flight_data["Mach number"], flight_data["Axial drag coefficient"]]
+    )
     logger.info("Collected drag coefficient and Mach number")
 
-    # Convert to numpy array
-    cd = np.array([mach, cd]).T
     # Remove NaN values to avoid errors
     cd = cd[~np.isnan(cd).any(axis=1), :]
     # Sort by Mach number
@@ -58,11 +74,154 @@ def save_drag_curve(datapoints, data_labels, output_folder):
     # Remove values when the drag is lower than 0
     cd = cd[cd[:, 1] > 0, :]
     logger.info("Successfully created the drag curve")
+    return cd
+
+
+def get_drag_tables(flight_data, burnout_position, apogee_position=None, step=0.01):
+    """Builds the power-on and power-off drag tables, splitting the data up to
+    the apogee at the burnout and binning each phase on a Mach grid.
+
+    Unlike the drag curve, which keeps every (mach, cd) sample of the whole
+    ascent, each table has a single, averaged point per Mach bin, so its Mach
+    numbers are strictly increasing and can be interpolated unambiguously.
+
+    Parameters
+    ----------
+    flight_data : FlightDataTable
+        The simulation data from the .ork file.
+    burnout_position : int
+        The row of the burnout in the flight data. The rows before it are the
+        power-on phase and the rest, up to the apogee, the power-off phase.
+    apogee_position : int, optional
+        The row of the apogee in the flight data. If None, it is the row of the
+        maximum altitude.
+    step : float, optional
+        The width of the Mach bins. Default is 0.01.
+
+    Returns
+    -------
+    tables : dict
+        The "power_on_drag" and "power_off_drag" tables, arrays with the Mach
+        number in the first column and the drag coefficient in the second one.
+        A table is empty if its phase has no valid data.
+    """
+    if apogee_position is None:
+        apogee_position = np.argmax(flight_data["Altitude"])
+    flight_data = flight_data.slice(stop=apogee_position)
+    mach = flight_data["Mach number"]
+    cd = flight_data["Axial drag coefficient"]
+    burnout_position = min(burnout_position, len(mach))
+
+    tables = {
+        "power_on_drag": bin_drag_curve(
+            mach[:burnout_position], cd[:burnout_position], step
+        ),
+        "power_off_drag": bin_drag_curve(
+            mach[burnout_position:], cd[burnout_position:], step
+        ),
+    }
+    for name, table in tables.items():
+        if len(table) == 0:
+            logger.warning("The '%s' table is empty, there is no data.", name)
+    logger.info(
+        "Successfully created the drag tables with %d (power on) and %d "
+        "(power off) points",
+        len(tables["power_on_drag"]),
+        len(tables["power_off_drag"]),
+    )
+    return tables
+
 
-    # Save to csv file
-    path = os.path.join(output_folder, "drag_curve.csv")
-    np.savetxt(path, cd, delimiter=",", fmt="%.6f")
+def bin_drag_curve(mach, cd, step=0.01):
+    """Averages the drag coefficient samples in bins of Mach number.
+
+    Parameters
+    ----------
+    mach : numpy.ndarray
+        The Mach number of each sample.
+    cd : numpy.ndarray
+        The drag coefficient of each sample.
+    step : float, optional
+        The width of the Mach bins, starting at Mach 0. Default is 0.01.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array with the mean Mach number of each bin in the first column and
+        the mean drag coefficient in the second one, one row per bin with
+        samples, sorted by Mach number. The NaN and non-positive drag
+        coefficients are left out.
+    """
+    if step <= 0:
+        raise ValueError(f"The Mach step must be positive, not {step}.")
+    valid = ~(np.isnan(mach) | np.isnan(cd)) & (cd > 0)
+    mach, cd = mach[valid], cd[valid]
+
+    # the mean of each bin stays inside the bin, so the means keep their order
+    bins = np.floor(mach / step).astype(np.int64)
+    _, inverse, counts = np.unique(bins, return_inverse=True, return_counts=True)
+    inverse = inverse.ravel()
+    return np.column_stack(
+        [
+            np.bincount(inverse, weights=mach, minlength=len(counts)) / counts,
+            np.bincount(inverse, weights=cd, minlength=len(counts)) / counts,
+        ]
+    )
+
+
+def write_drag_curve(
+    cd,
+    output_folder,
+    filename=DRAG_CURVE_FILE,
+    precision=DRAG_CURVE_PRECISION,
+    compress=False,
+):
+    """Saves the drag curve to the "drag_curve.csv" file of the output folder,
+    or to the given `filename`. See `write_curve` for the `precision` and
+    `compress` options.
+
+    Returns
+    -------
+    path : str
+        The path to the drag curve.
+    """
+    path = write_curve(cd, os.path.join(output_folder, filename), precision, compress)
     logger.info(
         "Successfully saved the drag curve file to: '%s'", Path(path).as_posix()
     )
     return path
+
+
+def write_drag_tables(
+    tables, output_folder, suffix="", precision=DRAG_CURVE_PRECISION, compress=False
+):
+    """Saves the drag tables to the "drag_curve_power_on.csv" and
+    "drag_curve_power_off.csv" files of the output folder, with the suffix
+    before the extension, e.g. "_1". See `write_curve` for the `precision`
+    and `compress` options.
+
+    Returns
+    -------
+    paths : dict
+        The paths to the "power_on_drag" and "power_off_drag" tables.
+    """
+    return {
+        name: write_drag_curve(
+            tables[name], output_folder, filename, precision, compress
+        )
+        for name, filename in drag_table_files(suffix).items()
+    }
+
+
+def drag_table_files(suffix=""):
+    """Returns the file name of each drag table, with the suffix before the
+    extension."""
+    return {
+        name: f"{os.path.splitext(filename)[0]}{suffix}.csv"
+        for name, filename in DRAG_TABLE_FILES.items()
+    }
+
+
+def drag_curve_to_csv(cd, precision=DRAG_CURVE_PRECISION):
+    """Returns the content of the "drag_curve.csv" file, without writing it."""
+    return format_curve(cd, precision)
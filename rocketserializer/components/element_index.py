@@ -0,0 +1,85 @@
+import heapq
+import logging
+from operator import itemgetter
+
+logger = logging.getLogger(__name__)
+
+_position = itemgetter("position")
+
+
+class ElementIndex:
+    """Hashed lookups over the elements of a rocket.
+
+    The index is built once from the elements dictionary returned by
+    `process_elements_position`, so that each search_* function resolves its
+    components in constant time instead of scanning all the elements.
+
+    Examples
+    --------
+    >>> from rocketserializer.components.element_index import ElementIndex
+    >>> index = ElementIndex(
+    ...     {1: {"type": "NoseCone", "name": "Nose", "length": 0.3, "position": 0}}
+    ... )
+    >>> index.find("NoseCone", "Nose")["position"]
+    0
+    """
+
+    def __init__(self, elements):
+        """Builds the index.
+
+        Parameters
+        ----------
+        elements : dict
+            Dictionary with the elements of the rocket. Each value is a dict
+            with, at least, the keys "type", "name", "length" and "position".
+        """
+        self.elements = list(elements.values())
+        self._by_type_and_name = {}
+        self._by_name_and_length = {}
+        self._by_type = {}
+        for element in self.elements:
+            self._by_type_and_name.setdefault(
+                (element["type"], element["name"]), []
+            ).append(element)
+            self._by_name_and_length.setdefault(
+                (element["name"].lower(), element["length"]), []
+            ).append(element)
+            self._by_type.setdefault(element["type"], []).append(element)
+        self._by_type_and_position = {
+            element_type: sorted(same_type, key=_position)
+            for element_type, same_type in self._by_type.items()
+        }
+        logger.info("Indexed %d elements", len(self.elements))
+
+    @classmethod
+    def of(cls, elements):
+        """Returns the index of the elements, which can already be an index."""
+        return elements if isinstance(elements, cls) else cls(elements)
+
+    def __len__(self):
+        return len(self.elements)
+
+    def find(self, element_type, name):
+        """Returns the first element with the given type and name, or None."""
+        found = self._by_type_and_name.get((element_type, name))
+        return found[0] if found else None
+
+    def find_by_name_and_length(self, name, length):
+        """Returns all the elements with the given name, compared case
+        insensitively, and length, in the order they were indexed."""
+        return self._by_name_and_length.get((name.lower(), length), [])
+
+    def find_all(self, element_type):
+        """Returns all the elements of the given type, in the order they were
+        indexed, which is the order of the components in the .ork file."""
+        return list(self._by_type.get(element_type, []))
+
+    def sorted_by_position(self, *element_types):
+        """Returns the elements of the given types sorted by position, from the
+        nose tip to the tail."""
+        return list(
+            heapq.merge(
+                *(self._by_type_and_position.get(t, []) for t in element_types),
+                key=_position,
+            )
+        )
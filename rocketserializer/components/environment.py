@@ -1,6 +1,7 @@
 import logging
 
-from .._helpers import _dict_to_string
+from .._helpers import _lazy_dict_to_string
+from .design_index import DesignIndex
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +22,7 @@ def search_environment(bs):
         "latitude", "longitude", "elevation", "wind_average", "wind_turbulence",
         "geodetic_method", "base_temperature" and "base_pressure".
     """
+    bs = DesignIndex.of(bs)
     settings = {}
 
     latitude = float(bs.find("launchlatitude").text)
@@ -72,6 +74,6 @@ def search_environment(bs):
     }
     logger.info(
         "Successfully extracted all the environment settings.\n %s",
-        _dict_to_string(settings, indent=23),
+        _lazy_dict_to_string(settings, indent=23),
     )
     return settings
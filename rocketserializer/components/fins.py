@@ -1,6 +1,8 @@
 import logging
 
-from .._helpers import _dict_to_string
+from .._helpers import _lazy_dict_to_string
+from .design_index import DesignIndex
+from .element_index import ElementIndex
 
 logger = logging.getLogger(__name__)
 
@@ -13,8 +15,9 @@ def search_trapezoidal_fins(bs, elements):
     ----------
     bs : BeautifulSoup
         The BeautifulSoup object of the open rocket file.
-    elements : dict
-        Dictionary with the settings for the elements of the rocket.
+    elements : dict or ElementIndex
+        Dictionary with the settings for the elements of the rocket, or its
+        index.
 
     Returns
     -------
@@ -25,7 +28,9 @@ def search_trapezoidal_fins(bs, elements):
         "name", "number", "root_chord", "tip_chord", "span", "position",
         "sweep_length", "sweep_angle", "cant_angle", "section".
     """
+    bs = DesignIndex.of(bs)
     settings = {}
+    elements = ElementIndex.of(elements)
     fins = bs.findAll("trapezoidfinset")
     logger.info("A total of %d trapezoidal fin sets were detected", len(fins))
 
@@ -39,23 +44,15 @@ def search_trapezoidal_fins(bs, elements):
             idx,
         )
         label = fin.find("name").text
-        try:
-
-            def get_element_by_name(name):
-                for element in elements.values():
-                    if element["name"] == name:
-                        return element
-                return None
-
-            element = get_element_by_name(label)
-            logger.info("Found the element '%s' in the elements dictionary.", label)
-        except KeyError:
+        element = elements.find("TrapezoidFinSet", label)
+        if element is None:
             message = (
                 f"Couldn't find the element '{label}' in the elements dictionary. It is"
                 " possible that the process_elements_position() function got an error."
             )
             logger.error(message)
             raise KeyError(message)
+        logger.info("Found the element '%s' in the elements dictionary.", label)
 
         n_fin = int(fin.find("fincount").text)
         logger.info("Number of fins retrieved: %d", n_fin)
@@ -103,7 +100,7 @@ def search_trapezoidal_fins(bs, elements):
         logger.info(
             "Trapezoidal fin set number '%d' was defined:\n%s",
             idx,
-            _dict_to_string(fin_settings, indent=23),
+            _lazy_dict_to_string(fin_settings, indent=23),
         )
 
     logger.info("Finished collecting all the trapezoidal fins.")
@@ -118,8 +115,9 @@ def search_elliptical_fins(bs, elements):
     ----------
     bs : BeautifulSoup
         The BeautifulSoup object of the open rocket file.
-    elements : dict
-        Dictionary with the settings for the elements of the rocket.
+    elements : dict or ElementIndex
+        Dictionary with the settings for the elements of the rocket, or its
+        index.
 
     Returns
     -------
@@ -130,7 +128,9 @@ def search_elliptical_fins(bs, elements):
         "name", "number", "root_chord", "span", "position", "cant_angle",
         "section".
     """
+    bs = DesignIndex.of(bs)
     settings = {}
+    elements = ElementIndex.of(elements)
     fins = bs.findAll("ellipticalfinset")
     logger.info("A total of %d elliptical fin sets were detected", len(fins))
 
@@ -146,23 +146,15 @@ def search_elliptical_fins(bs, elements):
             idx,
         )
         label = fin.find("name").text
-        try:
-
-            def get_element_by_name(name):
-                for element in elements.values():
-                    if element["name"] == name:
-                        return element
-                return None
-
-            element = get_element_by_name(label)
-            logger.info("Found the element '%s' in the elements dictionary.", label)
-        except KeyError:
+        element = elements.find("EllipticalFinSet", label)
+        if element is None:
             message = (
                 f"Couldn't find the element '{label}' in the elements dictionary. It is"
                 " possible that the process_elements_position() function got an error."
             )
             logger.error(message)
             raise KeyError(message)
+        logger.info("Found the element '%s' in the elements dictionary.", label)
 
         n_fin = int(fin.find("fincount").text)
         logger.info("Number of fins retrieved: %d", n_fin)
@@ -194,7 +186,7 @@ def search_elliptical_fins(bs, elements):
         logger.info(
             "Elliptical fin set number '%d' was defined:\n%s",
             idx,
-            _dict_to_string(fin_settings, indent=23),
+            _lazy_dict_to_string(fin_settings, indent=23),
         )
 
     logger.info("Finished collecting all the elliptical fins.")
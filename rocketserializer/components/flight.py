@@ -1,6 +1,7 @@
 import logging
 
-from .._helpers import _dict_to_string
+from .._helpers import _lazy_dict_to_string
+from .design_index import DesignIndex
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +20,7 @@ def search_launch_conditions(bs):
     settings : dict
         A dict containing the settings for the launch conditions.
     """
+    bs = DesignIndex.of(bs)
     settings = {}
 
     launch_rod_length = float(bs.find("launchrodlength").text)
@@ -34,5 +36,7 @@ def search_launch_conditions(bs):
         "inclination": 90 - launch_rod_angle,
         "heading": launch_rod_direction,
     }
-    logger.info("Exported launch conditions.\n%s", _dict_to_string(settings, indent=23))
+    logger.info(
+        "Exported launch conditions.\n%s", _lazy_dict_to_string(settings, indent=23)
+    )
     return settings
@@ -0,0 +1,59 @@
+import logging
+
+import numpy as np
+
+from .._helpers import _lazy_dict_to_string
+
+logger = logging.getLogger(__name__)
+
+
+def search_flight_events(databranch, flight_data):
+    """Search for the flight events stored by OpenRocket in the databranch and
+    return the rows of the flight data where they happen.
+
+    The ``<event>`` tags are read once and their times are binary searched in
+    the time column, instead of scanning the data vectors for each event.
+
+    Parameters
+    ----------
+    databranch : bs4.element.Tag or None
+        The ``<databranch>`` tag of the simulation, with the ``<event>`` tags.
+    flight_data : FlightDataTable
+        The simulation data of the databranch.
+
+    Returns
+    -------
+    events : dict
+        The row of each event found in the databranch. The keys are:
+        "ignition" (the last row at the first ignition), "burnout" (the first
+        row after the last burnout) and "apogee" (the row of the first apogee).
+        The events that were not stored are missing from the dict, so that the
+        callers can fall back to the data vectors.
+    """
+    times = {}
+    tags = databranch.find_all("event") if databranch is not None else []
+    for tag in tags:
+        times.setdefault(tag.get("type"), []).append(float(tag.get("time")))
+
+    time = flight_data.time
+    last_row = len(time) - 1
+    events = {}
+    if "ignition" in times:
+        row = np.searchsorted(time, min(times["ignition"]), side="right") - 1
+        events["ignition"] = int(max(row, 0))
+    if "burnout" in times:
+        row = np.searchsorted(time, max(times["burnout"]), side="right")
+        events["burnout"] = int(min(row, last_row))
+    if "apogee" in times:
+        row = np.searchsorted(time, min(times["apogee"]), side="left")
+        events["apogee"] = int(min(row, last_row))
+
+    missing = {"ignition", "burnout", "apogee"} - set(events)
+    if missing:
+        logger.info(
+            "The events %s are not stored in the .ork file", ", ".join(sorted(missing))
+        )
+    logger.info(
+        "The flight events were found:\n%s", _lazy_dict_to_string(events, indent=23)
+    )
+    return events
@@ -1,7 +1,8 @@
 import logging
 from pathlib import Path
 
-from .._helpers import _dict_to_string
+from .._helpers import _lazy_dict_to_string
+from .design_index import DesignIndex
 
 logger = logging.getLogger(__name__)
 
@@ -23,27 +24,35 @@ def search_id_info(bs, filepath):
         keys are: "rocket_name", "comment", "designer", "ork_version" and
         "filepath".
     """
+    bs = DesignIndex.of(bs)
     settings = {}
-    settings["rocket_name"] = bs.find("rocket").find("name").text
+    rocket = bs.rocket
+    settings["rocket_name"] = rocket.find("name").text
     logger.info("Collected the rocket name: '%s'", settings["rocket_name"])
 
     try:
-        settings["comment"] = bs.find("rocket").find("comment").text.replace("\n", "")
+        settings["comment"] = rocket.find("comment").text.replace("\n", "")
         logger.info("Collected the comment saved in the file: %s", settings["comment"])
     except AttributeError:
         logger.warning("No auxiliary comment was found in the file.")
         settings["comment"] = None
     try:
-        settings["designer"] = bs.find("rocket").find("designer").text
+        settings["designer"] = rocket.find("designer").text
         logger.info("Collected the designer name: %s", settings["designer"])
     except AttributeError:
         logger.warning("No designer name was found in the file.")
         settings["designer"] = None
     # settings["ork_version"] = bs.attrs["creator"]
-    settings["filepath"] = Path(filepath).as_posix()
+    settings["filepath"] = format_filepath(filepath)
 
     logger.info(
         "Identification information extracted.\n %s",
-        _dict_to_string(settings, indent=23),
+        _lazy_dict_to_string(settings, indent=23),
     )
     return settings
+
+
+def format_filepath(filepath):
+    """Returns the path to the .ork file as it is saved to the settings, with
+    forward slashes on every platform."""
+    return Path(filepath).as_posix()
@@ -4,12 +4,17 @@ from pathlib import Path
 
 import numpy as np
 
-from .._helpers import _dict_to_string
+from .._helpers import _lazy_dict_to_string
+from .curve_writer import format_curve, write_curve
+from .design_index import DesignIndex
 
 logger = logging.getLogger(__name__)
 
+THRUST_CURVE_FILE = "thrust_source.csv"
+THRUST_CURVE_PRECISION = 5
 
-def search_motor(bs, datapoints, data_labels):
+
+def search_motor(bs, flight_data):
     """Search for the motor properties in the .ork file. The only property that
     is not included is the thrust curve, which is generated in the
     generate_thrust_curve function. Only rocketpy.SolidMotor class would be able
@@ -19,12 +24,8 @@ def search_motor(bs, datapoints, data_labels):
     ----------
     bs : bs4.BeautifulSoup
         The BeautifulSoup object of the .ork file.
-    datapoints : list
-        The datapoints from the .ork file.
-    data_labels : list
-        The labels of the datapoints.
-    time_vector : list
-        The time vector of the simulation.
+    flight_data : FlightDataTable
+        The simulation data from the .ork file.
 
     Returns
     -------
@@ -36,15 +37,17 @@ def search_motor(bs, datapoints, data_labels):
         "grain_number", "grain_separation", "nozzle_position" and
         "coordinate_system_orientation".
     """
+    bs = DesignIndex.of(bs)
     settings = {}
 
     # retrieve motor geometry
-    motor_length = float(bs.find("motormount").find("length").text)
-    motor_radius = float(bs.find("motormount").find("diameter").text) / 2
+    motor_mount = bs.find("motormount")
+    motor_length = float(motor_mount.find("length").text)
+    motor_radius = float(motor_mount.find("diameter").text) / 2
     logger.info("Collected motor geometry: motor length and motor radius.")
 
     # get motor mass properties
-    total_propellant_mass, motor_dry_mass, _ = __get_motor_mass(datapoints, data_labels)
+    total_propellant_mass, motor_dry_mass, _ = __get_motor_mass(flight_data)
     motor_dry_mass = 0  # If NOTE: dry inertia is 0, this should ALWAYS be 0 too.
     center_of_dry_mass = 0
     dry_inertia = (0, 0, 0)  # impossible to retrieve from .ork file
@@ -89,12 +92,13 @@ def search_motor(bs, datapoints, data_labels):
         "coordinate_system_orientation": coordinate_system_orientation,
     }
     logger.info(
-        "Successfully configured the motor.\n %s", _dict_to_string(settings, indent=23)
+        "Successfully configured the motor.\n %s",
+        _lazy_dict_to_string(settings, indent=23),
     )
     return settings
 
 
-def generate_thrust_curve(folder_path, datapoints, data_labels, time_vector):
+def generate_thrust_curve(folder_path, flight_data):
     """Generate the thrust curve from the .ork file.
 
     Parameters
@@ -102,26 +106,33 @@ def generate_thrust_curve(folder_path, datapoints, data_labels, time_vector):
     folder_path : str
         The path to the folder where the thrust curve should be saved. This
         needs to be a folder that already exists.
-    datapoints : list
-        List of datapoints from the .ork file.
-    data_labels : list
-        List of labels for the datapoints.
-    time_vector : list
-        The time vector of the simulation.
+    flight_data : FlightDataTable
+        The simulation data from the .ork file.
 
     Returns
     -------
     source_name : str
         The path to the thrust curve.
     """
-    thrust = [
-        float(datapoint.text.split(",")[data_labels.index("Thrust")])
-        for datapoint in datapoints
-    ]
-    logger.info("Collected thrust vector")
+    return write_thrust_curve(get_thrust_curve(flight_data), folder_path)
+
+
+def get_thrust_curve(flight_data):
+    """Extracts the thrust curve from the data.
+
+    Parameters
+    ----------
+    flight_data : FlightDataTable
+        The simulation data from the .ork file.
 
-    # convert to numpy array
-    thrust = np.array([time_vector, thrust]).T
+    Returns
+    -------
+    thrust : numpy.ndarray
+        Array with the time in the first column and the thrust in the second
+        one, sorted by time.
+    """
+    thrust = np.column_stack([flight_data.time, flight_data["Thrust"]])
+    logger.info("Collected thrust vector")
 
     # sort by time
     thrust = thrust[thrust[:, 0].argsort()]
@@ -134,26 +145,46 @@ def generate_thrust_curve(folder_path, datapoints, data_labels, time_vector):
     # remove any items with thrust lower than 0.0001 N
     thrust = thrust[thrust[:, 1] > 0.0001, :]
     logger.info("Successfully created the thrust curve")
+    return thrust
+
 
-    # save to a csv file
-    source_name = os.path.join(folder_path, "thrust_source.csv")
-    np.savetxt(source_name, thrust, delimiter=",", fmt="%1.5f")
+def write_thrust_curve(
+    thrust,
+    folder_path,
+    filename=THRUST_CURVE_FILE,
+    precision=THRUST_CURVE_PRECISION,
+    compress=False,
+):
+    """Saves the thrust curve to the "thrust_source.csv" file of the folder,
+    or to the given `filename`. See `write_curve` for the `precision` and
+    `compress` options.
 
+    Returns
+    -------
+    source_name : str
+        The path to the thrust curve.
+    """
+    source_name = write_curve(
+        thrust, os.path.join(folder_path, filename), precision, compress
+    )
     logger.info(
         "Successfully saved the thrust curve to: '%s'", Path(source_name).as_posix()
     )
     return source_name
 
 
-def __get_motor_mass(datapoints, data_labels):
+def thrust_curve_to_csv(thrust, precision=THRUST_CURVE_PRECISION):
+    """Returns the content of the "thrust_source.csv" file, without writing it."""
+    return format_curve(thrust, precision)
+
+
+def __get_motor_mass(flight_data):
     """Get the motor mass from the .ork file.
 
     Parameters
     ----------
-    datapoints : list
-        List of datapoints from the .ork file.
-    data_labels : list
-        List of labels for the datapoints.
+    flight_data : FlightDataTable
+        The simulation data from the .ork file.
 
     Returns
     -------
@@ -163,32 +194,21 @@ def __get_motor_mass(datapoints, data_labels):
         Motor dry mass, in kg. It is the minimum value of the motor mass. This
         corresponds to the mass of the motor without the propellant.
     burnout_position : int
-        The index of the burnout position in the datapoints list.
+        The index of the burnout position in the flight data.
     """
-    if "Propellant mass" in data_labels:
-        prop_mass_vector = [
-            float(datapoint.text.split(",")[data_labels.index("Propellant mass")])
-            for datapoint in datapoints
-        ]
-        motor_dry_mass = min(prop_mass_vector)
+    if "Propellant mass" in flight_data:
+        prop_mass_vector = flight_data["Propellant mass"]
+        motor_dry_mass = float(np.min(prop_mass_vector))
         logger.info("The motor dry mass is %.3f kg.", motor_dry_mass)
-    elif "Motor mass" in data_labels:
-        motor_mass = np.array(
-            [
-                float(datapoint.text.split(",")[data_labels.index("Motor mass")])
-                for datapoint in datapoints
-            ]
-        )
-        motor_dry_mass = min(motor_mass)
+    elif "Motor mass" in flight_data:
+        motor_mass = flight_data["Motor mass"]
+        motor_dry_mass = float(np.min(motor_mass))
         prop_mass_vector = motor_mass - motor_dry_mass
-        prop_mass_vector = list(prop_mass_vector)
         logger.info("The motor dry mass is %.3f kg.", motor_dry_mass)
 
-    normalize = np.array(prop_mass_vector)
-    normalize = normalize - normalize[np.argmin(normalize)]
-    prop_mass_vector = list(normalize)
-    total_propellant_mass = prop_mass_vector[0]
-    burnout_position = np.argwhere(np.array(prop_mass_vector) == 0)[0][0]
+    prop_mass_vector = prop_mass_vector - prop_mass_vector[np.argmin(prop_mass_vector)]
+    total_propellant_mass = float(prop_mass_vector[0])
+    burnout_position = np.argwhere(prop_mass_vector == 0)[0][0]
     # q: why is it important to normalize the propellant mass vector?
     # a: to ensure that we are using the propellant mass, without the motor mass.
     #    Also, to ensure the final propellant mass is zero.
@@ -1,6 +1,8 @@
 import logging
 
-from .._helpers import _dict_to_string
+from .._helpers import _lazy_dict_to_string
+from .design_index import DesignIndex
+from .element_index import ElementIndex
 
 logger = logging.getLogger(__name__)
 
@@ -12,8 +14,8 @@ def search_nosecone(bs, elements=None, rocket_radius=None, just_radius=False):
     ----------
     bs : bs4.BeautifulSoup
         The BeautifulSoup object of the .ork file.
-    elements : dict
-        Dictionary with the elements of the rocket.
+    elements : dict or ElementIndex
+        Dictionary with the elements of the rocket, or its index.
     rocket_radius : float
         The radius of the rocket.
     just_radius : bool
@@ -24,6 +26,7 @@ def search_nosecone(bs, elements=None, rocket_radius=None, just_radius=False):
     settings : dict
         Dictionary with the settings for the nosecone.
     """
+    bs = DesignIndex.of(bs)
     settings = {}
     nosecone = bs.find("nosecone")  # TODO: allow for multiple nosecones
     name = nosecone.find("name").text if nosecone else "nosecone"
@@ -57,14 +60,10 @@ def search_nosecone(bs, elements=None, rocket_radius=None, just_radius=False):
         return base_radius  # return nosecone radius to the get_rocket_radius function
 
     def get_position(name, length):
-        count = 0
-        position = None
         # defaults to case insensitive
-        lower_name = name.lower()
-        for element in elements.values():
-            if element["name"].lower() == lower_name and element["length"] == length:
-                count += 1
-                position = element["position"]
+        found = ElementIndex.of(elements).find_by_name_and_length(name, length)
+        count = len(found)
+        position = found[-1]["position"] if found else None
         if count > 1:
             logger.warning(
                 "Multiple nosecones with the same name and length, "
@@ -95,5 +94,7 @@ def search_nosecone(bs, elements=None, rocket_radius=None, just_radius=False):
         "base_radius": base_radius,
         "position": get_position(name, length),
     }
-    logger.info("Nosecone setting defined:\n %s", _dict_to_string(settings, indent=23))
+    logger.info(
+        "Nosecone setting defined:\n %s", _lazy_dict_to_string(settings, indent=23)
+    )
     return settings
@@ -1,121 +1,158 @@
 import logging
 
-from .._helpers import _dict_to_string
+from .._helpers import _lazy_dict_to_string
+from .component_tree import (
+    IGNORED_TYPES,
+    ComponentRecord,
+    axial_position,
+    elements_from_records,
+)
 
 logger = logging.getLogger(__name__)
 
+STAGE_TYPES = ["Stage", "AxialStage"]
 
-def is_sub_component(ork):
-    """Determines whether the given object `ork` is a sub-component of another
-    object in a hierarchical structure.
 
-    Parameters:
-    -----------
-    ork: net.sf.openrocket.rocketcomponent
-        The object to be checked.
-
-    Returns:
-    --------
-    bool
-        True if `ork` is a sub-component (at least two levels below the root
-        object), False otherwise.
-    """
-    level = 0
-    root = ork.getRoot()
-    while ork != root:
-        ork = ork.getParent()
-        level += 1
-    return level > 1
+def snapshot_rocket(rocket):
+    """Walks the OpenRocket component tree once and copies it to plain Python
+    records, so nothing else has to call the JVM.
 
+    Each component costs a fixed number of calls: its class, name, length,
+    children, position method and offset, and the radii of the nose cones,
+    body tubes and transitions. The depth, stage and parent of each component
+    are tracked while descending instead of being asked to OpenRocket.
 
-def parent_is_a_stage(ork) -> bool:
-    # Verify if the parent of the object is a Stage or not.
-    try:
-        parent = ork.getParent()
-    except AttributeError:
-        return False
+    Parameters
+    ----------
+    rocket : net.sf.openrocket.rocketcomponent.Rocket
+        The rocket of the OpenRocket document, e.g. `ork.getRocket()`.
 
-    return parent.getClass().getSimpleName() in ["Stage", "AxialStage"]
+    Returns
+    -------
+    tuple of ComponentRecord
+        The components, in depth-first order, starting with the rocket.
+    """
+    records = [ComponentRecord("Rocket", str(rocket.getName()), 0.0, 0.0)]
+    top_position = 0.0
+    for index, stage in enumerate(rocket.getChildren()):
+        stage_type = str(stage.getClass().getSimpleName())
+        if stage_type not in STAGE_TYPES:
+            raise ValueError(f"Unsupported rocket component: '{stage_type}'.")
+        stage_index = len(records)
+        records.append(
+            ComponentRecord(
+                stage_type, str(stage.getName()), 0.0, top_position, None, None, 0, 1
+            )
+        )
+        cursor = top_position
+        for component in stage.getChildren():
+            component_type = str(component.getClass().getSimpleName())
+            length = float(component.getLength())
+            # the stage components are placed one after the other
+            _, offset = _axial_offset(component)
+            position = cursor + offset
+            records.append(
+                ComponentRecord(
+                    component_type,
+                    str(component.getName()),
+                    length,
+                    position,
+                    *_radii(component, component_type),
+                    parent=stage_index,
+                    depth=2,
+                    stage=index,
+                )
+            )
+            _snapshot_children(component, len(records) - 1, records)
+            cursor = position + length
+        records[stage_index] = records[stage_index]._replace(
+            length=cursor - top_position, stage=index
+        )
+        top_position = cursor
+
+    records[0] = records[0]._replace(length=top_position)
+    logger.info("Snapshot of the %d components of the rocket taken", len(records))
+    return tuple(records)
+
+
+def process_elements_position(ork, elements):
+    """Gets the position of the components of the rocket from OpenRocket.
+
+    Parameters
+    ----------
+    ork : net.sf.openrocket.rocketcomponent.Rocket
+        The rocket of the OpenRocket document.
+    elements : dict
+        Dictionary to be updated with the elements.
+
+    Returns
+    -------
+    elements : dict
+        The elements of the rocket, see `elements_from_records`.
+    """
+    elements.update(elements_from_records(snapshot_rocket(ork)))
+    logger.info("The elements are:\n%s", _lazy_dict_to_string(elements, indent=23))
+    return elements
 
 
-def calculate_distance_to_the_nose_tip(ork, top_position: float):
-    # NOTE: Always considering the nose tip as the reference point, it's the 0.
+def _snapshot_children(parent, parent_index, records):
+    """Positions the components attached to a parent component, relative to
+    the top of the parent. The components placed "after" the previous one,
+    e.g. the body tubes of pods and boosters, are stacked one after the other
+    starting at the top of the parent, as in a stage."""
+    parent_record = records[parent_index]
+    cursor = parent_record.position
+    for component in parent.getChildren():
+        component_type = str(component.getClass().getSimpleName())
+        if component_type in IGNORED_TYPES:
+            continue
+        length = float(component.getLength())
+        method, offset = _axial_offset(component)
+        if method in ["after", None]:
+            position = cursor + offset
+            cursor = position + length
+        else:
+            position = axial_position(
+                method, offset, parent_record.position, parent_record.length, length
+            )
+        records.append(
+            ComponentRecord(
+                component_type,
+                str(component.getName()),
+                length,
+                position,
+                parent=parent_index,
+                depth=parent_record.depth + 1,
+                stage=parent_record.stage,
+            )
+        )
+        _snapshot_children(component, len(records) - 1, records)
 
-    if ork.getClass().getSimpleName() in ["Rocket"]:
-        return 0
 
-    if is_sub_component(ork) is True:
+def _axial_offset(component):
+    """Returns the axial position method and offset of a component. OpenRocket
+    23.09 names them "axial method" and "axial offset", while older versions
+    use "relative position" and "position value". Returns (None, 0.0) for the
+    components that can not be positioned."""
+    try:
+        method, offset = component.getAxialMethod(), component.getAxialOffset()
+    except AttributeError:
         try:
-            distance_to_nose = top_position + ork.getPositionValue()
+            method = component.getRelativePosition()
+            offset = component.getPositionValue()
         except AttributeError:
-            # "object has no attribute 'getPositionValue'"
-            if parent_is_a_stage(ork):
-                distance_to_nose = top_position
-            else:
-                distance_to_nose = top_position + ork.getPosition().x
-    else:
-        distance_to_nose = top_position + ork.getLength()
-    return float(distance_to_nose)
-
-
-def process_elements_position(
-    ork, elements, center_of_dry_mass, rocket_mass, top_position=0
-):
-    if ork.getClass().getSimpleName() in ["Parachute", "MassComponent"]:
-        # These classes are irrelevant for our work
-        return elements
-
-    element = {
-        "type": str(ork.getClass().getSimpleName()),
-        "name": str(ork.getName()),
-        "length": float(ork.getLength()),
-        "position": calculate_distance_to_the_nose_tip(ork, top_position),
-    }
-    logger.info(
-        "Starting to process element '%s' of type '%s'",
-        ork.getName(),
-        ork.getClass().getSimpleName(),
-    )
-    unique_id = hash(frozenset(element.items()))
-    elements[unique_id] = element
-    i = 0
-
-    while True:
-        if i >= ork.getChildCount():
-            logger.info("No more children for '%s'", ork.getName())
-            break
-
-        try:
-            child = ork.getChild(i)
-            new_elements = process_elements_position(
-                child, {}, center_of_dry_mass, rocket_mass, top_position
-            )
-            elements.update(new_elements)
-            logger.info("Child '%s' processed", child.getName())
-
-            top_position += child.getLength()
-
-            i += 1
-            logger.info("Moving to the next child")
-
-        except Exception as e:  # pylint: disable=broad-except
-            if "IndexOutOfBoundsException" in str(e):
-                logger.warning(
-                    "Index out of bounds - likely no more children to process."
-                )
-                break
-            else:
-                logger.error(
-                    "Error while processing the position of the elements: %s",
-                    e,
-                    exc_info=True,
-                )
-                logger.info(
-                    "The elements are:\n%s",
-                    _dict_to_string(elements, indent=23),
-                )
-                print(e)
-                break  # Exit the loop if an unexpected error occurs
-
-    logger.info("Finished processing '%s'", ork.getName())
-    return elements
+            return None, 0.0
+    return str(method.name()).lower(), float(offset)
+
+
+def _radii(component, component_type):
+    """Returns the fore and aft radii of the components that define the outer
+    shape of the rocket, with the automatic values already resolved."""
+    if component_type == "NoseCone":
+        return 0.0, float(component.getAftRadius())
+    if component_type == "BodyTube":
+        radius = float(component.getOuterRadius())
+        return radius, radius
+    if component_type == "Transition":
+        return float(component.getForeRadius()), float(component.getAftRadius())
+    return None, None
@@ -2,7 +2,8 @@ import logging
 
 import numpy as np
 
-from .._helpers import _dict_to_string
+from .._helpers import _lazy_dict_to_string
+from .design_index import DesignIndex
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +24,7 @@ def search_parachutes(bs):
         The keys of the parachute dicts are: "name", "cd", "cds", "area",
         "deploy_event", "deploy_delay", "deploy_altitude".
     """
+    bs = DesignIndex.of(bs)
     settings = {}
 
     chutes = bs.findAll("parachute")
@@ -63,7 +65,7 @@ def search_parachutes(bs):
         logger.info(
             "The Parachute number %d had its settings defined:\n%s",
             idx,
-            _dict_to_string(setting, indent=23),
+            _lazy_dict_to_string(setting, indent=23),
         )
     logger.info("All parachutes settings were collected")
     return settings
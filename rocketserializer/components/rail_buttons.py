@@ -1,20 +1,22 @@
 import logging
 
+from .design_index import DesignIndex
+from .element_index import ElementIndex
+
 logger = logging.getLogger(__name__)
 
 
 def search_rail_buttons(bs, elements: dict) -> dict:
 
-    lugs_elements = []
-    for value in elements.values():
-        if value["type"] in ["LaunchLug", "RailButton"]:
-            lugs_elements.append(value)
+    bs = DesignIndex.of(bs)
+    lugs_elements = ElementIndex.of(elements).sorted_by_position(
+        "LaunchLug", "RailButton"
+    )
 
     if len(lugs_elements) < 2 or not lugs_elements:
         logger.info("Could not fetch a pair of rail buttons")
         return {}
 
-    lugs_elements.sort(key=lambda x: x["position"])
     # We only need the 2 buttons closest to the nozzle.
     lugs_elements = lugs_elements[-2:]
 
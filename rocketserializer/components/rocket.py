@@ -1,11 +1,12 @@
 import logging
 
-from .._helpers import _dict_to_string
+from .._helpers import _lazy_dict_to_string
+from .design_index import DesignIndex
 
 logger = logging.getLogger(__name__)
 
 
-def search_rocket(bs, datapoints, data_labels, burnout_position):
+def search_rocket(bs, flight_data, burnout_position):
     settings = {}
 
     # get radius
@@ -13,23 +14,20 @@ def search_rocket(bs, datapoints, data_labels, burnout_position):
     logger.info("Collected rocket radius.")
 
     # get mass
-    cg_location_vector = [
-        float(datapoint.text.split(",")[data_labels.index("CG location")])
-        for datapoint in datapoints
-    ]
-    settings["mass"] = get_mass(datapoints, data_labels, burnout_position)
+    cg_location_vector = flight_data["CG location"]
+    settings["mass"] = get_mass(flight_data, burnout_position)
     logger.info("Collected rocket mass.")
 
     # get inertias
-    inertia_z, inertia_i = get_inertias(data_labels, burnout_position, datapoints)
+    inertia_z, inertia_i = get_inertias(flight_data, burnout_position)
     settings["inertia"] = (inertia_i, inertia_i, inertia_z)
     logger.info("Collected rocket inertia.")
 
     # get center of mass
-    center_of_dry_mass = cg_location_vector[burnout_position]
-    center_of_mass = cg_location_vector[0]
+    center_of_dry_mass = float(cg_location_vector[burnout_position])
+    center_of_mass = float(cg_location_vector[0])
     rocket_dry_mass = settings["mass"]
-    propellant_mass = get_mass(datapoints, data_labels, 0) - rocket_dry_mass
+    propellant_mass = get_mass(flight_data, 0) - rocket_dry_mass
 
     center_of_propellant_mass = (
         center_of_mass * (rocket_dry_mass + propellant_mass)
@@ -44,13 +42,14 @@ def search_rocket(bs, datapoints, data_labels, burnout_position):
 
     logger.info(
         "All the Rocket information was collected:\n%s",
-        _dict_to_string(settings, indent=23),
+        _lazy_dict_to_string(settings, indent=23),
     )
     return settings, motor_position
 
 
 def get_rocket_radius(bs):
     # We want to take the maximum radius of the rocket
+    bs = DesignIndex.of(bs)
     tubes = bs.findAll("bodytube")
     noses = bs.findAll("nosecone")
 
@@ -69,15 +68,11 @@ def get_rocket_radius(bs):
     return rocket_radius
 
 
-def get_mass(datapoints, data_labels, burnout_position):
-    mass_vector = [
-        float(datapoint.text.split(",")[data_labels.index("Mass")])
-        for datapoint in datapoints
-    ]
-    return mass_vector[burnout_position]
+def get_mass(flight_data, burnout_position):
+    return float(flight_data["Mass"][burnout_position])
 
 
-def get_inertias(data_labels, burnout_position, datapoints):
+def get_inertias(flight_data, burnout_position):
     """Get the moment of inertia of the rocket in the longitudinal and rotational
     axis. The moment of inertia is calculated at the burnout position. This
     means that the motor is included in the calculation, but the propellant mass
@@ -85,12 +80,10 @@ def get_inertias(data_labels, burnout_position, datapoints):
 
     Parameters
     ----------
-    data_labels : list
-        List of strings with the labels of the data.
+    flight_data : FlightDataTable
+        The simulation data available in the .ork file.
     burnout_position : int
         The index of the burnout position in the data.
-    datapoints : list
-        List of datapoints available in the .ork file.
 
     Returns
     -------
@@ -98,20 +91,10 @@ def get_inertias(data_labels, burnout_position, datapoints):
         The moment of inertia of the rocket in the longitudinal and rotational
         axis, respectively.
     """
-    longitudinal = [
-        float(
-            datapoint.text.split(",")[
-                data_labels.index("Longitudinal moment of inertia")
-            ]
-        )
-        for datapoint in datapoints
-    ][burnout_position]
-    rotational = [
-        float(
-            datapoint.text.split(",")[data_labels.index("Rotational moment of inertia")]
-        )
-        for datapoint in datapoints
-    ][burnout_position]
+    longitudinal = float(
+        flight_data["Longitudinal moment of inertia"][burnout_position]
+    )
+    rotational = float(flight_data["Rotational moment of inertia"][burnout_position])
     logger.info(
         "The moment of inertia of the rocket is: %f (longitudinal) and %f (rotational)",
         longitudinal,
@@ -0,0 +1,92 @@
+import logging
+
+from ..flight_data import FlightDataTable
+from .design_index import DesignIndex
+
+logger = logging.getLogger(__name__)
+
+
+def search_simulations(bs, databranches=None, selection="all"):
+    """Search for the simulations in the bs and return the data of each one.
+
+    Parameters
+    ----------
+    bs : bs4.BeautifulSoup
+        The BeautifulSoup object of the .ork file.
+    databranches : list of FlightDataTable, optional
+        The data of each ``<databranch>`` tag, in the order of the document, as
+        returned by `parse_ork_file`. If None, the data is read from the
+        ``<datapoint>`` tags of the `bs` object.
+    selection : str or list, optional
+        Either "all", to return every simulation with data, or a list with the
+        names (str) or the indexes (int) of the simulations to return, in the
+        order of the document. Default is "all".
+
+    Returns
+    -------
+    simulations : list of tuple
+        The index, the name, the ``<simulation>`` tag and the FlightDataTable of
+        the first databranch of each simulation, in the order of the document.
+
+    Raises
+    ------
+    ValueError
+        In case a selected simulation does not exist or has no data.
+    """
+    bs = DesignIndex.of(bs)
+    simulations = bs.simulations
+    logger.info("A total of %d simulations were detected", len(simulations))
+
+    # the databranches are parsed in the same order as their tags
+    positions = {id(tag): idx for idx, tag in enumerate(bs.findAll("databranch"))}
+
+    if selection == "all":
+        selected = range(len(simulations))
+    else:
+        names = [simulation.find("name").text for simulation in simulations]
+        selected = [
+            __index_of_simulation(item, names, len(simulations)) for item in selection
+        ]
+
+    results = []
+    for idx in selected:
+        simulation = simulations[idx]
+        name = simulation.find("name").text
+        branch = simulation.find("databranch")
+        if branch is None:
+            if selection != "all":
+                raise ValueError(
+                    f"The simulation '{name}' has no data. Open the .ork file "
+                    "and run it first."
+                )
+            logger.warning("Skipping the simulation '%s', it has no data", name)
+            continue
+
+        if databranches is None:
+            flight_data = FlightDataTable.from_datapoints(
+                branch.find_all("datapoint"), branch.attrs["types"].split(",")
+            )
+        else:
+            flight_data = databranches[positions[id(branch)]]
+        logger.info(
+            "Simulation %d ('%s') has %d datapoints", idx, name, len(flight_data)
+        )
+        results.append((idx, name, simulation, flight_data))
+    return results
+
+
+def __index_of_simulation(item, names, count):
+    """Returns the index of a simulation selected by its name or index."""
+    if isinstance(item, int):
+        if not 0 <= item < count:
+            raise ValueError(
+                f"There is no simulation with the index {item}, the file has "
+                f"{count} simulations."
+            )
+        return item
+    if item not in names:
+        raise ValueError(
+            f"There is no simulation named '{item}'. The simulations are: "
+            + ", ".join(f"'{name}'" for name in names)
+        )
+    return names.index(item)
@@ -2,12 +2,13 @@ import logging
 
 import numpy as np
 
-from .._helpers import _dict_to_string
+from .._helpers import _lazy_dict_to_string
+from .design_index import DesignIndex
 
 logger = logging.getLogger(__name__)
 
 
-def search_stored_results(bs, datapoints, data_labels, time_vector, burnout_position):
+def search_stored_results(bs, flight_data, burnout_position, simulation=None):
     """Search for the stored simulation results in the bs and return the
     settings as a dict.
 
@@ -15,6 +16,13 @@ def search_stored_results(bs, datapoints, data_labels, time_vector, burnout_posi
     ----------
     bs : BeautifulSoup
         BeautifulSoup object of the .ork file.
+    flight_data : FlightDataTable
+        The simulation data from the .ork file.
+    burnout_position : int
+        The index of the burnout position in the flight data.
+    simulation : bs4.element.Tag, optional
+        The ``<simulation>`` tag with the stored results. If None, the first
+        simulation of the .ork file is used.
 
     Returns
     -------
@@ -23,8 +31,9 @@ def search_stored_results(bs, datapoints, data_labels, time_vector, burnout_posi
         "maxaltitude", "maxvelocity", "maxacceleration", "maxmach", "timetoapogee",
         "flighttime", "groundhitvelocity" and "launchrodvelocity".
     """
+    bs = DesignIndex.of(bs)
     settings = {}
-    sim = bs.find("simulation")
+    sim = simulation if simulation is not None else bs.find("simulation")
     sim_data = sim.find("flightdata")
     logger.info("Found the 'flightdata' tag in the 'simulation' tag.")
     name_map = {
@@ -44,84 +53,91 @@ def search_stored_results(bs, datapoints, data_labels, time_vector, burnout_posi
             "Retrieved the '%s' value from the .ork file: %s", key, settings[key]
         )
 
-    settings["max_stability_margin"] = __get_parameter(
-        datapoints,
-        data_labels,
-        time_vector,
-        "Stability margin calibers",
-        position="max",
-    )
-    settings["min_stability_margin"] = __get_parameter(
-        datapoints,
-        data_labels,
-        time_vector,
-        "Stability margin calibers",
-        position="min",
-    )
-    settings["burnout_stability_margin"] = __get_parameter(
-        datapoints,
-        data_labels,
-        time_vector,
-        "Stability margin calibers",
-        position=burnout_position,
-    )
-    settings["max_thrust"] = __get_parameter(
-        datapoints, data_labels, time_vector, "Thrust", position="max"
+    summary = summarize_flight_data(
+        flight_data, ["Stability margin calibers", "Thrust"], burnout_position
     )
+    settings["max_stability_margin"] = summary["Stability margin calibers"]["max"]
+    settings["min_stability_margin"] = summary["Stability margin calibers"]["min"]
+    settings["burnout_stability_margin"] = summary["Stability margin calibers"][
+        "burnout"
+    ]
+    settings["max_thrust"] = summary["Thrust"]["max"]
 
     logger.info(
         "The flight data was successfully retrieved:\n%s",
-        _dict_to_string(settings, indent=23),
+        _lazy_dict_to_string(settings, indent=23),
     )
     return settings
 
 
-def __get_parameter(datapoints, data_labels, time_vector, label, position):
-    """Get the latitude and longitude from the .ork file.
+def summarize_flight_data(flight_data, labels, burnout_position):
+    """Computes the statistics of some columns of the flight data at once.
+
+    The rows are sorted by time a single time for all the columns, negative
+    values are clipped to zero and NaN values are ignored, through masked
+    reductions instead of filtering each column on its own.
+
     Parameters
     ----------
-    label : str
-        Latitude or longitude.
-    datapoints : list
-        List of datapoints from the .ork file.
-    data_labels : list
-        List of labels for the datapoints.
-    time_vector : list
-        The time vector of the simulation.
-    position : str or int
-        The position to get the value from. Can be "last", "first", "max", "min"
-        or an integer.
+    flight_data : FlightDataTable
+        The simulation data from the .ork file.
+    labels : list of str
+        The labels of the data columns, e.g. ["Thrust"].
+    burnout_position : int
+        The index of the burnout position in the valid (non NaN) values of each
+        column, sorted by time.
+
+    Returns
+    -------
+    summary : dict
+        Dictionary with one dict of statistics per label. The keys of the
+        statistics are: "first", "last", "max", "min", "burnout" (the value at
+        the burnout position), "max_powered" and "min_powered" (the extrema
+        before the burnout) and "max_coast" and "min_coast" (the extrema from
+        the burnout on). A statistic is None if the column has no valid values
+        to compute it from, e.g. a burnout position past the end of the data.
     """
+    order = np.argsort(flight_data.time)
+    columns = [flight_data.index[label] for label in labels]
+    values = flight_data.data[np.ix_(order, columns)]
+    # clip the curves to remove negative values
+    values[values < 0] = 0
 
-    parameter = [
-        float(datapoint.text.split(",")[data_labels.index(label)])
-        for datapoint in datapoints
-    ]
-    # convert to numpy array
-    parameter = np.array([time_vector, parameter]).T
-    # sort by time
-    parameter = parameter[parameter[:, 0].argsort()]
-    # clip the curve to remove negative values
-    parameter[parameter[:, 1] < 0, 1] = 0
-    # Assuming parameter is a NumPy array and 'NaN' values are represented as np.nan
-    # This will keep rows where the second column is not NaN
-    parameter = parameter[~np.isnan(parameter[:, 1])]
-
-    if isinstance(position, str):
-        if position == "last":
-            # return the end point (final time, final value)
-            return parameter[-1, 1]
-        elif position == "first":
-            # return the first point (initial time, initial value)
-            return parameter[0, 1]
-        elif position == "max":
-            return np.max(parameter[:, 1])  # return the maximum value
-        elif position == "min":
-            return np.min(parameter[:, 1])  # return the minimum value
-    else:
-        pass
-    if isinstance(position, np.int64):
-        return parameter[position, 1]  # return the value at the specified position
-    else:
-        logger.error("Invalid position parameter")
-        raise ValueError("Error in position parameter")
+    valid = ~np.isnan(values)
+    # rank of each valid value in its column, i.e. the position after removing NaN
+    rank = np.cumsum(valid, axis=0) - 1
+    count = valid.sum(axis=0)
+    powered = valid & (rank < burnout_position)
+    coast = valid & (rank >= burnout_position)
+    burnout = valid & (rank == burnout_position)
+
+    def reduce(function, mask, fill):
+        result = function(np.where(mask, values, fill), axis=0)
+        return np.where(mask.any(axis=0), result, np.nan)
+
+    def pick(mask):
+        return reduce(np.max, mask, -np.inf)
+
+    statistics = {
+        "first": pick(valid & (rank == 0)),
+        "last": pick(valid & (rank == count - 1)),
+        "max": reduce(np.max, valid, -np.inf),
+        "min": reduce(np.min, valid, np.inf),
+        "burnout": pick(burnout),
+        "max_powered": reduce(np.max, powered, -np.inf),
+        "min_powered": reduce(np.min, powered, np.inf),
+        "max_coast": reduce(np.max, coast, -np.inf),
+        "min_coast": reduce(np.min, coast, np.inf),
+    }
+    # None instead of NaN, which is not valid json
+    summary = {
+        label: {
+            key: None if np.isnan(value[idx]) else float(value[idx])
+            for key, value in statistics.items()
+        }
+        for idx, label in enumerate(labels)
+    }
+    logger.info(
+        "The flight data was summarized:\n%s", _lazy_dict_to_string(summary, indent=23)
+    )
+    return summary
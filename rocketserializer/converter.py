@@ -0,0 +1,600 @@
+import copy
+import json
+import logging
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from ._helpers import parse_ork_file
+from .bundle import BUNDLE_NAME, save_bundle
+from .components.curve_decimation import decimate_curve
+from .components.drag_curve import (
+    DRAG_CURVE_FILE,
+    drag_curve_to_csv,
+    drag_table_files,
+    write_drag_curve,
+    write_drag_tables,
+)
+from .components.motor import (
+    THRUST_CURVE_FILE,
+    thrust_curve_to_csv,
+    write_thrust_curve,
+)
+from .flight_data import FlightDataTable
+from .openrocket import LazyDocument, OpenRocketSession
+from .ork_extractor import ork_extractor
+from .profiler import profile_stage
+
+logger = logging.getLogger(__name__)
+
+
+class ConversionResult(NamedTuple):
+    """The outputs of the conversion of a .ork file, kept in memory.
+
+    The paths to the curves in the settings ("drag_curve" of the rocket and
+    "thrust_source" of the motors) are None, since nothing was saved. Use
+    `save` to write the files.
+
+    If the simulations were extracted, `simulations` maps the index of each
+    one to its "drag_curve", "thrust_source" and "flight_data". If the drag
+    tables were built, `drag_tables` has the "power_on_drag" and
+    "power_off_drag" tables, also included in the curves of each simulation.
+    """
+
+    settings: dict
+    drag_curve: np.ndarray
+    thrust_source: np.ndarray
+    flight_data: FlightDataTable
+    simulations: dict = None
+    drag_tables: dict = None
+
+    def curves(self):
+        """Returns the arrays of the conversion by name: "drag_curve",
+        "thrust_source", "flight_data", "simulations" and "drag_tables"."""
+        return {
+            "drag_curve": self.drag_curve,
+            "thrust_source": self.thrust_source,
+            "flight_data": self.flight_data,
+            "simulations": self.simulations,
+            "drag_tables": self.drag_tables,
+        }
+
+    def csv_files(self):
+        """Returns the content of the .csv files of the curves.
+
+        Returns
+        -------
+        dict
+            Maps the name of each file, "drag_curve.csv" and
+            "thrust_source.csv", to its content. The curves of the extracted
+            simulations are named "drag_curve_<index>.csv" and
+            "thrust_source_<index>.csv". The drag tables, if any, are named
+            "drag_curve_power_on.csv" and "drag_curve_power_off.csv", with the
+            same suffix for the simulations.
+        """
+        files = {
+            DRAG_CURVE_FILE: drag_curve_to_csv(self.drag_curve),
+            THRUST_CURVE_FILE: thrust_curve_to_csv(self.thrust_source),
+        }
+        files.update(_drag_table_csv_files(self.drag_tables))
+        for idx, curves in (self.simulations or {}).items():
+            files[f"drag_curve_{idx}.csv"] = drag_curve_to_csv(curves["drag_curve"])
+            files[f"thrust_source_{idx}.csv"] = thrust_curve_to_csv(
+                curves["thrust_source"]
+            )
+            files.update(_drag_table_csv_files(curves.get("drag_tables"), f"_{idx}"))
+        return files
+
+    def decimate(self, tolerance):
+        """Returns a copy of the conversion with decimated drag and thrust
+        curves, see `decimate_curve`.
+
+        Parameters
+        ----------
+        tolerance : float
+            The maximum interpolation error of the decimated curves, as a
+            fraction of the largest value of each curve, e.g. 0.001 for 0.1%.
+
+        Returns
+        -------
+        ConversionResult
+            The decimated conversion. The "decimation" key of its settings (and
+            of each extracted simulation) has the report of each curve, with the
+            point reduction and the maximum interpolation error introduced.
+        """
+        settings = copy.deepcopy(self.settings)
+        with profile_stage("decimate_curves"):
+            drag_curve, thrust_source, settings["decimation"] = _decimate_curves(
+                self.drag_curve, self.thrust_source, tolerance
+            )
+            simulations = None
+            if self.simulations is not None:
+                simulations = {}
+                for idx, curves in self.simulations.items():
+                    drag, thrust, report = _decimate_curves(
+                        curves["drag_curve"], curves["thrust_source"], tolerance
+                    )
+                    simulations[idx] = {
+                        **curves,
+                        "drag_curve": drag,
+                        "thrust_source": thrust,
+                    }
+                    settings["simulations"][idx]["decimation"] = report
+        return ConversionResult(
+            settings,
+            drag_curve,
+            thrust_source,
+            self.flight_data,
+            simulations,
+            self.drag_tables,
+        )
+
+    def save(
+        self,
+        output_folder,
+        output_format="json",
+        encoding="utf-8",
+        precision=None,
+        compress=False,
+        tolerance=None,
+    ):
+        """Saves the conversion to the output folder.
+
+        Parameters
+        ----------
+        output_folder : str
+            The folder where the files are saved. It must already exist.
+        output_format : str, optional
+            Either "json", to save the parameters.json, drag_curve.csv and
+            thrust_source.csv files, or "npz", to save a single
+            parameters.npz bundle, see `save_bundle`. Default is "json".
+        encoding : str, optional
+            The encoding of the parameters.json file. Default is "utf-8".
+        precision : int or str, optional
+            The number of decimal places of the .csv curves, or "repr" for the
+            shortest round-trip representation, see `write_curve`. By default,
+            6 for the drag curve and 5 for the thrust curve.
+        compress : bool, optional
+            If True, the .csv curves are compressed with gzip, to .csv.gz
+            files. Default is False.
+        tolerance : float, optional
+            If given, the curves are decimated before they are saved, see
+            `decimate`. Default is None.
+
+        Returns
+        -------
+        dict
+            A copy of the settings, with the paths to the saved curves.
+        """
+        if tolerance is not None:
+            return self.decimate(tolerance).save(
+                output_folder, output_format, encoding, precision, compress
+            )
+
+        settings = copy.deepcopy(self.settings)
+        options = {"compress": compress}
+        if precision is not None:
+            options["precision"] = precision
+        if output_format == "npz":
+            with profile_stage("save_bundle"):
+                save_bundle(settings, self.curves(), output_folder)
+        elif output_format == "json":
+            with profile_stage("write_drag_curve"):
+                settings["rocket"]["drag_curve"] = write_drag_curve(
+                    self.drag_curve, output_folder, **options
+                )
+            with profile_stage("write_thrust_curve"):
+                settings["motors"]["thrust_source"] = write_thrust_curve(
+                    self.thrust_source, output_folder, **options
+                )
+            if self.drag_tables is not None:
+                with profile_stage("write_drag_tables"):
+                    settings["rocket"].update(
+                        write_drag_tables(self.drag_tables, output_folder, **options)
+                    )
+            for idx, curves in (self.simulations or {}).items():
+                simulation = settings["simulations"][idx]
+                simulation["rocket"]["drag_curve"] = write_drag_curve(
+                    curves["drag_curve"],
+                    output_folder,
+                    f"drag_curve_{idx}.csv",
+                    **options,
+                )
+                simulation["motors"]["thrust_source"] = write_thrust_curve(
+                    curves["thrust_source"],
+                    output_folder,
+                    f"thrust_source_{idx}.csv",
+                    **options,
+                )
+                if "drag_tables" in curves:
+                    simulation["rocket"].update(
+                        write_drag_tables(
+                            curves["drag_tables"], output_folder, f"_{idx}", **options
+                        )
+                    )
+            with profile_stage("save_parameters_json"):
+                save_parameters_json(settings, output_folder, encoding)
+        else:
+            raise ValueError(f"Unsupported output format '{output_format}'.")
+        return settings
+
+
+def convert(
+    source,
+    name=None,
+    session=None,
+    ork_jar=None,
+    simulations=None,
+    drag_table_step=None,
+):
+    """Converts a .ork file in memory, without writing anything to disk.
+
+    Parameters
+    ----------
+    source : str, Path, bytes or file-like
+        The path to the .ork file, its content or a binary file object to read
+        it from. Both plain xml and compressed .ork files are accepted.
+    name : str, optional
+        The name of the .ork file, saved to the "filepath" of the "id"
+        settings. Defaults to the path of the file, or to the name of the file
+        object, falling back to "rocket.ork".
+    session : OpenRocketSession, optional
+        The session used if the components can not be resolved from the xml of
+        the file. If unspecified, a session is created and closed for this
+        conversion only, and OpenRocket is only started if it is needed.
+    ork_jar : str, optional
+        The path to the OpenRocket .jar file of the created session.
+    simulations : str or list, optional
+        The simulations to extract besides the first one, "all" or a list of
+        their names or indexes. The design is only processed once for all of
+        them. See `ork_extractor`. Default is None.
+    drag_table_step : float, optional
+        If given, the power-on and power-off drag tables are also built, with
+        Mach bins of this width, e.g. 0.01. See `get_drag_tables`. Default is
+        None.
+
+    Returns
+    -------
+    ConversionResult
+        The settings, the drag and thrust curves and the complete flight data.
+
+    Raises
+    ------
+    FileNotFoundError
+        In case the .ork file does not exist.
+    ValueError
+        In case the .ork file does not contain the simulation data.
+
+    Examples
+    --------
+    >>> from rocketserializer import convert
+    >>> with open("rocket.ork", "rb") as file:  # doctest: +SKIP
+    ...     result = convert(file)
+    >>> result.settings["rocket"]["mass"]  # doctest: +SKIP
+    >>> result.save("output")  # doctest: +SKIP
+    """
+    source, name = _read_source(source, name)
+
+    with profile_stage("parse_ork_file"):
+        bs, databranches = parse_ork_file(source)
+
+    if (
+        len(databranches) == 0
+        or len(databranches[0]) == 0
+        or "CG location" not in databranches[0]
+    ):
+        error_msg = (
+            "[ork2json] The file must contain the simulation data.\n"
+            + "Open the .ork file and run the simulation first."
+        )
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+    if session is None:
+        with OpenRocketSession(ork_jar, log_level="OFF") as conversion_session:
+            return _extract(
+                bs,
+                databranches,
+                source,
+                name,
+                conversion_session,
+                simulations,
+                drag_table_step,
+            )
+    return _extract(
+        bs, databranches, source, name, session, simulations, drag_table_step
+    )
+
+
+def save_parameters_json(settings, output, encoding="utf-8"):
+    """Saves the settings to the "parameters.json" file of the output folder."""
+    with open(
+        os.path.join(output, "parameters.json"), "w", encoding=encoding
+    ) as convert_file:
+        with profile_stage("json_dumps"):
+            text = json.dumps(settings, indent=4, sort_keys=True, ensure_ascii=False)
+        convert_file.write(text)
+        logger.info(
+            "[ork2json] The file 'parameters.json' was saved to: '%s'",
+            Path(output).as_posix(),
+        )
+        logger.info(
+            "[ork2json] Operation completed successfully. You can now use "
+            "the 'parameters.json' file to run a simulation."
+        )
+
+
+def convert_cached(
+    filepath,
+    output,
+    ork_jar=None,
+    encoding="utf-8",
+    cache=None,
+    output_format="json",
+    simulations=None,
+    curve_options=None,
+    drag_table_step=None,
+    session=None,
+):
+    """Converts a single .ork file to the output folder, reusing the cached
+    conversion if there is one, and only starting OpenRocket if it is needed.
+    See `convert_to_folder` for the parameters.
+
+    Parameters
+    ----------
+    session : OpenRocketSession, optional
+        The session used if the components can not be resolved from the xml.
+        If unspecified, a session is created with the `ork_jar` for this
+        conversion only.
+
+    Returns
+    -------
+    dict
+        The settings of the conversion.
+    """
+    with profile_stage("cache_lookup"):
+        cached = restore_from_cache(
+            filepath,
+            output,
+            cache,
+            encoding,
+            output_format,
+            simulations,
+            curve_options,
+            drag_table_step,
+        )
+    if cached is not None:
+        return cached
+
+    # orhelper options are: OFF, ERROR, WARN, INFO, DEBUG, TRACE and ALL
+    # log_level = "OFF" if verbose else "OFF"
+    # TODO: even if the log level is set to OFF, the orhelper still prints msgs
+
+    if session is not None:
+        return convert_to_folder(
+            filepath,
+            output,
+            session,
+            encoding=encoding,
+            cache=cache,
+            output_format=output_format,
+            simulations=simulations,
+            curve_options=curve_options,
+            drag_table_step=drag_table_step,
+        )
+    with OpenRocketSession(ork_jar, log_level="OFF") as conversion_session:
+        return convert_to_folder(
+            filepath,
+            output,
+            conversion_session,
+            encoding=encoding,
+            cache=cache,
+            output_format=output_format,
+            simulations=simulations,
+            curve_options=curve_options,
+            drag_table_step=drag_table_step,
+        )
+
+
+def convert_to_folder(
+    filepath,
+    output,
+    session,
+    encoding="utf-8",
+    cache=None,
+    output_format="json",
+    simulations=None,
+    curve_options=None,
+    drag_table_step=None,
+):
+    """Converts a single .ork file to a parameters.json file (or a bundle) in
+    the output folder, saving it to the cache. See the ork2json command for
+    the other parameters.
+
+    Parameters
+    ----------
+    session : OpenRocketSession
+        The session used to load the document in OpenRocket, only if the
+        components can not be resolved from the xml.
+    cache : ConversionCache, optional
+        If given, the conversion is saved to this cache.
+    output_format : str, optional
+        The format of the outputs, "json" or "npz". Default is "json".
+    simulations : str or list, optional
+        The simulations to extract besides the first one, see `convert`.
+    curve_options : dict, optional
+        The "precision", "compress" and "tolerance" options of the curves, see
+        `ConversionResult.save`.
+    drag_table_step : float, optional
+        The width of the Mach bins of the drag tables, see `convert`.
+
+    Returns
+    -------
+    dict
+        The settings saved to the parameters.json file.
+    """
+    filepath = Path(filepath)
+    result = convert(
+        filepath,
+        session=session,
+        simulations=simulations,
+        drag_table_step=drag_table_step,
+    )
+
+    output = get_output_folder(filepath, output)
+
+    # create the output folder if it does not exist
+    os.makedirs(output, exist_ok=True)
+
+    settings = result.save(output, output_format, encoding, **(curve_options or {}))
+    artifacts = [BUNDLE_NAME] if output_format == "npz" else None
+
+    if cache is not None:
+        with profile_stage("cache_put"):
+            key = cache.key(
+                filepath,
+                cache_options(
+                    output_format, simulations, curve_options, drag_table_step
+                ),
+            )
+            cache.put(key, settings, output, artifacts=artifacts)
+    return settings
+
+
+def restore_from_cache(
+    filepath,
+    output,
+    cache,
+    encoding="utf-8",
+    output_format="json",
+    simulations=None,
+    curve_options=None,
+    drag_table_step=None,
+):
+    """Restores the conversion of a .ork file from the cache, if available,
+    and saves its parameters.json file (the npz bundle is a cached file).
+
+    Returns
+    -------
+    dict or None
+        The settings of the cached conversion, or None if there is none.
+    """
+    filepath = Path(filepath)
+    if cache is None or not filepath.is_file():
+        return None
+
+    output = get_output_folder(filepath, output)
+    key = cache.key(
+        filepath,
+        cache_options(output_format, simulations, curve_options, drag_table_step),
+    )
+    settings = cache.get(key, filepath, output)
+    if settings is None:
+        return None
+
+    logger.info(
+        "[ork2json] Restored the conversion of '%s' from the cache.",
+        filepath.as_posix(),
+    )
+    if output_format == "json":
+        save_parameters_json(settings, output, encoding)
+    return settings
+
+
+def cache_options(
+    output_format="json", simulations=None, curve_options=None, drag_table_step=None
+):
+    """Returns the options that change the outputs of a conversion, used in
+    the cache keys. The defaults are left out, so that the keys of the
+    previous versions remain valid."""
+    options = {}
+    if output_format != "json":
+        options["format"] = output_format
+    if simulations is not None:
+        options["simulations"] = simulations
+    if curve_options:
+        options["curves"] = curve_options
+    if drag_table_step is not None:
+        options["drag_table_step"] = drag_table_step
+    return options or None
+
+
+def get_output_folder(filepath, output=None):
+    if not output:
+        # get the same folder as the .ork file
+        output = filepath.parent
+        logger.warning(
+            "[ork2json] Output folder not specified. Using '%s' instead.",
+            Path(output).as_posix(),
+        )
+    return output
+
+
+def _extract(
+    bs, databranches, source, name, session, simulations=None, drag_table_step=None
+):
+    curves = {}
+    with profile_stage("ork_extractor"):
+        settings = ork_extractor(
+            bs=bs,
+            filepath=name,
+            output_folder=None,
+            ork=LazyDocument(session, source),
+            flight_data=databranches[0],
+            curves=curves,
+            simulations=simulations,
+            databranches=databranches,
+            drag_table_step=drag_table_step,
+        )
+    return ConversionResult(
+        settings,
+        curves["drag_curve"],
+        curves["thrust_source"],
+        curves["flight_data"],
+        curves.get("simulations"),
+        curves.get("drag_tables"),
+    )
+
+
+def _drag_table_csv_files(tables, suffix=""):
+    """Returns the content of the .csv files of the drag tables, if any."""
+    if tables is None:
+        return {}
+    return {
+        filename: drag_curve_to_csv(tables[name])
+        for name, filename in drag_table_files(suffix).items()
+    }
+
+
+def _decimate_curves(drag_curve, thrust_source, tolerance):
+    """Decimates the drag and thrust curves, returning them and their reports."""
+    drag_curve, drag_report = decimate_curve(drag_curve, tolerance)
+    thrust_source, thrust_report = decimate_curve(thrust_source, tolerance)
+    report = {"drag_curve": drag_report, "thrust_source": thrust_report}
+    logger.info(
+        "[ork2json] The curves were decimated from %d to %d points.",
+        drag_report["points"] + thrust_report["points"],
+        drag_report["decimated_points"] + thrust_report["decimated_points"],
+    )
+    return drag_curve, thrust_source, report
+
+
+def _read_source(source, name=None):
+    """Returns the path or the content of the .ork file, and its name."""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source), name or "rocket.ork"
+    if hasattr(source, "read"):
+        default = Path(str(getattr(source, "name", ""))).name or "rocket.ork"
+        return source.read(), name or default
+
+    filepath = Path(source)
+    if not filepath.exists():
+        error = (
+            "[ork2json] The .ork file or zip archive does not exist. "
+            "Please specify a valid path."
+        )
+        logger.error(error)
+        raise FileNotFoundError(error)
+    return filepath, name or str(filepath)
@@ -0,0 +1,85 @@
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class FlightDataTable:
+    """Columnar view of the simulation data stored in a .ork file.
+
+    The values of every ``<datapoint>`` are parsed only once into a 2-D float
+    array, where each row is a datapoint and each column corresponds to one of
+    the labels listed in the ``types`` attribute of the ``<databranch>`` tag.
+    Columns can then be retrieved by label without re-splitting the text of the
+    datapoints.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from rocketserializer.flight_data import FlightDataTable
+    >>> table = FlightDataTable(np.array([[0.0, 1.0], [0.1, 2.0]]), ["Time", "Mass"])
+    >>> table["Mass"]
+    array([1., 2.])
+    """
+
+    def __init__(self, data, labels):
+        """Creates the table from an already parsed array of values.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            2-D array with one row per datapoint and one column per label.
+        labels : list of str
+            The names of each data column.
+        """
+        self.data = np.asarray(data, dtype=float).reshape(-1, len(labels))
+        self.labels = list(labels)
+        self.index = {label: idx for idx, label in enumerate(self.labels)}
+
+    @classmethod
+    def from_datapoints(cls, datapoints, labels):
+        """Builds the table from the ``<datapoint>`` tags of a .ork file.
+
+        Parameters
+        ----------
+        datapoints : list of bs4.element.Tag
+            The datapoints of a ``<databranch>``.
+        labels : list of str
+            The names of each data column.
+
+        Returns
+        -------
+        FlightDataTable
+            The table with the values of all the datapoints.
+        """
+        data = np.array(
+            [datapoint.text.split(",") for datapoint in datapoints], dtype=float
+        )
+        logger.info(
+            "Parsed %d datapoints with %d columns each", len(datapoints), len(labels)
+        )
+        return cls(data, labels)
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def __contains__(self, label):
+        return label in self.index
+
+    def __getitem__(self, label):
+        """Returns the column with the given label as a 1-D array."""
+        return self.data[:, self.index[label]]
+
+    @property
+    def time(self):
+        """The time vector of the simulation, in seconds. It is always the first
+        column of the data."""
+        return self.data[:, 0]
+
+    def slice(self, start=None, stop=None):
+        """Returns a new table holding only the rows between start and stop.
+        The underlying array is a view of the original one, so no data is
+        copied.
+        """
+        return FlightDataTable(self.data[start:stop], self.labels)
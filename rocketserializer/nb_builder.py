@@ -1,9 +1,13 @@
 import json
 import logging
 import os
+from functools import lru_cache
 
 import nbformat as nbf
 
+from .components.drag_curve import write_drag_curve, write_drag_tables
+from .components.motor import write_thrust_curve
+
 logger = logging.getLogger(__name__)
 
 
@@ -12,13 +16,41 @@ class NotebookBuilder:
     using rocketpy simulation on it
     """
 
-    def __init__(self, parameters_json: str) -> None:
-        """read the file and process the dictionary do not build anything yet"""
+    def __init__(
+        self,
+        parameters_json: str = None,
+        parameters: dict = None,
+        curves: dict = None,
+    ) -> None:
+        """read the file and process the dictionary do not build anything yet
+
+        Parameters
+        ----------
+        parameters_json : str, optional
+            Path to the parameters.json file. Not needed if the `parameters`
+            are given, in which case it is only mentioned in the notebook.
+        parameters : dict, optional
+            The settings generated by `ork_extractor`, used directly instead of
+            reading them from the parameters.json file. The keys are converted
+            to strings, as they would be in the parameters.json file.
+        curves : dict, optional
+            The "drag_curve" and "thrust_source" arrays of the conversion, and
+            optionally its "drag_tables". If given, they are saved to .csv
+            files next to the notebook when it is built, instead of using the
+            files of the settings.
+        """
+        if parameters_json is None and parameters is None:
+            raise ValueError("Either the parameters_json or parameters must be given.")
         self.parameters_json = parameters_json
+        self.curves = curves
         self.trapezoidal_fins_check = False
         self.elliptical_fins_check = False
-        self.__extract_output_folder_from_parameters_json()
-        self.read()
+        if parameters is None:
+            self.__extract_output_folder_from_parameters_json()
+            self.read()
+        else:
+            self.__output_folder = None
+            self.parameters = _stringify_keys(parameters)
         self.process()
 
     def __extract_output_folder_from_parameters_json(self):
@@ -35,7 +67,28 @@ class NotebookBuilder:
         # TODO: read the dict and search for any inconsistencies
         return self.parameters
 
-    def build(self, destination: str):
+    def save_curves(self, destination: str) -> None:
+        """Saves the curves given to the builder to the destination folder,
+        pointing the parameters to the new files."""
+        self.parameters = {
+            **self.parameters,
+            "rocket": {
+                **self.parameters["rocket"],
+                "drag_curve": write_drag_curve(self.curves["drag_curve"], destination),
+            },
+            "motors": {
+                **self.parameters["motors"],
+                "thrust_source": write_thrust_curve(
+                    self.curves["thrust_source"], destination
+                ),
+            },
+        }
+        if self.curves.get("drag_tables") is not None:
+            self.parameters["rocket"].update(
+                write_drag_tables(self.curves["drag_tables"], destination)
+            )
+
+    def build(self, destination: str, formatting: bool = True):
         if os.path.isdir(destination):
             self.__output_folder = destination
         else:
@@ -43,6 +96,8 @@ class NotebookBuilder:
                 f"Destination folder '{destination}' not found. Please create it "
                 "first or verify if it is really a folder."
             )
+        if self.curves is not None:
+            self.save_curves(destination)
 
         nb = nbf.v4.new_notebook()
         nb = self.build_header(nb)
@@ -52,7 +107,7 @@ class NotebookBuilder:
         nb = self.build_rocket(nb)
         nb = self.build_flight(nb)
         nb = self.build_compare_results(nb)
-        self.save_notebook(nb, destination)
+        self.save_notebook(nb, destination, formatting=formatting)
         logger.info(
             "[NOTEBOOK BUILDER] Notebook successfully built! You can find it at: %s",
             destination,
@@ -63,10 +118,16 @@ class NotebookBuilder:
         text = "# RocketPy Simulation\n"
         text += "This notebook was generated using Rocket-Serializer, a RocketPy"
         text += " tool to convert simulation files to RocketPy simulations\n"
-        text += (
-            "The notebook was generated using the following parameters file: "
-            + f"`{self.parameters_json}`\n"
-        )
+        if self.parameters_json is not None:
+            text += (
+                "The notebook was generated using the following parameters file: "
+                + f"`{self.parameters_json}`\n"
+            )
+        else:
+            text += (
+                "The notebook was generated from the following .ork file: "
+                + f"`{self.parameters['id']['filepath']}`\n"
+            )
 
         nb["cells"] = [nbf.v4.new_markdown_cell(text)]
         logger.info("[NOTEBOOK BUILDER] Header created")
@@ -194,8 +255,16 @@ class NotebookBuilder:
 
         self.build_all_aerodynamic_surfaces(nb)
 
+        # the power-on and power-off drag tables are used if they were saved
         drag_curve = self.parameters["rocket"]["drag_curve"]
-        drag_curve = os.path.relpath(drag_curve, self.__output_folder)
+        power_off_drag = os.path.relpath(
+            self.parameters["rocket"].get("power_off_drag") or drag_curve,
+            self.__output_folder,
+        )
+        power_on_drag = os.path.relpath(
+            self.parameters["rocket"].get("power_on_drag") or drag_curve,
+            self.__output_folder,
+        )
 
         # define the Rocket
         inertia_string = "[" + str(self.parameters["rocket"]["inertia"])[1:-1] + "]"
@@ -203,8 +272,8 @@ class NotebookBuilder:
         text += f"    radius={self.parameters['rocket']['radius']},\n"
         text += f"    mass={self.parameters['rocket']['mass']},\n"
         text += f"    inertia={inertia_string},\n"
-        text += f"    power_off_drag='{drag_curve}',\n"
-        text += f"    power_on_drag='{drag_curve}',\n"
+        text += f"    power_off_drag='{power_off_drag}',\n"
+        text += f"    power_on_drag='{power_on_drag}',\n"
         text += (
             "    center_of_mass_without_motor="
             + f"{self.parameters['rocket']['center_of_mass_without_propellant']},\n"
@@ -738,14 +807,64 @@ class NotebookBuilder:
         logger.info("[NOTEBOOK BUILDER] Compare Results section created.")
         return nb
 
-    def save_notebook(self, nb: nbf.v4.new_notebook, destination: str) -> None:
-        """Writes the .ipynb file to the destination folder. Also applies black
-        formatting to the file to improve readability."""
+    def save_notebook(
+        self, nb: nbf.v4.new_notebook, destination: str, formatting: bool = True
+    ) -> None:
+        """Writes the .ipynb file to the destination folder. If formatting is
+        True, the code cells are formatted with black (requires black[jupyter])
+        to improve readability before the notebook is written, in the same
+        process and with a single write."""
         out_file = os.path.join(destination, "simulation.ipynb")
 
+        if formatting:
+            nb = format_notebook(nb)
+
         nbf.write(nb, out_file)
         logger.info("[NOTEBOOK BUILDER] Notebook saved to '%s'", out_file)
 
-        # apply black formatting after saving (requires black[jupyter])
-        os.system(f"black {out_file}")
-        logger.info("[NOTEBOOK BUILDER] Black formatting applied to the final notebook")
+
+def format_notebook(nb: nbf.v4.new_notebook) -> nbf.v4.new_notebook:
+    """Formats the source of each code cell of the notebook with black, as
+    running black on the .ipynb file would do. The notebook is returned
+    unchanged if black is not installed."""
+    try:
+        # pylint: disable=import-outside-toplevel
+        import black
+        from black.handle_ipynb_magics import jupyter_dependencies_are_installed
+
+        if not jupyter_dependencies_are_installed(warn=False):
+            raise ImportError("black[jupyter] is not installed")
+    except ImportError:
+        logger.warning(
+            "[NOTEBOOK BUILDER] black[jupyter] is not installed, the notebook was not "
+            "formatted. Install it with: pip install black[jupyter]"
+        )
+        return nb
+
+    for cell in nb["cells"]:
+        if cell["cell_type"] == "code":
+            cell["source"] = _format_cell(black, cell["source"])
+    logger.info("[NOTEBOOK BUILDER] Black formatting applied to the notebook")
+    return nb
+
+
+@lru_cache(maxsize=1024)
+def _format_cell(black, source: str) -> str:
+    # most cells are the same across notebooks, so each one is formatted once
+    try:
+        return black.format_cell(source, fast=True, mode=black.Mode(is_ipynb=True))
+    except black.NothingChanged:
+        return source
+    except Exception as e:  # pylint: disable=broad-except
+        logger.warning("[NOTEBOOK BUILDER] Could not format a cell: %s", e)
+        return source
+
+
+def _stringify_keys(value):
+    """Returns a copy of the settings with the keys of every dictionary
+    converted to strings, like the parameters.json file."""
+    if isinstance(value, dict):
+        return {str(key): _stringify_keys(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_stringify_keys(item) for item in value]
+    return value
@@ -0,0 +1,162 @@
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from .profiler import count_java_calls, profile_stage
+
+logger = logging.getLogger(__name__)
+
+
+def find_ork_jar(ork_jar=None):
+    """Returns the path to the OpenRocket .jar file. If not given, any .jar
+    file in the current directory that starts with "OpenRocket" is used.
+
+    Raises
+    ------
+    ValueError
+        In case no OpenRocket .jar file is found.
+    """
+    if ork_jar:
+        return ork_jar
+
+    ork_jar = [
+        f for f in os.listdir() if f.startswith("OpenRocket") and f.endswith(".jar")
+    ]
+    if len(ork_jar) == 0:
+        raise ValueError(
+            "[ork2json] It was not possible to find the OpenRocket .jar file in "
+            "the current directory. Please specify the path to the .jar file."
+        )
+    ork_jar = ork_jar[0]
+    logger.info("[ork2json] Found OpenRocket .jar file: '%s'", Path(ork_jar).as_posix())
+    return ork_jar
+
+
+class OpenRocketSession:
+    """OpenRocket instance that is only started when a document is loaded.
+
+    Most conversions are resolved from the xml of the .ork file alone, so the
+    JVM is not started (nor the .jar file searched for) until `load_doc` is
+    called for the first time. Once started, the instance is reused for all the
+    following documents until the session is closed. A session can be shared
+    by many threads.
+
+    Examples
+    --------
+    >>> from rocketserializer.openrocket import OpenRocketSession
+    >>> with OpenRocketSession("OpenRocket-15.03.jar") as session:
+    ...     pass  # the JVM was never started
+    """
+
+    def __init__(self, ork_jar=None, log_level="OFF"):
+        """Creates the session, without starting OpenRocket.
+
+        Parameters
+        ----------
+        ork_jar : str, optional
+            The path to the OpenRocket .jar file. If unspecified, the .jar file
+            will be searched in the current directory when it is needed.
+        log_level : str, optional
+            The log level of OpenRocket. The options are: OFF, ERROR, WARN,
+            INFO, DEBUG, TRACE and ALL. Default is "OFF".
+        """
+        self.ork_jar = ork_jar
+        self.log_level = log_level
+        self._instance = None
+        self._helper = None
+        self._lock = threading.Lock()
+
+    @property
+    def started(self):
+        """Whether the OpenRocket instance is running."""
+        return self._helper is not None
+
+    def load_doc(self, filepath):
+        """Loads a .ork file in OpenRocket, starting it if needed.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the .ork file.
+
+        Returns
+        -------
+        net.sf.openrocket.document.OpenRocketDocument
+            The OpenRocket document.
+        """
+        with self._lock:
+            if not self.started:
+                self._start()
+            with profile_stage("load_doc"):
+                return self._helper.load_doc(str(filepath))
+
+    def _start(self):
+        # orhelper starts the JVM through JPype, only imported when needed
+        import orhelper  # pylint: disable=import-outside-toplevel
+
+        with profile_stage("openrocket_start"):
+            ork_jar = find_ork_jar(self.ork_jar)
+            logger.info("Starting OpenRocket from '%s'", Path(ork_jar).as_posix())
+            self._instance = orhelper.OpenRocketInstance(
+                ork_jar, log_level=self.log_level
+            )
+            self._helper = orhelper.Helper(self._instance.__enter__())
+
+    def close(self):
+        """Stops the OpenRocket instance, if it was started."""
+        with self._lock:
+            if self._instance is not None:
+                self._instance.__exit__(None, None, None)
+                logger.info("OpenRocket instance closed")
+            self._instance = None
+            self._helper = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class LazyDocument:
+    """OpenRocket document of a .ork file that is only loaded, starting the
+    session if needed, when one of its methods is first used."""
+
+    def __init__(self, session, filepath):
+        """
+        Parameters
+        ----------
+        session : OpenRocketSession
+            The session used to load the document.
+        filepath : str or bytes
+            Path to the .ork file, or the content of the file itself. In that
+            case, the content is only written to a temporary file if the
+            document is loaded, since OpenRocket can only read files.
+        """
+        self.session = session
+        self.filepath = filepath
+        self._document = None
+
+    @property
+    def loaded(self):
+        """Whether the document was loaded in OpenRocket."""
+        return self._document is not None
+
+    def __getattr__(self, name):
+        if self._document is None:
+            self._document = self._load()
+        # the calls to OpenRocket are counted if the conversion is profiled
+        return count_java_calls(getattr(self._document, name))
+
+    def _load(self):
+        if not isinstance(self.filepath, (bytes, bytearray)):
+            logger.info("Loading '%s' in OpenRocket", Path(self.filepath).as_posix())
+            return self.session.load_doc(self.filepath)
+
+        logger.info("Loading an in-memory .ork file in OpenRocket")
+        with tempfile.TemporaryDirectory(prefix="rocketserializer-") as folder:
+            filepath = Path(folder) / "rocket.ork"
+            filepath.write_bytes(self.filepath)
+            return self.session.load_doc(filepath)
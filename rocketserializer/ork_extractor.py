@@ -1,24 +1,54 @@
 import logging
 
-from ._helpers import _dict_to_string
-from .components.drag_curve import save_drag_curve
+import numpy as np
+
+from ._helpers import _lazy_dict_to_string
+from .components.component_tree import process_elements_position_from_xml
+from .components.design_index import DesignIndex
+from .components.drag_curve import (
+    DRAG_TABLE_FILES,
+    get_drag_curve,
+    get_drag_tables,
+    write_drag_curve,
+    write_drag_tables,
+)
+from .components.element_index import ElementIndex
 from .components.environment import search_environment
 from .components.fins import search_elliptical_fins, search_trapezoidal_fins
 from .components.flight import search_launch_conditions
+from .components.flight_events import search_flight_events
 from .components.id import search_id_info
-from .components.motor import __get_motor_mass, generate_thrust_curve, search_motor
+from .components.motor import (
+    __get_motor_mass,
+    get_thrust_curve,
+    search_motor,
+    write_thrust_curve,
+)
 from .components.nose_cone import search_nosecone
 from .components.open_rocket_wrangler import process_elements_position
 from .components.parachute import search_parachutes
 from .components.rail_buttons import search_rail_buttons
 from .components.rocket import search_rocket
+from .components.simulation import search_simulations
 from .components.stored_results import search_stored_results
 from .components.transition import search_transitions
+from .flight_data import FlightDataTable
+from .profiler import profile_stage
 
 logger = logging.getLogger(__name__)
 
 
-def ork_extractor(bs, filepath, output_folder, ork):
+def ork_extractor(
+    bs,
+    filepath,
+    output_folder,
+    ork,
+    flight_data=None,
+    curves=None,
+    simulations=None,
+    databranches=None,
+    drag_table_step=None,
+):
     """Generates the parameters.json file with the parameters for rocketpy
 
     Parameters
@@ -28,12 +58,36 @@ def ork_extractor(bs, filepath, output_folder, ork):
     filepath : str
         Path to the .ork file.
     output_folder : str
-        Path to the output folder.
+        Path to the output folder. If None, the drag and thrust curves are not
+        saved to .csv files, and their paths in the settings are None.
     ork : orhelper
-        An object representing the OpenRocket document.
-    verbose : bool, optional
-        Whether or not to print a message of successful execution, by default
-        False.
+        An object representing the OpenRocket document, e.g. a `LazyDocument`
+        that only starts OpenRocket when it is used. It is only needed when
+        the components can not be resolved from the xml, so it can be None for
+        most of the files.
+    flight_data : FlightDataTable, optional
+        The data of the first databranch of the .ork file, as returned by
+        `parse_ork_file`. If None, the data is read from the ``<datapoint>``
+        tags of the `bs` object.
+    curves : dict, optional
+        If given, this dictionary is filled with the arrays of the conversion:
+        "drag_curve" (mach, cd), "thrust_source" (time, thrust) and
+        "flight_data", the complete FlightDataTable of the simulation.
+    simulations : str or list, optional
+        If given, the simulations of the .ork file are also extracted one by
+        one, under the "simulations" key of the settings. Either "all" or a
+        list with the names (str) or indexes (int) of the simulations, see
+        `search_simulations`. The design is only processed once for all of
+        them. Default is None, in which case only the first simulation is used.
+    databranches : list of FlightDataTable, optional
+        The data of every databranch of the .ork file, as returned by
+        `parse_ork_file`, used to extract the `simulations`. If None, the data
+        is read from the ``<datapoint>`` tags of the `bs` object.
+    drag_table_step : float, optional
+        If given, the power-on and power-off drag tables are also built, with
+        Mach bins of this width, see `get_drag_tables`. Their paths are saved
+        to the "power_on_drag" and "power_off_drag" keys of the rocket, and
+        their arrays to the "drag_tables" of the `curves`. Default is None.
 
     Returns
     -------
@@ -41,54 +95,69 @@ def ork_extractor(bs, filepath, output_folder, ork):
         Dictionary with the parameters to be used in rocketpy simulations. The
         keys are: "id", "environment", "rocket", "nosecones", "trapezoidal_fins",
         "tails", "parachutes", "rail_buttons", "motors", "flight" and
-        "stored_results".
+        "stored_results". If `simulations` is given, the "simulations" key maps
+        the index of each simulation to its "name", "environment", "rocket",
+        "motors", "flight" and "stored_results", with its own curves saved to
+        the "drag_curve_<index>.csv" and "thrust_source_<index>.csv" files.
     """
     settings = {}
 
-    # Initialize some important vectors
-    datapoints, data_labels, time_vector = __init_vectors(bs)
+    # Index the tags of the design, traversed only once for all components
+    with profile_stage("index_design"):
+        bs = DesignIndex.of(bs)
+    logger.info("Indexed the design of the ORK file.")
+
+    # Initialize the flight data table, parsed only once for all components
+    with profile_stage("init_vectors"):
+        complete_flight_data, flight_data, events = __init_vectors(bs, flight_data)
     logger.info("Initialized data vectors from the ORK file.")
 
     # Retrieve the motor properties
-    motors = search_motor(bs, datapoints, data_labels)
-    _, _, burnout_position = __get_motor_mass(datapoints, data_labels)
+    with profile_stage("search_motor"):
+        motors = search_motor(bs, flight_data)
+        burnout_position = __get_burnout_position(flight_data, events)
     logger.info("Motor parameters retrieved.")
 
     # Get the first set of parameters
-    id_info = search_id_info(bs, filepath)
+    with profile_stage("search_id_info"):
+        id_info = search_id_info(bs, filepath)
     logger.info("Metadata parameters retrieved.")
 
-    environment = search_environment(bs)
+    with profile_stage("search_environment"):
+        environment = search_environment(bs)
     logger.info("Environment parameters retrieved.")
 
-    rocket, motor_position = search_rocket(
-        bs, datapoints, data_labels, burnout_position
-    )
+    with profile_stage("search_rocket"):
+        rocket, motor_position = search_rocket(bs, flight_data, burnout_position)
     motors["position"] = motor_position
     logger.info("Rocket parameters retrieved.")
 
-    flight = search_launch_conditions(bs)
+    with profile_stage("search_launch_conditions"):
+        flight = search_launch_conditions(bs)
     logger.info("Flight conditions retrieved.")
 
     # process different elements of the rocket
-    center_of_dry_mass = rocket["center_of_mass_without_propellant"]
-    rocket_mass = rocket["mass"]
     rocket_radius = rocket["radius"]
 
-    elements = process_elements_position(
-        ork.getRocket(), {}, center_of_dry_mass, rocket_mass, top_position=0
-    )
-    logger.info("The elements are:\n%s", _dict_to_string(elements, indent=23))
-
-    nosecones = search_nosecone(bs, elements, rocket_radius)
-    trapezoidal_fins = search_trapezoidal_fins(bs, elements)
-    elliptical_fins = search_elliptical_fins(bs, elements)
-    transitions = search_transitions(bs, elements, ork)
-    rail_buttons = search_rail_buttons(bs, elements)
-    parachutes = search_parachutes(bs)
-    stored_results = search_stored_results(
-        bs, datapoints, data_labels, time_vector, burnout_position
-    )
+    with profile_stage("process_elements_position"):
+        elements = __get_elements(bs, ork)
+        logger.info("The elements are:\n%s", _lazy_dict_to_string(elements, indent=23))
+        elements = ElementIndex(elements)
+
+    with profile_stage("search_nosecone"):
+        nosecones = search_nosecone(bs, elements, rocket_radius)
+    with profile_stage("search_trapezoidal_fins"):
+        trapezoidal_fins = search_trapezoidal_fins(bs, elements)
+    with profile_stage("search_elliptical_fins"):
+        elliptical_fins = search_elliptical_fins(bs, elements)
+    with profile_stage("search_transitions"):
+        transitions = search_transitions(bs, elements)
+    with profile_stage("search_rail_buttons"):
+        rail_buttons = search_rail_buttons(bs, elements)
+    with profile_stage("search_parachutes"):
+        parachutes = search_parachutes(bs)
+    with profile_stage("search_stored_results"):
+        stored_results = search_stored_results(bs, flight_data, burnout_position)
 
     # save everything to a dictionary
     settings["id"] = id_info
@@ -104,60 +173,224 @@ def ork_extractor(bs, filepath, output_folder, ork):
     settings["flight"] = flight
     settings["stored_results"] = stored_results
 
-    # get drag curves
-    settings["rocket"]["drag_curve"] = save_drag_curve(
-        datapoints, data_labels, output_folder
-    )
+    # get drag and thrust curves
+    with profile_stage("get_drag_curve"):
+        drag_curve = get_drag_curve(flight_data, events.get("apogee"))
     logger.info("Drag curve generated.")
-
-    # get thrust curve
-    thrust_path = generate_thrust_curve(
-        output_folder, datapoints, data_labels, time_vector
-    )
-    settings["motors"]["thrust_source"] = thrust_path
+    with profile_stage("get_thrust_curve"):
+        thrust_curve = get_thrust_curve(flight_data)
     logger.info("Thrust curve generated.")
 
+    drag_tables = None
+    if drag_table_step is not None:
+        with profile_stage("get_drag_tables"):
+            drag_tables = get_drag_tables(
+                flight_data, burnout_position, events.get("apogee"), drag_table_step
+            )
+        settings["rocket"].update(dict.fromkeys(DRAG_TABLE_FILES))
+        logger.info("Drag tables generated.")
+
+    settings["rocket"]["drag_curve"] = None
+    settings["motors"]["thrust_source"] = None
+    if output_folder is not None:
+        with profile_stage("write_drag_curve"):
+            settings["rocket"]["drag_curve"] = write_drag_curve(
+                drag_curve, output_folder
+            )
+        with profile_stage("write_thrust_curve"):
+            settings["motors"]["thrust_source"] = write_thrust_curve(
+                thrust_curve, output_folder
+            )
+        if drag_tables is not None:
+            with profile_stage("write_drag_tables"):
+                settings["rocket"].update(write_drag_tables(drag_tables, output_folder))
+    if curves is not None:
+        curves["drag_curve"] = drag_curve
+        curves["thrust_source"] = thrust_curve
+        curves["flight_data"] = complete_flight_data
+        if drag_tables is not None:
+            curves["drag_tables"] = drag_tables
+
+    if simulations is not None:
+        with profile_stage("search_simulations"):
+            found = search_simulations(bs, databranches, simulations)
+        settings["simulations"] = {}
+        if curves is not None:
+            curves["simulations"] = {}
+        for idx, name, simulation, simulation_data in found:
+            with profile_stage("extract_simulation"):
+                settings["simulations"][idx] = __extract_simulation(
+                    bs,
+                    idx,
+                    name,
+                    simulation,
+                    simulation_data,
+                    output_folder,
+                    curves,
+                    drag_table_step,
+                )
+        logger.info("Extracted %d simulations.", len(found))
+
     logger.info(
         "Extraction completed. A dictionary with all the parameters was generated."
     )
     logger.info(
-        "Dictionary with the parameters:\n%s", _dict_to_string(settings, indent=23)
+        "Dictionary with the parameters:\n%s", _lazy_dict_to_string(settings, indent=23)
     )
 
     return settings
 
 
-def __init_vectors(bs):
-    """Initializes the vectors with the data from the .ork file.
+def __init_vectors(bs, flight_data=None, databranch=None):
+    """Initializes the flight data table with the data from the .ork file.
 
     Parameters
     ----------
     bs : BeautifulSoup
         BeautifulSoup object of the .ork file.
+    flight_data : FlightDataTable, optional
+        The already parsed data of the first databranch. If None, it is built
+        from the ``<datapoint>`` tags of the `bs` object.
+    databranch : bs4.element.Tag, optional
+        The ``<databranch>`` tag of the `flight_data`, with its flight events.
+        Defaults to the first databranch of the .ork file.
 
     Returns
     -------
-    datapoints : list
-        The datapoints.
-    data_labels : list
-        The names of each data column.
-    time_vector : list
-        The time vector.
+    complete_flight_data : FlightDataTable
+        All the simulation data.
+    flight_data : FlightDataTable
+        The simulation data, filtered to start at the ignition.
+    events : dict
+        The rows of the filtered data where the flight events stored in the
+        .ork file happen, see `search_flight_events`.
     """
-    datapoints = bs.findAll("datapoint")
-    data_labels = bs.find("databranch").attrs["types"].split(",")
+    if databranch is None:
+        databranch = bs.find("databranch")
+    if flight_data is None:
+        datapoints = bs.findAll("datapoint")
+        data_labels = databranch.attrs["types"].split(",")
+        flight_data = FlightDataTable.from_datapoints(datapoints, data_labels)
 
-    time_vector = [float(datapoint.text.split(",")[0]) for datapoint in datapoints]
-    start_pos = 0
-    final_pos = len(time_vector) - 1
+    events = search_flight_events(databranch, flight_data)
 
     # Get the start position, the ignition time.
-    for idx, position in enumerate(time_vector):
-        if position == 0:
-            start_pos = idx
+    if "ignition" in events:
+        start_pos = events["ignition"]
+    else:
+        ignition = np.flatnonzero(flight_data.time == 0)
+        start_pos = ignition[-1] if len(ignition) > 0 else 0
+    final_pos = len(flight_data) - 1
 
     # Filter the datapoints to get only the ones after the ignition.
-    datapoints = datapoints[start_pos:final_pos]
-    time_vector = time_vector[start_pos:final_pos]
-    logger.info("Successfully initialized vectors with %d datapoints", len(datapoints))
-    return datapoints, data_labels, time_vector
+    filtered = flight_data.slice(start_pos, final_pos)
+    events = {
+        event: row - start_pos
+        for event, row in events.items()
+        if start_pos <= row < start_pos + len(filtered)
+    }
+    logger.info("Successfully initialized vectors with %d datapoints", len(filtered))
+    return flight_data, filtered, events
+
+
+def __get_burnout_position(flight_data, events):
+    """Returns the burnout position, from the burnout event if it is stored in
+    the .ork file, or else from the propellant mass."""
+    if "burnout" in events:
+        return events["burnout"]
+    _, _, burnout_position = __get_motor_mass(flight_data)
+    return burnout_position
+
+
+def __extract_simulation(
+    bs,
+    idx,
+    name,
+    simulation,
+    flight_data,
+    output_folder,
+    curves,
+    drag_table_step=None,
+):
+    """Extracts the settings that depend on the simulation, for one of the
+    simulations of the .ork file. See `ork_extractor`.
+
+    Returns
+    -------
+    dict
+        The "name", "environment", "rocket", "motors", "flight" and
+        "stored_results" of the simulation.
+    """
+    complete_flight_data, flight_data, events = __init_vectors(
+        bs, flight_data, simulation.find("databranch")
+    )
+    motors = search_motor(bs, flight_data)
+    burnout_position = __get_burnout_position(flight_data, events)
+    rocket, motors["position"] = search_rocket(bs, flight_data, burnout_position)
+
+    settings = {
+        "name": name,
+        "environment": search_environment(simulation),
+        "rocket": rocket,
+        "motors": motors,
+        "flight": search_launch_conditions(simulation),
+        "stored_results": search_stored_results(
+            bs, flight_data, burnout_position, simulation
+        ),
+    }
+
+    drag_curve = get_drag_curve(flight_data, events.get("apogee"))
+    thrust_curve = get_thrust_curve(flight_data)
+    drag_tables = None
+    if drag_table_step is not None:
+        drag_tables = get_drag_tables(
+            flight_data, burnout_position, events.get("apogee"), drag_table_step
+        )
+        rocket.update(dict.fromkeys(DRAG_TABLE_FILES))
+    rocket["drag_curve"] = None
+    motors["thrust_source"] = None
+    if output_folder is not None:
+        rocket["drag_curve"] = write_drag_curve(
+            drag_curve, output_folder, f"drag_curve_{idx}.csv"
+        )
+        motors["thrust_source"] = write_thrust_curve(
+            thrust_curve, output_folder, f"thrust_source_{idx}.csv"
+        )
+        if drag_tables is not None:
+            rocket.update(write_drag_tables(drag_tables, output_folder, f"_{idx}"))
+    if curves is not None:
+        curves["simulations"][idx] = {
+            "drag_curve": drag_curve,
+            "thrust_source": thrust_curve,
+            "flight_data": complete_flight_data,
+        }
+        if drag_tables is not None:
+            curves["simulations"][idx]["drag_tables"] = drag_tables
+    logger.info("Simulation %d ('%s') extracted.", idx, name)
+    return settings
+
+
+def __get_elements(bs, ork):
+    """Gets the position of the rocket components from the xml of the .ork
+    file, only falling back to the OpenRocket document when the xml is not
+    enough to resolve them.
+
+    Returns
+    -------
+    dict
+        The elements of the rocket, see `process_elements_position`.
+    """
+    try:
+        return process_elements_position_from_xml(bs)
+    except ValueError as e:
+        if ork is None:
+            raise ValueError(
+                f"The components could not be resolved from the xml ({e}) and "
+                "no OpenRocket document was given."
+            ) from e
+        logger.warning(
+            "The components could not be resolved from the xml (%s). "
+            "Using OpenRocket instead.",
+            e,
+        )
+    return process_elements_position(ork.getRocket(), {})
@@ -0,0 +1,222 @@
+import contextvars
+import json
+import logging
+import platform
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from .cache import serializer_version
+
+logger = logging.getLogger(__name__)
+
+_active_profiler = contextvars.ContextVar("active_profiler", default=None)
+
+
+class ConversionProfiler:
+    """Records the wall time, CPU time, peak memory and number of calls to
+    OpenRocket (through JPype) of each stage of a conversion.
+
+    While the profiler is active (inside a ``with`` block), the stages marked
+    with `profile_stage` along the conversion are recorded. Stages can be
+    nested, e.g. the start of OpenRocket happens inside the stage that first
+    needs it, and the measures of a stage include the ones of its sub stages.
+
+    Examples
+    --------
+    >>> from rocketserializer.cli import ork2json
+    >>> from rocketserializer.profiler import ConversionProfiler
+    >>> with ConversionProfiler() as profiler:  # doctest: +SKIP
+    ...     ork2json(["--filepath", "rocket.ork"], standalone_mode=False)
+    >>> profiler.save("profile.json")  # doctest: +SKIP
+    """
+
+    def __init__(self, trace_memory=True):
+        """
+        Parameters
+        ----------
+        trace_memory : bool, optional
+            If True, the peak memory of each stage is traced with tracemalloc,
+            which slows the conversion down. Default is True.
+        """
+        self.trace_memory = trace_memory
+        self.stages = []
+        self.java_calls = 0
+        self._stack = []
+        self._token = None
+        self._started_tracing = False
+
+    def __enter__(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._token = _active_profiler.set(self)
+        self._total = self._start_stage("total")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._end_stage(self._total)
+        _active_profiler.reset(self._token)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name):
+        """Context manager that records a stage of the conversion."""
+        stage = self._start_stage(name)
+        try:
+            yield stage
+        finally:
+            self._end_stage(stage)
+
+    def count_java_call(self):
+        for stage in self._stack:
+            stage["java_calls"] += 1
+        self.java_calls += 1
+
+    def report(self):
+        """Returns the measures of all the stages, in the order they started.
+
+        Returns
+        -------
+        dict
+            The report, with the "total" measures of the conversion and the
+            list of "stages". Each stage has the "name", "depth", "wall_time"
+            and "cpu_time" (in seconds), "peak_memory" (in bytes, None if the
+            memory was not traced) and "java_calls" keys.
+        """
+        stages = [dict(stage) for stage in self.stages]
+        for stage in stages:
+            for key in ["_wall", "_cpu", "_peak"]:
+                stage.pop(key, None)
+        total = next(stage for stage in stages if stage["name"] == "total")
+        return {
+            "rocketserializer_version": serializer_version(),
+            "python_version": platform.python_version(),
+            "total": total,
+            "stages": [stage for stage in stages if stage is not total],
+        }
+
+    def save(self, path):
+        """Saves the report to a json file."""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.report(), file, indent=4)
+
+    def _start_stage(self, name):
+        if self._stack and self.trace_memory:
+            # keeps the peak of the outer stage before resetting it
+            peak = tracemalloc.get_traced_memory()[1]
+            for outer in self._stack:
+                outer["_peak"] = max(outer["_peak"], peak)
+        stage = {
+            "name": name,
+            "depth": len(self._stack),
+            "wall_time": None,
+            "cpu_time": None,
+            "peak_memory": None,
+            "java_calls": 0,
+            "_peak": 0,
+        }
+        self.stages.append(stage)
+        self._stack.append(stage)
+        if self.trace_memory:
+            _reset_peak()
+        stage["_wall"] = time.perf_counter()
+        stage["_cpu"] = time.process_time()
+        return stage
+
+    def _end_stage(self, stage):
+        stage["wall_time"] = time.perf_counter() - stage["_wall"]
+        stage["cpu_time"] = time.process_time() - stage["_cpu"]
+        self._stack.pop()
+        if self.trace_memory:
+            stage["peak_memory"] = max(
+                stage["_peak"], tracemalloc.get_traced_memory()[1]
+            )
+            for outer in self._stack:
+                outer["_peak"] = max(outer["_peak"], stage["peak_memory"])
+
+
+def _reset_peak():
+    # tracemalloc.reset_peak is only available from Python 3.9 on
+    reset_peak = getattr(tracemalloc, "reset_peak", None)
+    if reset_peak is not None:
+        reset_peak()
+
+
+@contextmanager
+def profile_stage(name):
+    """Marks a stage of the conversion, recorded by the active
+    ConversionProfiler. Does nothing if no profiler is active."""
+    profiler = _active_profiler.get()
+    if profiler is None:
+        yield
+        return
+    with profiler.stage(name):
+        yield
+
+
+def count_java_calls(value):
+    """Wraps an OpenRocket (Java) object so that the calls to its methods, and
+    to the objects they return, are counted by the active ConversionProfiler.
+    Returns the value itself if no profiler is active."""
+    profiler = _active_profiler.get()
+    if profiler is None:
+        return value
+    return _wrap(value, profiler)
+
+
+def _wrap(value, profiler):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return _JavaCallCounter(value, profiler)
+
+
+class _JavaCallCounter:
+    """Proxy of a Java object that counts the calls to its methods."""
+
+    __slots__ = ("_value", "_profiler")
+
+    def __init__(self, value, profiler):
+        self._value = value
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        attribute = getattr(self._value, name)
+        if not callable(attribute):
+            return _wrap(attribute, self._profiler)
+
+        def call(*args, **kwargs):
+            self._profiler.count_java_call()
+            return _wrap(attribute(*args, **kwargs), self._profiler)
+
+        return call
+
+    def __call__(self, *args, **kwargs):
+        self._profiler.count_java_call()
+        return _wrap(self._value(*args, **kwargs), self._profiler)
+
+    def __iter__(self):
+        for item in self._value:
+            yield _wrap(item, self._profiler)
+
+    def __len__(self):
+        return len(self._value)
+
+    def __eq__(self, other):
+        if isinstance(other, _JavaCallCounter):
+            other = other._value
+        return self._value == other
+
+    def __hash__(self):
+        return hash(self._value)
+
+    def __str__(self):
+        return str(self._value)
+
+    def __float__(self):
+        return float(self._value)
+
+    def __int__(self):
+        return int(self._value)
@@ -0,0 +1,305 @@
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import tempfile
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from .cache import is_in_folder, iter_strings, relocate
+from .components.drag_curve import DRAG_CURVE_FILE
+from .components.motor import THRUST_CURVE_FILE
+from .converter import convert, convert_cached
+from .openrocket import OpenRocketSession
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+MAX_UPLOAD_SIZE = 64 * 1024**2  # bytes
+
+
+class ConversionServer:
+    """Long-lived conversion service answering requests over localhost HTTP or
+    a Unix socket.
+
+    The imports and the OpenRocket session are kept in memory between requests,
+    so each conversion only pays for the extraction itself. The OpenRocket
+    instance is still only started by the first file that needs it. Requests
+    are put in a bounded queue and converted concurrently by a fixed number of
+    worker threads; when the queue is full, new requests are refused with the
+    503 status instead of piling up.
+
+    The API has two endpoints:
+
+    - ``GET /health``: the status of the server, as json.
+    - ``POST /convert?name=rocket.ork``: the body is the content of the .ork
+      file (xml or zip). The response is a json object with the "settings"
+      generated by `ork_extractor` and the "files" dictionary, which maps the
+      name of each generated file (e.g. drag_curve.csv) to its content. The
+      paths to these files in the settings are replaced by their names.
+
+    Examples
+    --------
+    >>> from rocketserializer.server import ConversionServer
+    >>> server = ConversionServer(port=8765)  # doctest: +SKIP
+    >>> server.serve_forever()  # doctest: +SKIP
+
+    And then, from a shell:
+
+    >>> curl --data-binary @rocket.ork localhost:8765/convert  # doctest: +SKIP
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=DEFAULT_PORT,
+        socket_path=None,
+        ork_jar=None,
+        workers=2,
+        queue_size=16,
+        cache=None,
+        timeout=300,
+    ):
+        """Creates the server and starts its worker threads.
+
+        Parameters
+        ----------
+        host : str, optional
+            The address to listen on. Default is "127.0.0.1".
+        port : int, optional
+            The TCP port to listen on. Use 0 to pick a free port. Default is
+            8765.
+        socket_path : str, optional
+            If given, the server listens on this Unix socket instead of TCP.
+        ork_jar : str, optional
+            The path to the OpenRocket .jar file, only needed for the files
+            that can not be resolved from their xml.
+        workers : int, optional
+            Number of conversions running at the same time. Default is 2.
+        queue_size : int, optional
+            Maximum number of conversions waiting for a worker. Default is 16.
+        cache : ConversionCache, optional
+            If given, the conversions are saved to and restored from this
+            cache.
+        timeout : float, optional
+            Maximum time, in seconds, a request waits for its conversion.
+            Default is 300.
+        """
+        self.session = OpenRocketSession(ork_jar, log_level="OFF")
+        self.cache = cache
+        self.timeout = timeout
+        self.jobs = queue.Queue(maxsize=queue_size)
+        self.workers = [
+            threading.Thread(target=self._work, name=f"converter-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            self.httpd = _UnixHTTPServer(socket_path, _ConversionHandler)
+        else:
+            self.httpd = ThreadingHTTPServer((host, port), _ConversionHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.conversion_server = self
+        self.socket_path = socket_path
+
+    @property
+    def address(self):
+        """The address the server is listening on."""
+        return self.httpd.server_address
+
+    def submit(self, data, name="rocket.ork"):
+        """Queues the conversion of a .ork file.
+
+        Parameters
+        ----------
+        data : bytes
+            The content of the .ork file.
+        name : str, optional
+            The name of the .ork file. Default is "rocket.ork".
+
+        Returns
+        -------
+        concurrent.futures.Future
+            The future result of `convert`.
+
+        Raises
+        ------
+        queue.Full
+            In case the queue of conversions is full.
+        """
+        future = Future()
+        self.jobs.put_nowait((future, data, name))
+        return future
+
+    def convert(self, data, name="rocket.ork"):
+        """Converts a .ork file in memory or, if the server has a cache, in a
+        temporary folder.
+
+        Parameters
+        ----------
+        data : bytes
+            The content of the .ork file.
+        name : str, optional
+            The name of the .ork file. Default is "rocket.ork".
+
+        Returns
+        -------
+        dict
+            The "settings" and "files" of the conversion, see the class
+            documentation.
+        """
+        name = Path(name).name or "rocket.ork"
+        if self.cache is None:
+            result = convert(data, name=name, session=self.session)
+            settings = result.settings
+            settings["rocket"]["drag_curve"] = DRAG_CURVE_FILE
+            settings["motors"]["thrust_source"] = THRUST_CURVE_FILE
+            return {"settings": settings, "files": result.csv_files()}
+
+        # the cache restores and saves the files of the conversions
+        with tempfile.TemporaryDirectory(prefix="rocketserializer-") as folder:
+            filepath = Path(folder) / name
+            output = Path(folder) / "output"
+            filepath.write_bytes(data)
+            settings = convert_cached(
+                filepath, output, cache=self.cache, session=self.session
+            )
+
+            artifacts = sorted(
+                Path(value).name
+                for value in iter_strings(settings)
+                if is_in_folder(value, output) and os.path.isfile(value)
+            )
+            files = {}
+            for artifact in artifacts:
+                with open(output / artifact, "r", encoding="utf-8") as file:
+                    files[artifact] = file.read()
+        settings = relocate(settings, output, "", artifacts)
+        settings["id"]["filepath"] = name
+        return {"settings": settings, "files": files}
+
+    def serve_forever(self):
+        """Answers requests until `shutdown` is called."""
+        logger.info("Conversion server listening on %s", self.address)
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.close()
+
+    def shutdown(self):
+        """Stops `serve_forever`. Must be called from another thread."""
+        self.httpd.shutdown()
+
+    def close(self):
+        """Stops the workers, the OpenRocket instance and releases the socket."""
+        for _ in self.workers:
+            self.jobs.put(None)
+        for worker in self.workers:
+            worker.join()
+        self.workers = []
+        self.httpd.server_close()
+        self.session.close()
+        if self.socket_path and os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        logger.info("Conversion server closed")
+
+    def _work(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            future, data, name = job
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(self.convert(data, name))
+                except Exception as e:  # pylint: disable=broad-except
+                    future.set_exception(e)
+
+
+class _ConversionHandler(BaseHTTPRequestHandler):
+    server_version = "rocketserializer"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        server = self.server.conversion_server
+        if urlparse(self.path).path != "/health":
+            self._send_json(404, {"error": "Not found."})
+            return
+        self._send_json(
+            200,
+            {
+                "status": "ok",
+                "queued": server.jobs.qsize(),
+                "openrocket_started": server.session.started,
+            },
+        )
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        server = self.server.conversion_server
+        url = urlparse(self.path)
+        if url.path != "/convert":
+            self._send_json(404, {"error": "Not found."})
+            return
+
+        size = int(self.headers.get("Content-Length") or 0)
+        if size == 0:
+            self._send_json(400, {"error": "The body must be the .ork file."})
+            return
+        if size > MAX_UPLOAD_SIZE:
+            self._send_json(413, {"error": "The .ork file is too large."})
+            return
+        data = self.rfile.read(size)
+        name = parse_qs(url.query).get("name", ["rocket.ork"])[0]
+
+        try:
+            future = server.submit(data, name)
+        except queue.Full:
+            self._send_json(503, {"error": "The server is busy, try again later."})
+            return
+
+        try:
+            result = future.result(timeout=server.timeout)
+        except FutureTimeoutError:
+            self._send_json(504, {"error": "The conversion took too long."})
+            return
+        except (ValueError, FileNotFoundError) as e:
+            self._send_json(422, {"error": str(e)})
+            return
+        except Exception as e:  # pylint: disable=broad-except
+            logger.error("Failed to convert '%s': %s", name, e, exc_info=True)
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        self._send_json(200, result)
+
+    def _send_json(self, status, content):
+        body = json.dumps(content, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # the client address of a Unix socket is an empty string
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        logger.info("%s - %s", self.address_string(), format % args)
+
+
+class _UnixHTTPServer(ThreadingHTTPServer):
+    address_family = socket.AF_UNIX
+
+    def server_bind(self):
+        socketserver.TCPServer.server_bind(self)
+        self.server_name = "localhost"
+        self.server_port = 0
@@ -0,0 +1,469 @@
+"""Generates synthetic .ork files, to test and benchmark the extractor with
+designs and simulations far larger than the ones of the examples."""
+
+import io
+import logging
+import uuid
+import zipfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# the columns of the generated databranches, as named by OpenRocket
+FLIGHT_DATA_LABELS = [
+    "Time",
+    "Altitude",
+    "Vertical velocity",
+    "Vertical acceleration",
+    "Total velocity",
+    "Mass",
+    "Motor mass",
+    "Longitudinal moment of inertia",
+    "Rotational moment of inertia",
+    "CP location",
+    "CG location",
+    "Stability margin calibers",
+    "Mach number",
+    "Thrust",
+    "Drag coefficient",
+    "Axial drag coefficient",
+]
+
+# dimensions of the generated rocket, in meters
+RADIUS = 0.05
+NOSE_LENGTH = 0.4
+TUBE_LENGTH = 0.5
+TAIL_LENGTH = 0.1
+MOTOR_LENGTH = 0.4
+MOTOR_DIAMETER = 0.054
+
+# mass and motor properties, in SI units
+DRY_MASS = 10.0
+MOTOR_DRY_MASS = 1.0
+PROPELLANT_MASS = 2.0
+THRUST = 1500.0
+BURN_TIME = 3.0
+DESCENT_VELOCITY = 20.0
+GRAVITY = 9.81
+SPEED_OF_SOUND = 340.0
+
+# number of datapoints written to the file at once
+CHUNK_SIZE = 100_000
+
+
+def generate_ork(
+    path,
+    stages=1,
+    body_tubes=2,
+    fin_sets=1,
+    parachutes=1,
+    rail_buttons=2,
+    simulations=1,
+    datapoints=1000,
+    compressed=False,
+):
+    """Writes a synthetic .ork file, with the same tags that OpenRocket writes
+    and the searchers of `rocketserializer.components` read.
+
+    The rocket has a nose cone, the body tubes of each stage and a tail. The
+    fin sets of each stage are attached to its last body tube, while the
+    parachutes are in the first body tube of the rocket and the rail buttons
+    (launch lugs) and the motor mount in the last one. Every simulation has a
+    single databranch with a vertical flight: a powered ascent, a coast to
+    apogee and a descent under parachute. The datapoints are generated and
+    written in chunks, so millions of them can be written with little memory.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path of the .ork file to be written.
+    stages : int, optional
+        Number of stages of the rocket. Default is 1.
+    body_tubes : int, optional
+        Number of body tubes of each stage. Default is 2.
+    fin_sets : int, optional
+        Number of trapezoidal fin sets of each stage. Default is 1.
+    parachutes : int, optional
+        Number of parachutes of the rocket. Default is 1.
+    rail_buttons : int, optional
+        Number of rail buttons of the rocket. Default is 2.
+    simulations : int, optional
+        Number of simulations of the file. Default is 1.
+    datapoints : int, optional
+        Number of datapoints of each simulation, at least 2. Default is 1000.
+    compressed : bool, optional
+        If True, the .ork file is a zip archive with a "rocket.ork" member,
+        as OpenRocket saves them. Otherwise it is plain xml. Default is False.
+
+    Returns
+    -------
+    Path
+        The path to the .ork file.
+
+    Examples
+    --------
+    >>> from rocketserializer.synthetic import generate_ork
+    >>> path = generate_ork("large.ork", stages=3, datapoints=1_000_000)
+    ... # doctest: +SKIP
+    """
+    if stages < 1 or body_tubes < 1:
+        raise ValueError("The rocket needs at least one stage and one body tube.")
+    if datapoints < 2:
+        raise ValueError("Each simulation needs at least 2 datapoints.")
+
+    path = Path(path)
+    ids = (str(uuid.UUID(int=idx)) for idx in range(1, 2**31))
+    design = _rocket_xml(ids, stages, body_tubes, fin_sets, parachutes, rail_buttons)
+    length = NOSE_LENGTH + stages * body_tubes * TUBE_LENGTH + TAIL_LENGTH
+
+    if compressed:
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+            with archive.open("rocket.ork", "w") as member:
+                _write_document(member, design, length, simulations, datapoints)
+    else:
+        with open(path, "wb") as file:
+            _write_document(file, design, length, simulations, datapoints)
+
+    logger.info(
+        "Synthetic .ork file with %d simulations of %d datapoints saved to: '%s'",
+        simulations,
+        datapoints,
+        path.as_posix(),
+    )
+    return path
+
+
+def flight_profile(time, length):
+    """Computes the data of the synthetic flight at the given times.
+
+    Parameters
+    ----------
+    time : numpy.ndarray
+        The times, in seconds.
+    length : float
+        The length of the rocket, in meters.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array with one row per time and one column per label of
+        `FLIGHT_DATA_LABELS`.
+    """
+    events = flight_events()
+    mass_rate = PROPELLANT_MASS / BURN_TIME
+    exhaust_velocity = THRUST / mass_rate
+    initial_mass = DRY_MASS + PROPELLANT_MASS
+
+    burning = time < BURN_TIME
+    propellant = PROPELLANT_MASS * np.clip(1 - time / BURN_TIME, 0, 1)
+    mass = DRY_MASS + propellant
+
+    # powered ascent, from the rocket equation without drag
+    burn_time = np.minimum(time, BURN_TIME)
+    remaining = initial_mass - mass_rate * burn_time
+    powered_velocity = (
+        exhaust_velocity * np.log(initial_mass / remaining) - GRAVITY * burn_time
+    )
+    powered_altitude = (
+        exhaust_velocity
+        / mass_rate
+        * (remaining * np.log(remaining / initial_mass) - remaining + initial_mass)
+        - GRAVITY * burn_time**2 / 2
+    )
+
+    # coast to apogee and descent under parachute
+    burnout_velocity, burnout_altitude = _burnout_state()
+    coast = time - BURN_TIME
+    descent = time - events["apogee"]
+    velocity = np.where(
+        burning,
+        powered_velocity,
+        np.where(descent < 0, burnout_velocity - GRAVITY * coast, -DESCENT_VELOCITY),
+    )
+    altitude = np.where(
+        burning,
+        powered_altitude,
+        np.where(
+            descent < 0,
+            burnout_altitude + burnout_velocity * coast - GRAVITY * coast**2 / 2,
+            _apogee_altitude() - DESCENT_VELOCITY * descent,
+        ),
+    )
+    acceleration = np.where(
+        burning, THRUST / mass - GRAVITY, np.where(descent < 0, -GRAVITY, 0.0)
+    )
+
+    mach = np.abs(velocity) / SPEED_OF_SOUND
+    drag_coefficient = 0.35 + 0.15 * np.exp(-((mach - 1) ** 2) / 0.05)
+    # three calibers behind the center of mass without propellant
+    center_of_pressure = np.full_like(time, 0.55 * length + 6 * RADIUS)
+    center_of_mass = (
+        DRY_MASS * 0.55 * length + propellant * (length - MOTOR_LENGTH / 2)
+    ) / mass
+
+    return np.column_stack(
+        [
+            time,
+            altitude,
+            velocity,
+            acceleration,
+            np.abs(velocity),
+            mass,
+            MOTOR_DRY_MASS + propellant,
+            mass * length**2 / 12,
+            mass * RADIUS**2 / 2,
+            center_of_pressure,
+            center_of_mass,
+            (center_of_pressure - center_of_mass) / (2 * RADIUS),
+            mach,
+            np.where(burning, THRUST, 0.0),
+            drag_coefficient,
+            drag_coefficient,
+        ]
+    )
+
+
+def flight_events():
+    """Returns the time of the events of the synthetic flight, in seconds."""
+    burnout_velocity, _ = _burnout_state()
+    apogee = BURN_TIME + burnout_velocity / GRAVITY
+    ground_hit = apogee + _apogee_altitude() / DESCENT_VELOCITY
+    return {
+        "launch": 0.0,
+        "ignition": 0.0,
+        "burnout": BURN_TIME,
+        "apogee": apogee,
+        "recoverydevicedeployment": apogee,
+        "groundhit": ground_hit,
+        "simulationend": ground_hit,
+    }
+
+
+def _burnout_state():
+    """Returns the velocity and altitude of the rocket at the burnout."""
+    mass_rate = PROPELLANT_MASS / BURN_TIME
+    exhaust_velocity = THRUST / mass_rate
+    initial_mass = DRY_MASS + PROPELLANT_MASS
+    velocity = exhaust_velocity * np.log(initial_mass / DRY_MASS) - GRAVITY * BURN_TIME
+    altitude = (
+        exhaust_velocity
+        / mass_rate
+        * (DRY_MASS * np.log(DRY_MASS / initial_mass) - DRY_MASS + initial_mass)
+        - GRAVITY * BURN_TIME**2 / 2
+    )
+    return float(velocity), float(altitude)
+
+
+def _apogee_altitude():
+    velocity, altitude = _burnout_state()
+    return altitude + velocity**2 / (2 * GRAVITY)
+
+
+def _write_document(binary_file, design, length, simulations, datapoints):
+    with io.TextIOWrapper(binary_file, encoding="utf-8") as file:
+        file.write("<?xml version='1.0' encoding='utf-8'?>\n")
+        file.write('<openrocket version="1.9" creator="rocketserializer">\n')
+        file.write(design)
+        file.write("  <simulations>\n")
+        for index in range(simulations):
+            _write_simulation(file, index, length, datapoints)
+        file.write("  </simulations>\n</openrocket>\n")
+
+
+def _write_simulation(file, index, length, datapoints):
+    events = flight_events()
+    apogee = _apogee_altitude()
+    burnout_velocity, _ = _burnout_state()
+    time = np.linspace(0, events["groundhit"], datapoints)
+
+    file.write(f"""    <simulation status="uptodate">
+      <name>Simulation {index + 1}</name>
+      <simulator>RK4Simulator</simulator>
+      <calculator>BarrowmanCalculator</calculator>
+      <conditions>
+        <launchrodlength>1.0</launchrodlength>
+        <launchrodangle>0.0</launchrodangle>
+        <launchroddirection>90.0</launchroddirection>
+        <windaverage>{2.0 + index}</windaverage>
+        <windturbulence>0.1</windturbulence>
+        <launchaltitude>0.0</launchaltitude>
+        <launchlatitude>28.61</launchlatitude>
+        <launchlongitude>-80.6</launchlongitude>
+        <geodeticmethod>spherical</geodeticmethod>
+        <atmosphere model="isa"/>
+        <timestep>0.05</timestep>
+      </conditions>
+      <flightdata maxaltitude="{apogee:.3f}" maxvelocity="{burnout_velocity:.3f}" \
+maxacceleration="{THRUST / DRY_MASS - GRAVITY:.3f}" \
+maxmach="{burnout_velocity / SPEED_OF_SOUND:.3f}" timetoapogee="{events['apogee']:.3f}" \
+flighttime="{events['groundhit']:.3f}" groundhitvelocity="{DESCENT_VELOCITY:.3f}" \
+launchrodvelocity="20.0">
+        <databranch name="Stage 1" types="{','.join(FLIGHT_DATA_LABELS)}">
+""")
+    for event, event_time in events.items():
+        file.write(f'          <event time="{event_time:.4f}" type="{event}"/>\n')
+
+    row = ",".join(["%.6g"] * len(FLIGHT_DATA_LABELS))
+    for start in range(0, datapoints, CHUNK_SIZE):
+        data = flight_profile(time[start : start + CHUNK_SIZE], length)
+        np.savetxt(file, data, fmt=f"          <datapoint>{row}</datapoint>")
+    file.write("        </databranch>\n      </flightdata>\n    </simulation>\n")
+
+
+def _rocket_xml(ids, stages, body_tubes, fin_sets, parachutes, rail_buttons):
+    parts = [
+        "  <rocket>\n",
+        "    <name>Synthetic Rocket</name>\n",
+        f"    <id>{next(ids)}</id>\n",
+        "    <comment>Generated by rocketserializer.synthetic</comment>\n",
+        "    <designer>rocketserializer</designer>\n",
+        "    <subcomponents>\n",
+    ]
+    for stage in range(stages):
+        parts.append(f"      <stage>\n        <name>Stage {stage + 1}</name>\n")
+        parts.append(f"        <id>{next(ids)}</id>\n        <subcomponents>\n")
+        if stage == 0:
+            parts.append(_nosecone_xml(ids))
+        for tube in range(body_tubes):
+            children = []
+            if stage == 0 and tube == 0:
+                children += [_parachute_xml(ids, idx) for idx in range(parachutes)]
+            if tube == body_tubes - 1:
+                children += [
+                    _fin_set_xml(ids, f"Fin Set {stage + 1}.{idx + 1}", idx)
+                    for idx in range(fin_sets)
+                ]
+            last = stage == stages - 1 and tube == body_tubes - 1
+            if last:
+                children += [
+                    _rail_button_xml(ids, idx, rail_buttons)
+                    for idx in range(rail_buttons)
+                ]
+            first = stage == 0 and tube == 0
+            parts.append(
+                _body_tube_xml(
+                    ids, f"Body Tube {stage + 1}.{tube + 1}", first, last, children
+                )
+            )
+        if stage == stages - 1:
+            parts.append(_tail_xml(ids))
+        parts.append("        </subcomponents>\n      </stage>\n")
+    parts.append("    </subcomponents>\n  </rocket>\n")
+    return "".join(parts)
+
+
+def _nosecone_xml(ids):
+    return f"""          <nosecone>
+            <name>Nose Cone</name>
+            <id>{next(ids)}</id>
+            <length>{NOSE_LENGTH}</length>
+            <thickness>0.002</thickness>
+            <shape>ogive</shape>
+            <shapeparameter>1.0</shapeparameter>
+            <aftradius>{RADIUS}</aftradius>
+          </nosecone>
+"""
+
+
+def _tail_xml(ids):
+    return f"""          <transition>
+            <name>Tail</name>
+            <id>{next(ids)}</id>
+            <length>{TAIL_LENGTH}</length>
+            <thickness>0.002</thickness>
+            <shape>conical</shape>
+            <foreradius>auto {RADIUS}</foreradius>
+            <aftradius>{0.8 * RADIUS}</aftradius>
+          </transition>
+"""
+
+
+def _body_tube_xml(ids, name, first, last, children):
+    radius = RADIUS if first else f"auto {RADIUS}"
+    motor_mount = (
+        f"""            <motormount>
+              <ignitionevent>automatic</ignitionevent>
+              <ignitiondelay>0.0</ignitiondelay>
+              <overhang>0.0</overhang>
+              <motor>
+                <type>reload</type>
+                <manufacturer>Synthetic</manufacturer>
+                <designation>M{THRUST:.0f}</designation>
+                <diameter>{MOTOR_DIAMETER}</diameter>
+                <length>{MOTOR_LENGTH}</length>
+                <delay>none</delay>
+              </motor>
+            </motormount>
+"""
+        if last
+        else ""
+    )
+    subcomponents = (
+        "            <subcomponents>\n"
+        + "".join(children)
+        + "            </subcomponents>\n"
+        if children
+        else ""
+    )
+    return f"""          <bodytube>
+            <name>{escape(name)}</name>
+            <id>{next(ids)}</id>
+            <length>{TUBE_LENGTH}</length>
+            <thickness>0.002</thickness>
+            <radius>{radius}</radius>
+{motor_mount}{subcomponents}          </bodytube>
+"""
+
+
+def _fin_set_xml(ids, name, index):
+    return f"""              <trapezoidfinset>
+                <name>{escape(name)}</name>
+                <id>{next(ids)}</id>
+                <fincount>{3 + index % 2}</fincount>
+                <axialoffset method="bottom">{-0.16 * index:.2f}</axialoffset>
+                <position type="bottom">{-0.16 * index:.2f}</position>
+                <thickness>0.003</thickness>
+                <crosssection>airfoil</crosssection>
+                <cant>0.0</cant>
+                <rootchord>0.15</rootchord>
+                <tipchord>0.08</tipchord>
+                <sweeplength>0.05</sweeplength>
+                <height>0.1</height>
+              </trapezoidfinset>
+"""
+
+
+def _parachute_xml(ids, index):
+    deploy_event = "apogee" if index % 2 == 0 else "altitude"
+    return f"""              <parachute>
+                <name>Parachute {index + 1}</name>
+                <id>{next(ids)}</id>
+                <axialoffset method="top">0.0</axialoffset>
+                <position type="top">0.0</position>
+                <packedlength>0.05</packedlength>
+                <packedradius>0.02</packedradius>
+                <cd>0.8</cd>
+                <deployevent>{deploy_event}</deployevent>
+                <deployaltitude>{200.0 + 100.0 * index}</deployaltitude>
+                <deploydelay>{0.5 * index}</deploydelay>
+                <diameter>{1.0 + 0.2 * index:.1f}</diameter>
+              </parachute>
+"""
+
+
+def _rail_button_xml(ids, index, count):
+    # evenly spaced along the last body tube, from the top to the bottom
+    offset = TUBE_LENGTH * (index + 1) / (count + 1)
+    return f"""              <launchlug>
+                <name>Rail Button {index + 1}</name>
+                <id>{next(ids)}</id>
+                <axialoffset method="top">{offset:.4f}</axialoffset>
+                <position type="top">{offset:.4f}</position>
+                <radialdirection>45.0</radialdirection>
+                <length>0.02</length>
+                <radius>0.005</radius>
+              </launchlug>
+"""
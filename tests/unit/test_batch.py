@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from rocketserializer.cli import (
+    _batch_output_folders,
+    _expand_ork_paths,
+    ork2json_batch,
+)
+
+EXAMPLES = Path("examples")
+
+
+def test_expand_ork_paths(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "rocket.ork").write_text("")
+    (tmp_path / "b.ork").write_text("")
+    (tmp_path / "notes.txt").write_text("")
+
+    paths = _expand_ork_paths(
+        [str(tmp_path), str(tmp_path / "*.ork"), str(tmp_path / "missing.ork")]
+    )
+
+    assert paths == [
+        tmp_path / "a" / "rocket.ork",
+        tmp_path / "b.ork",
+        tmp_path / "missing.ork",
+    ]
+
+
+def test_batch_output_folders(tmp_path):
+    filepaths = [tmp_path / "TeamA" / "rocket.ork", tmp_path / "TeamB" / "v2.ork"]
+
+    assert _batch_output_folders(filepaths) == [
+        tmp_path / "TeamA",
+        tmp_path / "TeamB",
+    ]
+    assert _batch_output_folders(filepaths, "out") == [
+        Path("out") / "TeamA" / "rocket",
+        Path("out") / "TeamB" / "v2",
+    ]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_batch_reports_each_file(tmp_path, workers):
+    broken = tmp_path / "broken.ork"
+    broken.write_text("not an ork file")
+
+    result = CliRunner().invoke(
+        ork2json_batch,
+        [
+            "--filepath",
+            str(EXAMPLES),
+            "--filepath",
+            str(broken),
+            "--output",
+            str(tmp_path / "output"),
+            "--workers",
+            str(workers),
+            "--no-cache",
+        ],
+    )
+
+    examples = sorted(EXAMPLES.rglob("*.ork"))
+    assert result.exit_code == 1
+    assert f"{len(examples)} of {len(examples) + 1} files converted" in result.output
+    for example in examples:
+        assert f"OK     {example.as_posix()}" in result.output
+    assert f"FAILED {broken.as_posix()}" in result.output
+    assert len(list((tmp_path / "output").rglob("parameters.json"))) == len(examples)
@@ -0,0 +1,24 @@
+import numpy as np
+
+from rocketserializer.bundle import load_bundle, save_bundle
+from rocketserializer.flight_data import FlightDataTable
+
+
+def test_bundle_round_trip_is_memory_mapped(tmp_path):
+    table = FlightDataTable(np.random.rand(50, 3), ["Time", "Thrust", "Altitude"])
+    curves = {
+        "drag_curve": np.random.rand(20, 2),
+        "thrust_source": np.random.rand(30, 2),
+        "flight_data": table,
+    }
+    settings = {"rocket": {"drag_curve": None}, "motors": {"thrust_source": None}}
+
+    path = save_bundle(settings, curves, tmp_path)
+    bundle = load_bundle(path)
+
+    assert bundle["settings"]["rocket"]["drag_curve"] == "drag_curve"
+    assert isinstance(bundle["drag_curve"], np.memmap)
+    np.testing.assert_array_equal(bundle["drag_curve"], curves["drag_curve"])
+    np.testing.assert_array_equal(bundle["thrust_source"], curves["thrust_source"])
+    np.testing.assert_array_equal(bundle["flight_data"]["Thrust"], table["Thrust"])
+    assert bundle["flight_data"].labels == table.labels
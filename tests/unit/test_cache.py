@@ -0,0 +1,83 @@
+import os
+import threading
+
+from rocketserializer.cache import ConversionCache
+from rocketserializer.converter import convert_cached
+
+EXAMPLE = "examples/EPFL--BellaLui--2020/rocket.ork"
+
+
+def test_cache_restores_settings_and_files(tmp_path):
+    output = tmp_path / "output"
+    output.mkdir()
+    (output / "drag_curve.csv").write_text("0.100000,0.500000\n")
+    settings = {
+        "id": {"filepath": EXAMPLE},
+        "rocket": {"drag_curve": os.path.join(output, "drag_curve.csv")},
+    }
+
+    cache = ConversionCache(tmp_path / "cache")
+    key = cache.key(EXAMPLE)
+    assert key != cache.key(EXAMPLE, options={"format": "npz"})
+    assert cache.get(key, EXAMPLE, tmp_path / "new_output") is None
+
+    cache.put(key, settings, output)
+    restored = cache.get(key, "copy.ork", tmp_path / "new_output")
+
+    assert restored["id"]["filepath"] == "copy.ork"
+    assert restored["rocket"]["drag_curve"] == os.path.join(
+        tmp_path / "new_output", "drag_curve.csv"
+    )
+    assert (tmp_path / "new_output" / "drag_curve.csv").read_text() == (
+        "0.100000,0.500000\n"
+    )
+
+
+def test_cache_evicts_least_recently_used_entries(tmp_path):
+    output = tmp_path / "output"
+    output.mkdir()
+    (output / "thrust_source.csv").write_text("0.0,1.0\n" * 100)
+    settings = {
+        "id": {},
+        "motors": {"thrust_source": str(output / "thrust_source.csv")},
+    }
+
+    cache = ConversionCache(tmp_path / "cache", max_size=2500)
+    for idx in range(5):
+        cache.put(f"entry{idx}", settings, output)
+
+    entries = sorted(entry.name for entry in cache.directory.iterdir())
+    assert entries == ["entry3", "entry4"]
+
+
+def test_concurrent_puts_of_the_same_key(tmp_path):
+    output = tmp_path / "output"
+    output.mkdir()
+    (output / "drag_curve.csv").write_text("0.100000,0.500000\n" * 1000)
+    settings = {"id": {}, "rocket": {"drag_curve": str(output / "drag_curve.csv")}}
+
+    cache = ConversionCache(tmp_path / "cache")
+    threads = [
+        threading.Thread(target=cache.put, args=("entry", settings, output))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [entry.name for entry in cache.directory.iterdir()] == ["entry"]
+    assert cache.get("entry", EXAMPLE, tmp_path / "restored") is not None
+
+
+def test_cached_conversion_matches_the_fresh_one(tmp_path):
+    cache = ConversionCache(tmp_path / "cache")
+    fresh, cached = tmp_path / "fresh", tmp_path / "cached"
+
+    fresh_settings = convert_cached(EXAMPLE, fresh, cache=cache)
+    cached_settings = convert_cached(EXAMPLE, cached, cache=cache)
+
+    assert cached_settings["id"]["filepath"] == fresh_settings["id"]["filepath"]
+    assert (cached / "parameters.json").read_text().replace(
+        cached.as_posix(), fresh.as_posix()
+    ) == (fresh / "parameters.json").read_text()
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import pytest
+
+from rocketserializer._helpers import parse_ork_file
+from rocketserializer.components.component_tree import (
+    process_elements_position_from_xml,
+)
+from rocketserializer.components.transition import search_transitions
+
+EXAMPLE = Path("examples/rocket_with_elliptical_fins/rocket.ork")
+
+
+def test_positions_and_automatic_radii_from_xml():
+    bs, _ = parse_ork_file(EXAMPLE)
+    elements = process_elements_position_from_xml(bs).values()
+
+    transitions = sorted(
+        (e["position"], e["fore_radius"], e["aft_radius"])
+        for e in elements
+        if e["type"] == "Transition"
+    )
+    fins = [e for e in elements if e["type"] == "EllipticalFinSet"]
+    nosecone = [e for e in elements if e["type"] == "NoseCone"][0]
+
+    assert transitions == [
+        (pytest.approx(0.2), 0.025, 0.015),
+        (pytest.approx(0.425), 0.015, 0.025),
+    ]
+    assert fins[0]["position"] == pytest.approx(0.625)
+    assert nosecone["position"] == 0
+
+
+def test_unsupported_component_raises():
+    bs, _ = parse_ork_file(EXAMPLE)
+    bs.find("rocket").find("subcomponents").find("stage").name = "podset"
+    with pytest.raises(ValueError, match="podset"):
+        process_elements_position_from_xml(bs)
+
+
+def test_transitions_with_the_same_name_and_length():
+    bs, _ = parse_ork_file(EXAMPLE)
+    for transition in bs.find_all("transition"):
+        transition.find("name").string = "Transition"
+        transition.find("length").string = "0.1"
+
+    transitions = search_transitions(bs, process_elements_position_from_xml(bs))
+
+    assert [(t["top_radius"], t["bottom_radius"]) for t in transitions.values()] == [
+        (0.025, 0.015),
+        (0.015, 0.025),
+    ]
+    assert transitions[0]["position"] < transitions[1]["position"]
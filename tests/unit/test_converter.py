@@ -0,0 +1,31 @@
+import io
+from pathlib import Path
+
+import numpy as np
+
+from rocketserializer import convert
+
+EXAMPLE = Path("examples/WERT--Prometheus--2022/rocket.ork")
+
+
+def test_convert_sources_in_memory(tmp_path):
+    from_path = convert(EXAMPLE)
+    from_bytes = convert(EXAMPLE.read_bytes(), name="rocket.ork")
+    from_file = convert(io.BytesIO(EXAMPLE.read_bytes()))
+
+    assert from_path.settings["id"]["filepath"] == EXAMPLE.as_posix()
+    assert from_bytes.settings == from_file.settings
+    assert from_bytes.settings["rocket"]["drag_curve"] is None
+    np.testing.assert_array_equal(from_path.drag_curve, from_bytes.drag_curve)
+    np.testing.assert_array_equal(from_path.thrust_source, from_file.thrust_source)
+
+
+def test_save(tmp_path):
+    result = convert(EXAMPLE)
+    settings = result.save(tmp_path)
+
+    assert settings["rocket"]["drag_curve"] == str(tmp_path / "drag_curve.csv")
+    assert result.settings["rocket"]["drag_curve"] is None
+    assert (tmp_path / "parameters.json").exists()
+    for name, content in result.csv_files().items():
+        assert (tmp_path / name).read_text() == content
@@ -0,0 +1,27 @@
+import numpy as np
+
+from rocketserializer.components.curve_decimation import decimate_curve
+
+
+def test_decimate_collinear_curve():
+    curve = np.column_stack([np.linspace(0, 1, 50), np.linspace(2, 4, 50)])
+
+    decimated, report = decimate_curve(curve, 1e-6)
+
+    np.testing.assert_array_equal(decimated, curve[[0, -1]])
+    assert report["points"] == 50
+    assert report["decimated_points"] == 2
+
+
+def test_decimate_curve_error_bound():
+    x = np.linspace(0, 3, 400)
+    curve = np.column_stack([x, 100 * np.sin(x) ** 2])
+    tolerance = 0.005
+
+    decimated, report = decimate_curve(curve, tolerance)
+    error = np.abs(np.interp(x, decimated[:, 0], decimated[:, 1]) - curve[:, 1])
+
+    assert len(decimated) < len(curve)
+    assert np.max(error) <= tolerance * np.max(np.abs(curve[:, 1]))
+    assert np.isclose(report["max_error"], np.max(error))
+    assert decimate_curve(curve[:2], tolerance)[0].shape == (2, 2)
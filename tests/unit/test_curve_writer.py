@@ -0,0 +1,25 @@
+import gzip
+import io
+
+import numpy as np
+import pytest
+
+from rocketserializer.components.curve_writer import format_curve, write_curve
+
+CURVE = np.array([[0.0, 1.5], [0.123456789, -2.0], [1e-7, np.nan], [-0.0, 1234.5]])
+
+
+@pytest.mark.parametrize("precision", [0, 5, 6])
+def test_format_curve_matches_savetxt(precision):
+    buffer = io.StringIO()
+    np.savetxt(buffer, CURVE, delimiter=",", fmt=f"%.{precision}f")
+    assert format_curve(CURVE, precision) == buffer.getvalue()
+
+
+def test_write_curve(tmp_path):
+    path = write_curve(CURVE, str(tmp_path / "curve.csv"), "repr", compress=True)
+
+    assert path.endswith("curve.csv.gz")
+    with gzip.open(path, "rt") as file:
+        np.testing.assert_array_equal(np.loadtxt(file, delimiter=","), CURVE)
+    assert format_curve(np.empty((0, 2))) == ""
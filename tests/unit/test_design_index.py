@@ -0,0 +1,31 @@
+from bs4 import BeautifulSoup
+
+from rocketserializer.components.design_index import DesignIndex
+
+ORK = """<openrocket>
+<rocket><name>Rocket</name>
+  <stage><name>Stage</name><comment>stage</comment></stage>
+  <comment>rocket</comment>
+</rocket>
+<simulations><simulation><name>Simulation 1</name>
+  <flightdata><databranch types="Time">
+    <event time="1.0" type="apogee"/><datapoint>0.0</datapoint>
+  </databranch></flightdata>
+</simulation></simulations>
+</openrocket>"""
+
+
+def test_design_index():
+    bs = BeautifulSoup(ORK, features="xml")
+    index = DesignIndex(bs)
+
+    for name in ["name", "comment", "stage", "simulation", "databranch", "missing"]:
+        assert index.findAll(name) == bs.find_all(name)
+        assert index.find(name) is bs.find(name)
+    assert index.rocket is bs.find("rocket")
+    assert DesignIndex.of(index) is index
+
+    # the content of the databranches is not indexed, but still found
+    assert "datapoint" not in index._by_name
+    assert index.find("datapoint").text == "0.0"
+    assert len(index.findAll("event")) == 1
@@ -0,0 +1,32 @@
+import numpy as np
+
+from rocketserializer.components.drag_curve import bin_drag_curve, get_drag_tables
+from rocketserializer.flight_data import FlightDataTable
+
+
+def test_bin_drag_curve():
+    mach = np.array([0.101, 0.104, 0.3, 0.102, np.nan, 0.2, 0.25])
+    cd = np.array([0.5, 0.7, 0.4, 0.6, 0.5, -1.0, np.nan])
+
+    table = bin_drag_curve(mach, cd, 0.01)
+
+    np.testing.assert_allclose(table, [[0.307 / 3, 0.6], [0.3, 0.4]])
+    assert bin_drag_curve(mach[:0], cd[:0]).shape == (0, 2)
+
+
+def test_get_drag_tables():
+    # accelerates while burning, then coasts back through the same Mach numbers
+    mach = np.array([0.0, 0.2, 0.4, 0.6, 0.4, 0.2, 0.1])
+    cd = np.array([0.5, 0.5, 0.45, 0.4, 0.6, 0.65, 0.7])
+    altitude = np.array([0.0, 1, 2, 3, 4, 5, 4])
+    table = FlightDataTable(
+        np.column_stack([mach, cd, altitude]),
+        ["Mach number", "Axial drag coefficient", "Altitude"],
+    )
+
+    tables = get_drag_tables(table, burnout_position=4, step=0.05)
+
+    np.testing.assert_allclose(
+        tables["power_on_drag"], [[0.0, 0.5], [0.2, 0.5], [0.4, 0.45], [0.6, 0.4]]
+    )
+    np.testing.assert_allclose(tables["power_off_drag"], [[0.4, 0.6]])
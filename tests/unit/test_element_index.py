@@ -0,0 +1,26 @@
+from rocketserializer.components.element_index import ElementIndex
+
+
+def element(element_type, name, length, position):
+    return {"type": element_type, "name": name, "length": length, "position": position}
+
+
+def test_lookups():
+    elements = [
+        element("BodyTube", "Fins", 1.0, 0.3),
+        element("TrapezoidFinSet", "Fins", 0.1, 1.1),
+        element("RailButton", "Button", 0.01, 0.9),
+        element("LaunchLug", "Lug", 0.03, 0.5),
+        element("RailButton", "Button", 0.01, 1.2),
+    ]
+    index = ElementIndex(dict(enumerate(elements)))
+
+    assert index.find("TrapezoidFinSet", "Fins") is elements[1]
+    assert index.find("NoseCone", "Fins") is None
+    assert index.find_by_name_and_length("LUG", 0.03) == [elements[3]]
+    assert index.find_by_name_and_length("button", 0.01) == [elements[2], elements[4]]
+    positions = [
+        e["position"] for e in index.sorted_by_position("LaunchLug", "RailButton")
+    ]
+    assert positions == [0.5, 0.9, 1.2]
+    assert ElementIndex.of(index) is index
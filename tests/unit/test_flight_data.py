@@ -0,0 +1,21 @@
+import numpy as np
+
+from rocketserializer.flight_data import FlightDataTable
+
+
+def test_flight_data_table_columns():
+    table = FlightDataTable(
+        np.array([[0.0, 10.0, 1.0], [0.5, 9.0, 2.0], [1.0, 8.0, np.nan]]),
+        ["Time", "Mass", "Thrust"],
+    )
+
+    assert len(table) == 3
+    assert "Mass" in table
+    assert "Altitude" not in table
+    np.testing.assert_array_equal(table.time, [0.0, 0.5, 1.0])
+    np.testing.assert_array_equal(table["Mass"], [10.0, 9.0, 8.0])
+
+    sliced = table.slice(1, 3)
+    assert len(sliced) == 2
+    assert np.shares_memory(sliced.data, table.data)
+    assert np.isnan(sliced["Thrust"][-1])
@@ -0,0 +1,24 @@
+import numpy as np
+from bs4 import BeautifulSoup
+
+from rocketserializer.components.flight_events import search_flight_events
+from rocketserializer.flight_data import FlightDataTable
+
+DATABRANCH = """<databranch types="Time">
+<event time="0.0" type="launch"/>
+<event time="0.0" type="ignition"/>
+<event time="0.3" type="burnout"/>
+<event time="0.5" type="apogee"/>
+</databranch>"""
+
+
+def test_search_flight_events():
+    databranch = BeautifulSoup(DATABRANCH, features="xml").find("databranch")
+    table = FlightDataTable(
+        np.array([[0.0], [0.0], [0.1], [0.3], [0.4], [0.5]]), ["Time"]
+    )
+
+    events = search_flight_events(databranch, table)
+
+    assert events == {"ignition": 1, "burnout": 4, "apogee": 5}
+    assert search_flight_events(None, table) == {}
@@ -0,0 +1,63 @@
+import logging
+from pathlib import Path
+from zipfile import ZIP_DEFLATED, ZipFile
+
+import numpy as np
+
+from rocketserializer._helpers import (
+    _dict_to_string,
+    _lazy_dict_to_string,
+    is_zip_file,
+    parse_ork_file,
+)
+
+EXAMPLE = Path("examples/EPFL--BellaLui--2020/rocket.ork")
+
+
+def test_parse_compressed_ork_file_in_memory(tmp_path):
+    compressed = tmp_path / "rocket.ork"
+    with ZipFile(compressed, "w", compression=ZIP_DEFLATED) as zf:
+        zf.write(EXAMPLE, arcname="rocket.ork")
+
+    assert is_zip_file(compressed)
+    assert not is_zip_file(EXAMPLE)
+
+    bs, databranches = parse_ork_file(compressed)
+    expected_bs, expected_databranches = parse_ork_file(EXAMPLE)
+
+    # nothing else is written next to the archive
+    assert list(tmp_path.iterdir()) == [compressed]
+    assert bs.find("rocket").find("name").text == "Foguete"
+    assert bs.find("datapoint") is None
+    assert len(databranches) == len(expected_databranches) == 1
+    np.testing.assert_array_equal(databranches[0].data, expected_databranches[0].data)
+
+
+def test_parse_ork_file_skips_stray_datapoints(tmp_path):
+    ork = tmp_path / "rocket.ork"
+    ork.write_text(
+        "<openrocket><datapoint>1,2</datapoint>"
+        '<databranch types="Time,Altitude">'
+        "<datapoint>0,0</datapoint><datapoint/><datapoint>1,5</datapoint>"
+        "</databranch></openrocket>"
+    )
+
+    bs, databranches = parse_ork_file(ork)
+
+    assert bs.find("datapoint") is None
+    assert len(databranches) == 1
+    np.testing.assert_array_equal(databranches[0].data, [[0, 0], [1, 5]])
+
+
+def test_lazy_dict_is_only_rendered_when_emitted(caplog):
+    class Unrenderable(dict):
+        def items(self):
+            raise AssertionError("The dictionary was rendered.")
+
+    logger = logging.getLogger("rocketserializer.tests")
+    logger.setLevel(logging.WARNING)
+    logger.info("%s", _lazy_dict_to_string(Unrenderable(a=1)))
+
+    with caplog.at_level(logging.INFO, logger="rocketserializer.tests"):
+        logger.info("%s", _lazy_dict_to_string({"a": {"b": 2}}, indent=2))
+    assert caplog.messages == [_dict_to_string({"a": {"b": 2}}, indent=2)]
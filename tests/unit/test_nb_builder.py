@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import nbformat as nbf
+import pytest
+from click.testing import CliRunner
+
+from rocketserializer import convert
+from rocketserializer.cli import ork2notebook
+from rocketserializer.nb_builder import NotebookBuilder, format_notebook
+
+EXAMPLE = Path("examples/WERT--Prometheus--2022/rocket.ork")
+
+
+def test_format_notebook():
+    pytest.importorskip("tokenize_rt")
+    nb = nbf.v4.new_notebook()
+    nb["cells"].append(nbf.v4.new_markdown_cell("x  =  1"))
+    nb["cells"].append(nbf.v4.new_code_cell("%pip install rocketpy\nx  =  {'a':1}\n"))
+
+    nb = format_notebook(nb)
+
+    assert nb["cells"][0]["source"] == "x  =  1"
+    assert nb["cells"][1]["source"] == '%pip install rocketpy\nx = {"a": 1}'
+
+
+def test_build_from_parameters(tmp_path):
+    result = convert(EXAMPLE)
+    builder = NotebookBuilder(parameters=result.settings, curves=result.curves())
+    builder.build(str(tmp_path), formatting=False)
+
+    assert (tmp_path / "simulation.ipynb").exists()
+    for name, content in result.csv_files().items():
+        assert (tmp_path / name).read_text() == content
+    assert result.settings["rocket"]["drag_curve"] is None
+
+
+def test_ork2notebook_cache_options(tmp_path):
+    args = ["--filepath", str(EXAMPLE), "--output", str(tmp_path / "output")]
+    args += ["--formatting", "False", "--cache_dir", str(tmp_path / "cache")]
+
+    result = CliRunner().invoke(ork2notebook, args)
+
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "output" / "parameters.json").exists()
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+
+    result = CliRunner().invoke(
+        ork2notebook, args + ["--save_parameters", "False", "--encoding", "utf-8"]
+    )
+
+    assert result.exit_code == 2
+    assert "--encoding" in result.output
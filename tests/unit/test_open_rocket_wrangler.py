@@ -0,0 +1,149 @@
+from rocketserializer.components.open_rocket_wrangler import snapshot_rocket
+
+
+class FakeEnum:
+    def __init__(self, name):
+        self._name = name
+
+    def name(self):
+        return self._name
+
+
+class FakeComponent:
+    """Mimics the few methods of the OpenRocket components that are used."""
+
+    def __init__(self, kind, name, length=0.0, children=(), **attributes):
+        self.kind = kind
+        self.name = name
+        self.length = length
+        self.children = list(children)
+        self.attributes = attributes
+
+    def __getattr__(self, attribute):
+        attributes = self.__dict__["attributes"]
+        if attribute not in attributes:
+            raise AttributeError(attribute)
+        return lambda: attributes[attribute]
+
+    def getClass(self):
+        kind = self.kind
+
+        class Class:
+            def getSimpleName(self):
+                return kind
+
+        return Class()
+
+    def getName(self):
+        return self.name
+
+    def getLength(self):
+        return self.length
+
+    def getChildren(self):
+        return self.children
+
+
+def test_snapshot_positions_and_radii():
+    fins = FakeComponent(
+        "TrapezoidFinSet",
+        "Fins",
+        0.1,
+        getAxialMethod=FakeEnum("BOTTOM"),
+        getAxialOffset=-0.02,
+    )
+    lug = FakeComponent(
+        "LaunchLug",
+        "Lug",
+        0.03,
+        getRelativePosition=FakeEnum("MIDDLE"),
+        getPositionValue=0.0,
+    )
+    chute = FakeComponent("Parachute", "Main")
+    rocket = FakeComponent(
+        "Rocket",
+        "Rocket",
+        children=[
+            FakeComponent(
+                "AxialStage",
+                "Sustainer",
+                children=[
+                    FakeComponent("NoseCone", "Nose", 0.3, getAftRadius=0.05),
+                    FakeComponent(
+                        "BodyTube",
+                        "Body",
+                        1.0,
+                        children=[fins, lug, chute],
+                        getOuterRadius=0.05,
+                    ),
+                ],
+            )
+        ],
+    )
+
+    records = {record.name: record for record in snapshot_rocket(rocket)}
+
+    assert records["Rocket"].length == 1.3
+    assert records["Body"].position == 0.3
+    assert (records["Body"].fore_radius, records["Nose"].aft_radius) == (0.05, 0.05)
+    assert records["Fins"].position == 0.3 + 1.0 - 0.1 - 0.02
+    assert records["Fins"].depth == 3 and records["Fins"].stage == 0
+    assert records["Lug"].position == 0.3 + (1.0 - 0.03) / 2
+    assert "Main" not in records
+
+
+def test_snapshot_pods_and_boosters():
+    pod = FakeComponent(
+        "PodSet",
+        "Pods",
+        0.0,
+        children=[
+            FakeComponent(
+                "NoseCone",
+                "Pod nose",
+                0.1,
+                getAxialMethod=FakeEnum("AFTER"),
+                getAxialOffset=0.0,
+            ),
+            FakeComponent(
+                "BodyTube",
+                "Pod body",
+                0.4,
+                getAxialMethod=FakeEnum("AFTER"),
+                getAxialOffset=0.05,
+            ),
+        ],
+        getAxialMethod=FakeEnum("TOP"),
+        getAxialOffset=0.2,
+    )
+    rocket = FakeComponent(
+        "Rocket",
+        "Rocket",
+        children=[
+            FakeComponent(
+                "AxialStage",
+                "Sustainer",
+                children=[
+                    FakeComponent("NoseCone", "Nose", 0.3, getAftRadius=0.05),
+                    FakeComponent(
+                        "BodyTube",
+                        "Body",
+                        1.0,
+                        children=[pod],
+                        getOuterRadius=0.05,
+                        getAxialMethod=FakeEnum("AFTER"),
+                        getAxialOffset=0.01,
+                    ),
+                ],
+            )
+        ],
+    )
+
+    records = {record.name: record for record in snapshot_rocket(rocket)}
+
+    assert records["Body"].position == 0.3 + 0.01
+    assert records["Rocket"].length == 0.3 + 0.01 + 1.0
+    assert records["Pods"].position == 0.31 + 0.2
+    assert records["Pod nose"].position == 0.51
+    assert records["Pod body"].position == 0.51 + 0.1 + 0.05
+    assert records["Pod body"].depth == 4 and records["Pod body"].stage == 0
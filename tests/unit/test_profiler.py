@@ -0,0 +1,59 @@
+from rocketserializer.openrocket import LazyDocument
+from rocketserializer.profiler import (
+    ConversionProfiler,
+    count_java_calls,
+    profile_stage,
+)
+
+
+class FakeRocket:
+    def getChildren(self):
+        return [FakeRocket(), FakeRocket()]
+
+    def getName(self):
+        return "Rocket"
+
+
+class FakeDocument:
+    def getRocket(self):
+        return FakeRocket()
+
+
+class FakeSession:
+    def load_doc(self, filepath):
+        with profile_stage("load_doc"):
+            return FakeDocument()
+
+
+def test_nested_stages():
+    with ConversionProfiler() as profiler:
+        with profile_stage("outer"):
+            with profile_stage("inner"):
+                data = list(range(10000))
+    report = profiler.report()
+
+    assert [stage["name"] for stage in report["stages"]] == ["outer", "inner"]
+    assert [stage["depth"] for stage in report["stages"]] == [1, 2]
+    outer, inner = report["stages"]
+    assert outer["wall_time"] >= inner["wall_time"] > 0
+    assert outer["peak_memory"] >= inner["peak_memory"] > 0
+    assert report["total"]["wall_time"] >= outer["wall_time"]
+    assert len(data) == 10000
+
+
+def test_java_calls():
+    assert not isinstance(count_java_calls(FakeDocument()), LazyDocument)
+
+    document = LazyDocument(FakeSession(), "rocket.ork")
+    with ConversionProfiler(trace_memory=False) as profiler:
+        with profile_stage("snapshot"):
+            rocket = document.getRocket()
+            names = [str(child.getName()) for child in rocket.getChildren()]
+    report = profiler.report()
+
+    assert names == ["Rocket", "Rocket"]
+    assert profiler.java_calls == 4
+    stages = {stage["name"]: stage for stage in report["stages"]}
+    assert stages["snapshot"]["java_calls"] == 4
+    assert stages["load_doc"]["java_calls"] == 0
+    assert stages["snapshot"]["peak_memory"] is None
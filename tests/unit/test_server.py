@@ -0,0 +1,77 @@
+import json
+import threading
+from http.client import HTTPConnection
+from pathlib import Path
+
+import pytest
+
+from rocketserializer.cache import ConversionCache
+from rocketserializer.server import ConversionServer
+
+EXAMPLE = Path("examples/EPFL--BellaLui--2020/rocket.ork")
+
+
+@pytest.fixture
+def server():
+    server = ConversionServer(port=0, workers=1, queue_size=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+
+
+def request(server, method, path, body=None):
+    host, port = server.address[:2]
+    connection = HTTPConnection(host, port, timeout=60)
+    connection.request(method, path, body=body)
+    response = connection.getresponse()
+    content = json.loads(response.read())
+    connection.close()
+    return response.status, content
+
+
+def test_convert_returns_settings_and_files(server):
+    status, content = request(
+        server, "POST", "/convert?name=bella.ork", EXAMPLE.read_bytes()
+    )
+
+    assert status == 200
+    settings, files = content["settings"], content["files"]
+    assert settings["id"]["filepath"] == "bella.ork"
+    assert settings["rocket"]["drag_curve"] == "drag_curve.csv"
+    assert set(files) == {"drag_curve.csv", "thrust_source.csv"}
+    assert files["thrust_source.csv"].startswith("0.")
+    assert not server.session.started
+
+
+def test_invalid_file_is_rejected(server):
+    status, content = request(server, "POST", "/convert", b"not an ork file")
+
+    assert status == 422
+    assert "error" in content
+    assert request(server, "GET", "/health")[1]["status"] == "ok"
+
+
+class CountingCache(ConversionCache):
+    hits = 0
+
+    def get(self, key, filepath, output_folder):
+        settings = super().get(key, filepath, output_folder)
+        self.hits += settings is not None
+        return settings
+
+
+def test_convert_restores_from_cache(tmp_path):
+    cache = CountingCache(tmp_path)
+    server = ConversionServer(port=0, workers=1, cache=cache)
+    try:
+        first = server.convert(EXAMPLE.read_bytes(), "bella.ork")
+        second = server.convert(EXAMPLE.read_bytes(), "bella.ork")
+    finally:
+        server.close()
+
+    assert cache.hits == 1
+    assert len(list(tmp_path.iterdir())) == 1
+    assert json.dumps(second, sort_keys=True) == json.dumps(first, sort_keys=True)
+    assert second["settings"]["id"]["filepath"] == "bella.ork"
@@ -0,0 +1,34 @@
+import pytest
+
+from rocketserializer._helpers import parse_ork_file
+from rocketserializer.ork_extractor import ork_extractor
+from rocketserializer.synthetic import generate_ork
+
+
+def test_extract_simulations(tmp_path):
+    path = generate_ork(tmp_path / "rocket.ork", simulations=3, datapoints=500)
+    bs, databranches = parse_ork_file(path)
+
+    settings = ork_extractor(
+        bs,
+        str(path),
+        str(tmp_path),
+        None,
+        databranches[0],
+        simulations=["Simulation 3", 0],
+        databranches=databranches,
+    )
+    simulations = settings["simulations"]
+    assert list(simulations) == [2, 0]
+    assert simulations[2]["name"] == "Simulation 3"
+    assert simulations[2]["environment"]["wind_average"] == 4.0
+    assert simulations[0]["environment"] == settings["environment"]
+    assert (tmp_path / "drag_curve_2.csv").exists()
+    assert (tmp_path / "thrust_source_0.csv").read_text() == (
+        tmp_path / "thrust_source.csv"
+    ).read_text()
+
+    with pytest.raises(ValueError, match="no simulation named"):
+        ork_extractor(
+            bs, str(path), None, None, databranches[0], simulations=["missing"]
+        )
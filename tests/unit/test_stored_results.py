@@ -0,0 +1,45 @@
+import numpy as np
+
+from rocketserializer.components.stored_results import summarize_flight_data
+from rocketserializer.flight_data import FlightDataTable
+
+
+def test_summary_sorts_once_and_ignores_nan():
+    table = FlightDataTable(
+        np.array(
+            [
+                [0.2, 3.0, 5.0],
+                [0.0, np.nan, 1.0],
+                [0.1, -1.0, 9.0],
+                [0.3, 2.0, np.nan],
+            ]
+        ),
+        ["Time", "Stability margin calibers", "Thrust"],
+    )
+
+    summary = summarize_flight_data(
+        table, ["Stability margin calibers", "Thrust"], burnout_position=1
+    )
+
+    margin, thrust = summary["Stability margin calibers"], summary["Thrust"]
+    # the negative margin is clipped and the NaN is skipped before indexing
+    assert (margin["first"], margin["burnout"], margin["last"]) == (0.0, 3.0, 2.0)
+    assert (margin["max"], margin["min"]) == (3.0, 0.0)
+    assert (thrust["max_powered"], thrust["max_coast"]) == (1.0, 9.0)
+    assert thrust["burnout"] == 9.0
+
+
+def test_summary_without_values_is_none():
+    table = FlightDataTable(
+        np.array([[0.0, 1.0, np.nan], [0.1, 2.0, np.nan]]),
+        ["Time", "Stability margin calibers", "Thrust"],
+    )
+
+    summary = summarize_flight_data(
+        table, ["Stability margin calibers", "Thrust"], burnout_position=5
+    )
+
+    assert summary["Stability margin calibers"]["burnout"] is None
+    assert summary["Stability margin calibers"]["max_coast"] is None
+    assert summary["Stability margin calibers"]["max"] == 2.0
+    assert set(summary["Thrust"].values()) == {None}
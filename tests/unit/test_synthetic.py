@@ -0,0 +1,40 @@
+import pytest
+
+from rocketserializer._helpers import is_zip_file, parse_ork_file
+from rocketserializer.ork_extractor import ork_extractor
+from rocketserializer.synthetic import (
+    DRY_MASS,
+    FLIGHT_DATA_LABELS,
+    flight_events,
+    generate_ork,
+)
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_generate_ork(tmp_path, compressed):
+    path = generate_ork(
+        tmp_path / "rocket.ork",
+        stages=2,
+        body_tubes=3,
+        fin_sets=2,
+        parachutes=3,
+        rail_buttons=4,
+        simulations=2,
+        datapoints=2500,
+        compressed=compressed,
+    )
+    assert is_zip_file(path) == compressed
+
+    bs, databranches = parse_ork_file(path)
+    assert [len(branch) for branch in databranches] == [2500, 2500]
+    assert databranches[0].labels == FLIGHT_DATA_LABELS
+
+    settings = ork_extractor(bs, str(path), None, None, databranches[0])
+    assert len(settings["trapezoidal_fins"]) == 4
+    assert len(settings["parachutes"]) == 3
+    assert settings["rail_buttons"]["name"] == "Rail Button 3"
+    assert settings["tails"][0]["top_radius"] == 0.05
+    assert settings["rocket"]["mass"] == DRY_MASS
+    assert settings["stored_results"]["time_to_apogee"] == pytest.approx(
+        flight_events()["apogee"], abs=1e-3
+    )